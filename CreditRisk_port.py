@@ -2,16 +2,10 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-import base64
-from io import BytesIO
-from sklearn.metrics import confusion_matrix, roc_curve, auc, classification_report, log_loss, precision_score, recall_score, f1_score
-import plotly.graph_objects as go
-import plotly.express as px
-from PIL import Image
-from plotly.subplots import make_subplots
+
+# Bibliotecas pesadas (seaborn, scikit-learn) e os módulos de análise são importados
+# apenas nas seções que os utilizam, reduzindo o tempo de partida a frio do aplicativo.
+# Para medir: python benchmark_imports.py CreditRisk_port.py
 
 # Configuração da página
 st.set_page_config(
@@ -326,6 +320,11 @@ if st.button("Treinar Modelo de Regressão Logística", key=1, disabled=not sele
         st.error("Nenhuma variável selecionada. Por favor, selecione ao menos uma variável.")
     else:
         with st.spinner("Treinando o modelo..."):
+            from sklearn.model_selection import train_test_split
+            from sklearn.linear_model import LogisticRegression
+            from sklearn.metrics import log_loss
+            from drift_monitor import PopulationDriftMonitor
+            
             # Preparar dados
             X = training_sample[selected_features]
             y = training_sample['loan_status']
@@ -357,7 +356,6 @@ if st.button("Treinar Modelo de Regressão Logística", key=1, disabled=not sele
             st.session_state.model_intercept = model.intercept_[0]
             
             # Criar estatísticas de resumo personalizadas
-            from sklearn.metrics import log_loss
             train_pred_proba = model.predict_proba(X_train)[:, 1]
             train_log_loss = log_loss(y_train, train_pred_proba)
             
@@ -383,9 +381,25 @@ if st.button("Treinar Modelo de Regressão Logística", key=1, disabled=not sele
             
             # Armazenar informações das características para uso posterior com amostra de teste
             st.session_state.original_features = selected_features
+            
+            # Histogramas de referência para monitoramento de drift (construídos uma única vez);
+            # variáveis e score vêm da mesma população, a base de treino do modelo
+            st.session_state.drift_monitor = PopulationDriftMonitor(
+                X_train, selected_features, reference_scores=train_pred_proba
+            )
+            
+            # Mapas de calibração são ajustados sob demanda para cada novo modelo
+            st.session_state.calibration_maps = {}
+            st.session_state.calibration_map = None
+            st.session_state.pop('model_comparison', None)
+            st.session_state.pop('regularization_paths', None)
 
 # Exibição de resultados - mostrar apenas se o modelo foi treinado
 if 'model_trained' in st.session_state and st.session_state.model_trained:
+    import seaborn as sns
+    from sklearn.metrics import confusion_matrix, roc_curve, auc, precision_score
+    from calibration import METODOS_CALIBRACAO, fit_calibration_map, apply_calibration, reliability_curve
+    
     st.header("Resultados do Modelo")
     
     # Adicionar seletor de limiar no topo da seção de resultados
@@ -811,10 +825,155 @@ if 'model_trained' in st.session_state and st.session_state.model_trained:
 
         if __name__ == '__main__':
             main()                
+    
+    # 8. Calibração das probabilidades
+    st.subheader("8. Calibração das Probabilidades")
+    with st.container():
+        st.markdown("""
+        As probabilidades do modelo determinam diretamente a aprovação. A curva de confiabilidade compara a
+        probabilidade prevista com a taxa de inadimplência observada em cada faixa, na base de teste (holdout).
+        """)
+        
+        calibration_method = st.selectbox(
+            "Método de calibração aplicado ao score",
+            ["Nenhuma"] + METODOS_CALIBRACAO,
+            help="A calibração é ajustada na base de teste (holdout) e aplicada por interpolação na análise de potenciais tomadores"
+        )
+        
+        # Ajustar o mapa apenas uma vez por método e reutilizá-lo nas próximas execuções
+        calibration_maps = st.session_state.setdefault('calibration_maps', {})
+        if calibration_method != "Nenhuma" and calibration_method not in calibration_maps:
+            calibration_maps[calibration_method] = fit_calibration_map(
+                st.session_state.y_test, st.session_state.y_pred_proba, calibration_method
+            )
+        st.session_state.calibration_map = calibration_maps.get(calibration_method)
+        
+        mean_raw, observed_raw, _, ece_raw = reliability_curve(st.session_state.y_test, st.session_state.y_pred_proba)
+        
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.plot([0, 1], [0, 1], 'k--', linewidth=1, label='Calibração Perfeita')
+        ax.plot(mean_raw, observed_raw, 'bo-', linewidth=2, label=f'Modelo Original (ECE = {ece_raw:.3f})')
+        
+        if st.session_state.calibration_map is not None:
+            calibrated_proba = apply_calibration(st.session_state.y_pred_proba, st.session_state.calibration_map)
+            mean_cal, observed_cal, _, ece_cal = reliability_curve(st.session_state.y_test, calibrated_proba)
+            ax.plot(mean_cal, observed_cal, 'gs-', linewidth=2, label=f'Calibrado - {calibration_method} (ECE = {ece_cal:.3f})')
+        
+        ax.set_xlabel('Probabilidade Prevista Média')
+        ax.set_ylabel('Taxa de Inadimplência Observada')
+        ax.set_title('Curva de Confiabilidade')
+        ax.legend(loc='upper left')
+        ax.grid(True, alpha=0.3)
+        col1, col2, col3 = st.columns([1, 6, 1])
+        with col2:
+            st.pyplot(fig)
+        
+        if st.session_state.calibration_map is not None:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("ECE Original", f"{ece_raw:.4f}")
+            with col2:
+                st.metric("ECE Calibrado", f"{ece_cal:.4f}", delta=f"{ece_cal - ece_raw:.4f}", delta_color="inverse")
+            st.caption(f"Tabela de calibração com {len(st.session_state.calibration_map['x'])} pontos. "
+                       "Como o ajuste e a avaliação usam a mesma base de teste, o ECE calibrado tende a ser otimista.")
+        
+        st.markdown("""
+        **Interpretação:** Em um modelo bem calibrado, os pontos ficam próximos da diagonal. O ECE (Expected
+        Calibration Error) é a distância média ponderada entre a probabilidade prevista e a taxa observada.
+        """)
+    
+    # 9. Comparação com outras famílias de modelos
+    st.subheader("9. Comparação de Modelos")
+    with st.container():
+        st.markdown("""
+        Compare a regressão logística com outras famílias de modelos treinadas na mesma divisão treino-teste.
+        Os modelos são treinados em paralelo, e a tabela reúne desempenho (AUC) e custo de operação
+        (tempo de ajuste, vazão de escoragem, memória e tamanho do modelo).
+        """)
+        
+        if st.button("Comparar Modelos", key=3):
+            with st.spinner("Treinando os modelos candidatos em paralelo..."):
+                from model_comparison import compare_models
+                st.session_state.model_comparison = compare_models(
+                    st.session_state.X_train, st.session_state.y_train,
+                    st.session_state.X_test, st.session_state.y_test
+                )
+        
+        if 'model_comparison' in st.session_state:
+            comparison = st.session_state.model_comparison
+            
+            st.dataframe(comparison.style.format({
+                'AUC': '{:.4f}',
+                'Tempo de Ajuste (s)': '{:.2f}',
+                'Previsões por Segundo': '{:,.0f}',
+                'Pico de Memória no Ajuste (MB)': '{:.1f}',
+                'Tamanho do Modelo (KB)': '{:.1f}'
+            }))
+            
+            fig, ax = plt.subplots(figsize=(10, 6))
+            ax.scatter(comparison['Previsões por Segundo'], comparison['AUC'], s=100)
+            for _, row in comparison.iterrows():
+                ax.annotate(row['Modelo'], (row['Previsões por Segundo'], row['AUC']),
+                            textcoords='offset points', xytext=(5, 5))
+            ax.set_xscale('log')
+            ax.set_xlabel('Previsões por Segundo (escala log)')
+            ax.set_ylabel('AUC')
+            ax.set_title('Desempenho vs. Custo de Escoragem')
+            ax.grid(True, alpha=0.3)
+            col1, col2, col3 = st.columns([1, 6, 1])
+            with col2:
+                st.pyplot(fig)
+    
+    # 10. Caminho de regularização
+    st.subheader("10. Caminho de Regularização")
+    with st.container():
+        st.markdown("""
+        O modelo acima usa a regularização padrão (C = 1.0). O caminho de regularização mostra como cada
+        coeficiente (com variáveis padronizadas) encolhe à medida que a regularização aumenta (C diminui).
+        Cada ponto da grade parte da solução do ponto anterior (warm start), de modo que o caminho completo
+        custa aproximadamente o mesmo que um único ajuste a frio.
+        """)
+        
+        if st.button("Calcular Caminho de Regularização", key=4):
+            with st.spinner("Calculando os caminhos L1 e L2..."):
+                from regularization_path import regularization_path
+                st.session_state.regularization_paths = {
+                    penalty: regularization_path(st.session_state.X_train, st.session_state.y_train, penalty)
+                    for penalty in ['l1', 'l2']
+                }
+        
+        if 'regularization_paths' in st.session_state:
+            paths = st.session_state.regularization_paths
+            
+            fig, axes = plt.subplots(1, 2, figsize=(14, 6), sharey=True)
+            for ax, penalty in zip(axes, ['l1', 'l2']):
+                path = paths[penalty]
+                for j, feature in enumerate(st.session_state.selected_features):
+                    ax.plot(path['Cs'], path['coefs'][:, j], label=feature)
+                ax.axvline(x=1.0, color='black', linestyle='--', alpha=0.7)
+                ax.set_xscale('log')
+                ax.set_xlabel('C (escala log)')
+                ax.set_title(f"Penalidade {penalty.upper()} ({path['elapsed']:.2f}s, {path['n_iter'].sum()} iterações)")
+                ax.grid(True, alpha=0.3)
+            axes[0].set_ylabel('Coeficiente Padronizado')
+            axes[1].legend(loc='center left', bbox_to_anchor=(1, 0.5), fontsize=9)
+            fig.tight_layout()
+            st.pyplot(fig)
+            
+            st.markdown("""
+            **Interpretação:** Com penalidade L1, os coeficientes são zerados um a um à medida que C diminui
+            (seleção de variáveis); as primeiras variáveis a sair são as menos relevantes. Com penalidade L2,
+            todos os coeficientes encolhem gradualmente em direção a zero. A linha tracejada indica C = 1.0.
+            """)
         
 
 # Previsão na Amostra de Teste
 if 'model_trained' in st.session_state and st.session_state.model_trained:
+    import seaborn as sns
+    from sklearn.metrics import confusion_matrix, roc_curve
+    from calibration import apply_calibration
+    from drift_monitor import LIMIAR_PSI_MODERADO, LIMIAR_PSI_SIGNIFICATIVO, classify_psi
+    
     st.header("Analisar Potenciais Tomadores de Empréstimo")
     
     st.write("""
@@ -833,8 +992,22 @@ if 'model_trained' in st.session_state and st.session_state.model_trained:
                 # Preparar dados de teste usando as mesmas variáveis
                 X_potential = testing_sample[st.session_state.original_features]
                 
-                # Fazer previsões
-                potential_proba = st.session_state.model.predict_proba(X_potential)[:, 1]
+                # Fazer previsões em lotes, atualizando os histogramas de drift a cada lote
+                drift_monitor = st.session_state.get('drift_monitor')
+                if drift_monitor is not None:
+                    drift_monitor.reset()
+                
+                chunk_size = 5000
+                proba_chunks = []
+                for start in range(0, len(X_potential), chunk_size):
+                    chunk = X_potential.iloc[start:start + chunk_size]
+                    chunk_proba = st.session_state.model.predict_proba(chunk)[:, 1]
+                    proba_chunks.append(chunk_proba)
+                    if drift_monitor is not None:
+                        drift_monitor.update(chunk, chunk_proba)
+                
+                # Aplicar a calibração selecionada (interpolação sobre a tabela já ajustada)
+                potential_proba = apply_calibration(np.concatenate(proba_chunks), st.session_state.get('calibration_map'))
 
                 # Obter limiar do usuário
                 user_threshold = st.session_state.get('decision_threshold')
@@ -913,6 +1086,43 @@ if 'model_trained' in st.session_state and st.session_state.model_trained:
                 col1, col2, col3 = st.columns([1, 6, 1])
                 with col2:
                     st.pyplot(fig)        
+                
+                # Estabilidade da população (PSI/CSI)
+                if drift_monitor is not None:
+                    st.subheader("Estabilidade da População (PSI/CSI)")
+                    
+                    score_psi = drift_monitor.score_stability()
+                    csi_df = drift_monitor.feature_stability()
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.metric("PSI do Score", f"{score_psi:.4f}", help=classify_psi(score_psi))
+                    with col2:
+                        st.metric("Proponentes Monitorados", f"{drift_monitor.n_observations}")
+                    
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    colors = ['#F44336' if v >= LIMIAR_PSI_SIGNIFICATIVO else '#FFC107' if v >= LIMIAR_PSI_MODERADO else '#4CAF50'
+                              for v in csi_df['CSI']]
+                    ax.barh(csi_df['Variável'], csi_df['CSI'], color=colors)
+                    ax.axvline(x=LIMIAR_PSI_MODERADO, color='orange', linestyle='--', alpha=0.7)
+                    ax.axvline(x=LIMIAR_PSI_SIGNIFICATIVO, color='red', linestyle='--', alpha=0.7)
+                    ax.invert_yaxis()
+                    ax.set_xlabel('CSI')
+                    ax.set_title('Índice de Estabilidade por Variável (Treinamento vs. Proponentes)')
+                    
+                    col1, col2, col3 = st.columns([1, 6, 1])
+                    with col2:
+                        st.pyplot(fig)
+                    
+                    st.dataframe(csi_df)
+                    
+                    st.markdown(f"""
+                    **Interpretação:** O PSI (score) e o CSI (variáveis) comparam a distribuição dos proponentes
+                    com a da base de treinamento, usando as mesmas faixas fixas.
+                    - **< {LIMIAR_PSI_MODERADO:.2f}**: População estável
+                    - **{LIMIAR_PSI_MODERADO:.2f} a {LIMIAR_PSI_SIGNIFICATIVO:.2f}**: Mudança moderada, monitorar
+                    - **≥ {LIMIAR_PSI_SIGNIFICATIVO:.2f}**: Mudança significativa, considerar recalibrar o modelo
+                    """)
 
     # Comparar previsões com resultados reais
     st.header("Comparar Previsões com Resultados Reais")
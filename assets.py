@@ -0,0 +1,72 @@
+import io
+import os
+from functools import lru_cache
+
+import streamlit as st
+from PIL import Image
+
+DIRETORIO_BASE = os.path.dirname(os.path.abspath(__file__))
+
+# As imagens são reduzidas para ESCALA_TELA vezes a largura de exibição (nitidez em telas de alta densidade)
+ESCALA_TELA = 2
+QUALIDADE_JPEG = 85
+
+# Chave do session_state com os bytes de imagem enviados na execução atual da página
+CHAVE_PAYLOAD = 'payload_imagens'
+
+
+@lru_cache(maxsize=None)
+def _encode_cached(path, mtime, largura):
+    with open(path, 'rb') as f:
+        original = f.read()
+
+    imagem = Image.open(io.BytesIO(original))
+    formato = imagem.format
+    largura_alvo = largura * ESCALA_TELA
+    redimensionada = imagem.width > largura_alvo
+    if redimensionada:
+        altura_alvo = round(imagem.height * largura_alvo / imagem.width)
+        imagem = imagem.resize((largura_alvo, altura_alvo), Image.LANCZOS)
+
+    saida = io.BytesIO()
+    if formato == 'PNG':
+        # Diagramas e logotipos: paleta de 256 cores preserva o traço com uma fração do tamanho
+        if imagem.mode not in ('P', 'L'):
+            metodo = Image.Quantize.FASTOCTREE if imagem.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+            imagem = imagem.quantize(256, method=metodo)
+        imagem.save(saida, 'PNG', optimize=True)
+    else:
+        imagem.convert('RGB').save(saida, 'JPEG', quality=QUALIDADE_JPEG, optimize=True, progressive=True)
+
+    codificada = saida.getvalue()
+    # Sem redimensionamento, a recodificação só é usada se reduzir o arquivo
+    if not redimensionada and len(codificada) >= len(original):
+        return original
+    return codificada
+
+
+def image_bytes(arquivo, largura):
+    """Bytes da imagem local já redimensionada para a largura de exibição.
+
+    A imagem é processada uma única vez por processo (e novamente apenas se o
+    arquivo for modificado em disco).
+    """
+    path = os.path.join(DIRETORIO_BASE, arquivo)
+    return _encode_cached(path, os.path.getmtime(path), largura)
+
+
+def show_image(arquivo, largura, caption=None, container=st):
+    """Exibe uma imagem empacotada com o aplicativo e contabiliza o payload da página"""
+    dados = image_bytes(arquivo, largura)
+    st.session_state[CHAVE_PAYLOAD] = st.session_state.get(CHAVE_PAYLOAD, 0) + len(dados)
+    container.image(dados, caption=caption, width=largura)
+
+
+def reset_payload():
+    """Zera o contador de payload de imagens no início de cada execução da página"""
+    st.session_state[CHAVE_PAYLOAD] = 0
+
+
+def page_payload():
+    """Total de bytes de imagem enviados na execução atual da página"""
+    return st.session_state.get(CHAVE_PAYLOAD, 0)
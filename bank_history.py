@@ -0,0 +1,61 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DIRETORIO_BASE = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_HISTORICO = os.path.join(DIRETORIO_BASE, 'historico_bancos.csv')
+
+# Colunas do arquivo: banco, data do balanço e composição dos passivos
+COLUNAS_PASSIVO = ['depositos_varejo', 'notas_securitizadas', 'outros_passivos', 'patrimonio']
+COLUNAS_HISTORICO = ['banco', 'data'] + COLUNAS_PASSIVO
+
+# Nomes de exibição usados nos gráficos
+ROTULOS = {
+    'data': 'Data',
+    'depositos_varejo': 'Depósitos de Varejo',
+    'notas_securitizadas': 'Notas Securitizadas',
+    'outros_passivos': 'Outros Passivos',
+    'patrimonio': 'Patrimônio',
+}
+
+
+@lru_cache(maxsize=None)
+def _load_cached(path, mtime):
+    historico = pd.read_csv(path, comment='#', dtype={'banco': str, 'data': str}, encoding='utf-8')
+    faltantes = [c for c in COLUNAS_HISTORICO if c not in historico.columns]
+    if faltantes:
+        raise ValueError(f"Colunas ausentes em {os.path.basename(path)}: {', '.join(faltantes)}")
+
+    # Indicadores derivados calculados por coluna, uma única vez por versão do arquivo
+    passivos = historico[COLUNAS_PASSIVO].to_numpy(dtype=float)
+    total_ativos = passivos.sum(axis=1)
+    depositos, securitizacao, _, patrimonio = passivos.T
+
+    historico = historico.rename(columns=ROTULOS)
+    historico['Total de Ativos'] = total_ativos
+    historico['Alavancagem'] = np.round(total_ativos / patrimonio, 1)
+    historico['Proporção de Depósitos (%)'] = np.round(depositos / total_ativos * 100, 1)
+    historico['Proporção de Securitização (%)'] = np.round(securitizacao / total_ativos * 100, 1)
+    return historico
+
+
+@lru_cache(maxsize=None)
+def _bank_cached(path, mtime, banco):
+    historico = _load_cached(path, mtime)
+    serie = historico[historico['banco'] == banco]
+    if serie.empty:
+        raise ValueError(f"Banco sem histórico em {os.path.basename(path)}: {banco}")
+    return serie.drop(columns='banco').reset_index(drop=True)
+
+
+def bank_history(banco, path=ARQUIVO_HISTORICO):
+    """Série histórica de um banco com os indicadores derivados, sem a coluna de identificação.
+
+    O arquivo é lido uma única vez; uma nova leitura só ocorre quando ele é
+    modificado em disco. O DataFrame é compartilhado pelo cache e não deve ser
+    alterado por quem o recebe.
+    """
+    path = os.path.abspath(path)
+    return _bank_cached(path, os.path.getmtime(path), banco)
@@ -0,0 +1,107 @@
+"""Confere a simulação de crise em forma fechada contra a recursão dia a dia.
+
+Em uma grade aleatória de parâmetros (ativos líquidos, funding wholesale e nível
+de estresse), mais as grades inteiras e de meio ponto usadas pela superfície de
+sobrevivência, e em vários horizontes, as trajetórias de simulate_crisis_paths
+devem coincidir com as de simulate_crisis_paths_reference dentro da tolerância,
+e os dias de falha (inclusive os de crisis_failure_day) devem ser idênticos, salvo
+empates numéricos em que o saldo cai a zero e o arredondamento decide.
+Também mede o tempo de cada implementação.
+
+Uso:
+    python benchmark_crisis_paths.py [--cenarios 200000] [--horizontes 7 30 60] [--seed 42]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from liquidity_engine import crisis_failure_day, first_failure_day, simulate_crisis_paths, simulate_crisis_paths_reference
+
+TRAJETORIAS = ('depositos_varejo', 'funding_wholesale', 'ativos_liquidos', 'saldo_liquido')
+TOLERANCIA = 1e-9
+
+
+def parameter_grid(n_cenarios, seed):
+    """Parâmetros aleatórios somados às grades inteira e de meio ponto (ativos %, wholesale %, estresse)"""
+    rng = np.random.default_rng(seed)
+    aleatorios = np.column_stack([
+        rng.uniform(0, 100, n_cenarios),
+        rng.uniform(0, 100, n_cenarios),
+        rng.uniform(0, 10, n_cenarios),
+    ])
+    grades = [
+        np.stack(np.meshgrid(np.arange(0, 100 + passo / 2, passo), np.arange(0, 100 + passo / 2, passo),
+                             np.arange(0, 10 + passo / 2, passo), indexing='ij'), axis=-1).reshape(-1, 3)
+        for passo in (1.0, 0.5)
+    ]
+    return np.vstack([aleatorios] + grades)
+
+
+def check_horizon(parametros, dias_simulacao):
+    """Compara as duas implementações em um horizonte; retorna tempos e o maior desvio das trajetórias"""
+    ativos, wholesale, stress = parametros.T
+
+    inicio = time.perf_counter()
+    fechada = simulate_crisis_paths(ativos, wholesale, stress, dias_simulacao)
+    tempo_fechada = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    referencia = simulate_crisis_paths_reference(ativos, wholesale, stress, dias_simulacao)
+    tempo_referencia = time.perf_counter() - inicio
+
+    desvio = max(np.abs(fechada[k] - referencia[k]).max() for k in TRAJETORIAS)
+    assert desvio <= TOLERANCIA, f"trajetórias divergem em {desvio:.3g} (horizonte {dias_simulacao})"
+    empates = 0
+    for nome, dias_falha in (('simulate_crisis_paths', fechada['failed_day']),
+                             ('crisis_failure_day', crisis_failure_day(ativos, wholesale, stress, dias_simulacao))):
+        n_empates = _failure_day_ties(dias_falha, referencia, fechada, dias_simulacao)
+        assert n_empates >= 0, f"dias de falha de {nome} divergem da recursão (horizonte {dias_simulacao})"
+        empates = max(empates, n_empates)
+    return tempo_fechada, tempo_referencia, desvio, int((referencia['failed_day'] > 0).sum()), empates
+
+
+def _failure_day_ties(dias_falha, referencia, fechada, dias_simulacao):
+    # Divergências só são aceitas em empates numéricos. Os dois dias de falha diferem de no máximo um
+    # dia (sobreviver conta como falhar em dias_simulacao + 1), e cada um é compatível com as
+    # trajetórias: não antes do primeiro dia em que alguma delas fica a menos de TOLERANCIA de zero,
+    # nem depois do primeiro dia em que ambas se esgotam. Retorna o número de empates, ou -1 se
+    # houver divergência de outra natureza.
+    divergentes = np.flatnonzero(dias_falha != referencia['failed_day'])
+    if not divergentes.size:
+        return 0
+
+    def _dia(dias):
+        return np.where(dias > 0, dias, dias_simulacao + 1)
+
+    caminhos = np.stack([fechada['ativos_liquidos'][divergentes], referencia['ativos_liquidos'][divergentes]])
+    mais_cedo = _dia(first_failure_day(caminhos.min(axis=0) - TOLERANCIA))
+    mais_tarde = _dia(first_failure_day(caminhos.max(axis=0)))
+
+    dias = _dia(np.stack([dias_falha[divergentes], referencia['failed_day'][divergentes]]))
+    compativeis = (dias >= mais_cedo) & (dias <= mais_tarde)
+    if (np.abs(dias[0] - dias[1]) > 1).any() or not compativeis.all():
+        return -1
+    return divergentes.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cenarios", type=int, default=200_000, help="cenários aleatórios além das grades")
+    parser.add_argument("--horizontes", type=int, nargs="+", default=[7, 30, 60])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    parametros = parameter_grid(args.cenarios, args.seed)
+    print(f"{len(parametros):,} cenários (ativos líquidos x funding wholesale x estresse)")
+    for dias_simulacao in args.horizontes:
+        tempo_fechada, tempo_referencia, desvio, n_falhas, empates = check_horizon(parametros, dias_simulacao)
+        print(f"\nHorizonte de {dias_simulacao} dias ({n_falhas:,} cenários com falha)")
+        print(f"  forma fechada      {tempo_fechada * 1000:>9.1f} ms")
+        print(f"  recursão diária    {tempo_referencia * 1000:>9.1f} ms")
+        print(f"  maior desvio {desvio:.2g}; dias de falha idênticos"
+              + (f" exceto {empates} empate(s) numérico(s) com saldo nulo" if empates else ""))
+
+
+if __name__ == "__main__":
+    main()
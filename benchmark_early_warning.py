@@ -0,0 +1,58 @@
+"""Mede o desempenho do motor de alerta precoce em séries longas.
+
+São avaliados dois casos: anos de dados diários e a reprodução de dados em
+frequência de minuto. Para cada um, a série sintética é processada observação a
+observação (EarlyWarningEngine, como em um fluxo em tempo real) e de forma
+vetorizada (evaluate_history), e os dois resultados são comparados.
+
+Uso:
+    python benchmark_early_warning.py [--anos 20] [--minutos 525600] [--janela 60]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from early_warning import INDICADORES_PADRAO, EarlyWarningEngine, evaluate_history, generate_sample_indicators
+
+
+def benchmark(serie, janela):
+    """Processa a série nos dois modos e retorna os tempos e se os resultados coincidem"""
+    matriz = serie[list(INDICADORES_PADRAO)].to_numpy(dtype=float)
+
+    inicio = time.perf_counter()
+    fluxo = EarlyWarningEngine(janela=janela).run(matriz)
+    tempo_fluxo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    lote = evaluate_history(serie, janela=janela)
+    tempo_lote = time.perf_counter() - inicio
+
+    iguais = (np.allclose(fluxo['z'], lote['z'], equal_nan=True, atol=1e-6)
+              and (fluxo['estado'] == lote['estado']).all()
+              and (fluxo['nivel'] == lote['nivel']).all())
+    return tempo_fluxo, tempo_lote, iguais
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--anos", type=int, default=20, help="anos de dados diários")
+    parser.add_argument("--minutos", type=int, default=525_600, help="observações na reprodução por minuto")
+    parser.add_argument("--janela", type=int, default=60)
+    args = parser.parse_args()
+
+    casos = [
+        (f"{args.anos} anos diários", generate_sample_indicators(args.anos * 365, 'D')),
+        (f"{args.minutos:,} minutos", generate_sample_indicators(args.minutos, 'min')),
+    ]
+    for nome, serie in casos:
+        tempo_fluxo, tempo_lote, iguais = benchmark(serie, args.janela)
+        n = len(serie)
+        print(f"\n{nome} ({n:,} observações x {len(INDICADORES_PADRAO)} indicadores)")
+        print(f"  fluxo (observação a observação) {tempo_fluxo * 1000:>9.1f} ms  {n / tempo_fluxo:>12,.0f} obs/s")
+        print(f"  lote (vetorizado)               {tempo_lote * 1000:>9.1f} ms  {n / tempo_lote:>12,.0f} obs/s")
+        print(f"  resultados idênticos: {'sim' if iguais else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Mede o tempo de importação na partida a frio de cada aplicativo.
+
+Apenas os imports de nível de módulo (executados antes de qualquer interação do
+usuário) são medidos, em um processo novo com ``python -X importtime``. O
+resultado é acrescentado a um histórico em CSV para acompanhar a evolução.
+
+Uso:
+    python benchmark_imports.py [app.py ...] [--history import_time_history.csv]
+"""
+import argparse
+import ast
+import csv
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+APPS_PADRAO = ["CreditRisk_port.py", "riscos.py", "risco_juros.py"]
+HISTORICO_PADRAO = "import_time_history.csv"
+
+
+def startup_imports(app_path):
+    """Extrai os imports de nível de módulo de um script (os que rodam na partida)"""
+    with open(app_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    statements = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            statements.append(ast.unparse(node))
+    return statements
+
+
+def measure_import_time(statements, repeats=3):
+    """Executa os imports em processos novos e retorna o menor tempo total e os pacotes mais pesados"""
+    best_total = None
+    best_packages = None
+    code = "\n".join(statements)
+
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+        # Linhas no formato "import time: self [us] | cumulative | imported package"
+        packages = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            # Pacotes de nível superior aparecem sem indentação adicional
+            if name.startswith(" ") and not name.startswith("  "):
+                packages[name.strip()] = int(cumulative) / 1000
+
+        total = sum(packages.values())
+        if best_total is None or total < best_total:
+            best_total = total
+            best_packages = packages
+
+    return best_total, best_packages
+
+
+def current_commit():
+    proc = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True)
+    return proc.stdout.strip() or "desconhecido"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("apps", nargs="*", default=APPS_PADRAO)
+    parser.add_argument("--history", default=HISTORICO_PADRAO,
+                        help="arquivo CSV onde os resultados são acumulados")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    commit = current_commit()
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    rows = []
+
+    for app in args.apps:
+        total, packages = measure_import_time(startup_imports(app), args.repeats)
+        print(f"\n{app}: {total:.1f} ms em imports de partida")
+        for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {name:<30} {ms:>9.1f} ms")
+        rows.append([timestamp, commit, app, f"{total:.1f}"])
+
+    if args.history:
+        new_file = not os.path.exists(args.history)
+        with open(args.history, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(["data", "commit", "app", "import_ms"])
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import numpy as np
+
+from liquidity_engine import scenario_survival_days
+
+# Horizonte de sobrevivência padrão (dias), o mesmo do LCR
+HORIZONTE_PADRAO = 30
+N_BISSECAO = 50
+
+
+def survives_horizon(balanco, cenarios, horizonte=HORIZONTE_PADRAO):
+    """Indica, para cada cenário, se o banco sobrevive por horizonte dias (ou por toda a duração, se menor)"""
+    cenarios = np.atleast_2d(np.asarray(cenarios, dtype=float))
+    dias = scenario_survival_days(balanco['hqla'], balanco['depositos_varejo'], balanco['depositos_corporate'],
+                                  balanco['funding_curto'], cenarios)
+    return dias >= np.minimum(horizonte, cenarios[:, 4]) * (1 - 1e-12)
+
+
+def _monotone_boundary(sobrevive, lo, hi, n_bissecao):
+    # Bisseção vetorizada: em cada cenário, mantém s(a) = s(lo) e s(b) = s(hi) até o intervalo se fechar
+    s_lo = sobrevive(lo)
+    s_hi = sobrevive(hi)
+    a, b = lo.astype(float), hi.astype(float)
+    for _ in range(n_bissecao):
+        meio = (a + b) / 2
+        lado_lo = sobrevive(meio) == s_lo
+        a = np.where(lado_lo, meio, a)
+        b = np.where(lado_lo, b, meio)
+    return a, b, s_lo, s_hi
+
+
+def minimum_hqla(balanco, cenarios, horizonte=HORIZONTE_PADRAO, n_bissecao=N_BISSECAO):
+    """Menor HQLA que sobrevive a todos os cenários pelo horizonte, por bisseção em todos os cenários de uma vez.
+
+    A sobrevivência é monótona no HQLA, de modo que cada cenário tem um HQLA
+    mínimo próprio; o colchão necessário é o maior deles (cenário limitante).
+    Cenários sem solução (haircut de 100% com saídas) têm HQLA mínimo infinito.
+    """
+    cenarios = np.atleast_2d(np.asarray(cenarios, dtype=float))
+    n_cenarios = len(cenarios)
+
+    def sobrevive(hqla):
+        return survives_horizon({**balanco, 'hqla': hqla}, cenarios, horizonte)
+
+    # Limite superior: parte do total de passivos e dobra onde ainda não há sobrevivência
+    total = balanco['depositos_varejo'] + balanco['depositos_corporate'] + balanco['funding_curto']
+    hi = np.full(n_cenarios, max(float(total), 1.0))
+    for _ in range(60):
+        falha = ~sobrevive(hi)
+        if not falha.any():
+            break
+        hi = np.where(falha, hi * 2, hi)
+
+    _, b, s_lo, s_hi = _monotone_boundary(sobrevive, np.zeros(n_cenarios), hi, n_bissecao)
+    por_cenario = np.where(s_lo, 0.0, np.where(s_hi, b, np.inf))
+
+    hqla_minimo = float(por_cenario.max()) if n_cenarios else 0.0
+    return {
+        'por_cenario': por_cenario,
+        'viavel': np.isfinite(por_cenario),
+        'hqla_minimo': hqla_minimo,
+        # Sem cenário limitante quando nenhum cenário exige HQLA
+        'cenario_limitante': int(por_cenario.argmax()) if hqla_minimo > 0 else None,
+        'folga': balanco['hqla'] - hqla_minimo,
+    }
+
+
+def maximum_wholesale_share(balanco, cenarios, horizonte=HORIZONTE_PADRAO, n_bissecao=N_BISSECAO):
+    """Maior participação do funding de curto prazo no passivo que sobrevive a todos os cenários pelo horizonte.
+
+    O HQLA e o total de passivos ficam fixos; a participação do funding de curto
+    prazo varia em troca de depósitos de varejo. Em cada cenário a sobrevivência
+    é monótona na participação (crescente ou decrescente, conforme a saída de
+    varejo seja maior ou menor que a não renovação), de modo que as participações
+    viáveis formam um intervalo; a resposta é o limite superior da interseção.
+    """
+    cenarios = np.atleast_2d(np.asarray(cenarios, dtype=float))
+    n_cenarios = len(cenarios)
+
+    # Passivo vazio: todas as participações são nulas
+    total = max(balanco['depositos_varejo'] + balanco['depositos_corporate'] +
+                balanco['funding_curto'] + balanco['funding_longo'], 1e-12)
+    # Participação máxima possível: todo o varejo convertido em funding de curto prazo
+    limite = (balanco['depositos_varejo'] + balanco['funding_curto']) / total
+
+    def sobrevive(participacao):
+        funding_curto = participacao * total
+        varejo = balanco['depositos_varejo'] + balanco['funding_curto'] - funding_curto
+        return survives_horizon({**balanco, 'funding_curto': funding_curto, 'depositos_varejo': varejo},
+                                cenarios, horizonte)
+
+    a, b, s_lo, s_hi = _monotone_boundary(sobrevive, np.zeros(n_cenarios), np.full(n_cenarios, limite), n_bissecao)
+    inferior = np.where(s_lo, 0.0, np.where(s_hi, b, np.nan))
+    superior = np.where(s_hi, limite, np.where(s_lo, a, np.nan))
+    viavel = s_lo | s_hi
+
+    maxima = np.nan
+    if n_cenarios and viavel.all() and superior.min() >= inferior.max():
+        maxima = float(superior.min())
+
+    return {
+        'inferior': inferior * 100,
+        'superior': superior * 100,
+        'viavel': viavel,
+        'participacao_maxima': maxima * 100,
+        'participacao_atual': balanco['funding_curto'] / total * 100,
+        # Sem cenário limitante quando nenhum cenário restringe a participação abaixo do máximo possível
+        'cenario_limitante': int(np.nanargmin(superior)) if (superior < limite).any() else None,
+    }
@@ -0,0 +1,63 @@
+import numpy as np
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+
+METODOS_CALIBRACAO = ["Isotônica", "Platt"]
+
+
+def _logit(p, eps=1e-6):
+    p = np.clip(np.asarray(p, dtype=float), eps, 1 - eps)
+    return np.log(p / (1 - p))
+
+
+def fit_calibration_map(y_true, y_proba, method="Isotônica", n_points=101):
+    """Ajusta a calibração e a armazena como tabela linear por partes (x, y)"""
+    y_true = np.asarray(y_true)
+    y_proba = np.asarray(y_proba, dtype=float)
+
+    if method == "Isotônica":
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip')
+        iso.fit(y_proba, y_true)
+        # Os limiares da regressão isotônica já formam a tabela compacta de nós
+        x_knots = np.concatenate([[0.0], iso.X_thresholds_, [1.0]])
+        y_knots = np.concatenate([[iso.y_thresholds_[0]], iso.y_thresholds_, [iso.y_thresholds_[-1]]])
+    elif method == "Platt":
+        platt = LogisticRegression()
+        platt.fit(_logit(y_proba).reshape(-1, 1), y_true)
+        # A curva sigmoide é amostrada em uma grade fixa e aplicada por interpolação
+        x_knots = np.linspace(0, 1, n_points)
+        y_knots = platt.predict_proba(_logit(x_knots).reshape(-1, 1))[:, 1]
+    else:
+        raise ValueError(f"Método de calibração desconhecido: {method}")
+
+    # Remover nós repetidos em x, mantendo a tabela estritamente crescente
+    x_knots, idx = np.unique(x_knots, return_index=True)
+    return {'method': method, 'x': x_knots, 'y': np.asarray(y_knots)[idx]}
+
+
+def apply_calibration(y_proba, calibration_map):
+    """Aplica a tabela de calibração por interpolação linear"""
+    if calibration_map is None:
+        return np.asarray(y_proba, dtype=float)
+    return np.interp(y_proba, calibration_map['x'], calibration_map['y'])
+
+
+def reliability_curve(y_true, y_proba, n_bins=10):
+    """Agrega previsões em faixas de probabilidade para a curva de confiabilidade"""
+    y_true = np.asarray(y_true, dtype=float)
+    y_proba = np.asarray(y_proba, dtype=float)
+
+    idx = np.minimum((y_proba * n_bins).astype(int), n_bins - 1)
+    counts = np.bincount(idx, minlength=n_bins)
+    sum_proba = np.bincount(idx, weights=y_proba, minlength=n_bins)
+    sum_true = np.bincount(idx, weights=y_true, minlength=n_bins)
+
+    mask = counts > 0
+    mean_predicted = sum_proba[mask] / counts[mask]
+    observed_rate = sum_true[mask] / counts[mask]
+    bin_counts = counts[mask]
+
+    # Erro de calibração esperado (ECE): média ponderada dos desvios por faixa
+    ece = float(np.sum(bin_counts * np.abs(mean_predicted - observed_rate)) / bin_counts.sum())
+
+    return mean_predicted, observed_rate, bin_counts, ece
@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+
+from liquidity_engine import calculate_lcr, calculate_nsfr
+
+# Colunas esperadas no arquivo de posições (uma linha por contrato)
+COLUNAS_POSICOES = ['tipo', 'contraparte', 'nivel_ativo', 'vencimento_dias', 'valor']
+
+TIPOS = ['deposito', 'funding', 'capital', 'titulo', 'emprestimo']
+CONTRAPARTES = ['varejo_estavel', 'varejo_menos_estavel', 'pme', 'corporativo_operacional',
+                'corporativo', 'soberano', 'financeira']
+NIVEIS_ATIVO = ['1', '2A', '2B', 'nao_hqla']
+
+# Faixas de vencimento: até 30 dias (LCR), até 6 meses, até 1 ano e acima de 1 ano (NSFR)
+LIMITES_FAIXAS = [31, 180, 365]
+
+# Taxas de saída (run-off) de Basileia para depósitos e funding não garantido que vencem em até 30 dias (%)
+TAXAS_SAIDA = {
+    'varejo_estavel': 5,
+    'varejo_menos_estavel': 10,
+    'pme': 10,
+    'corporativo_operacional': 25,
+    'corporativo': 40,
+    'soberano': 40,
+    'financeira': 100,
+}
+
+# Taxas de entrada para empréstimos adimplentes que vencem em até 30 dias (%)
+TAXAS_ENTRADA = {
+    'varejo_estavel': 50,
+    'varejo_menos_estavel': 50,
+    'pme': 50,
+    'corporativo_operacional': 50,
+    'corporativo': 50,
+    'soberano': 50,
+    'financeira': 100,
+}
+
+# Haircuts sobre o estoque de HQLA (%)
+HAIRCUTS_HQLA = {'1': 0, '2A': 15, '2B': 50}
+
+# Limites de composição do HQLA: Nível 2 até 40% e Nível 2B até 15% do estoque
+LIMITE_NIVEL_2 = 0.40
+LIMITE_NIVEL_2B = 0.15
+
+# Entradas de caixa consideradas no LCR limitadas a 75% das saídas
+LIMITE_ENTRADAS = 0.75
+
+# Fatores de funding estável disponível (ASF) por contraparte: < 6 meses, 6 meses a 1 ano, >= 1 ano (%)
+FATORES_ASF = {
+    'varejo_estavel': (95, 95, 100),
+    'varejo_menos_estavel': (90, 90, 100),
+    'pme': (90, 90, 100),
+    'corporativo_operacional': (50, 50, 100),
+    'corporativo': (50, 50, 100),
+    'soberano': (50, 50, 100),
+    'financeira': (0, 50, 100),
+}
+
+# Fatores de funding estável requerido (RSF): títulos por nível e empréstimos por contraparte (%)
+FATORES_RSF_TITULOS = {
+    '1': (5, 5, 5),
+    '2A': (15, 15, 15),
+    '2B': (50, 50, 50),
+    'nao_hqla': (50, 50, 85),
+}
+FATORES_RSF_EMPRESTIMOS = {
+    'varejo_estavel': (50, 50, 85),
+    'varejo_menos_estavel': (50, 50, 85),
+    'pme': (50, 50, 85),
+    'corporativo_operacional': (50, 50, 85),
+    'corporativo': (50, 50, 85),
+    'soberano': (50, 50, 85),
+    'financeira': (15, 50, 100),
+}
+
+METRICAS = ['valor', 'saidas', 'entradas', 'asf', 'rsf']
+
+
+def _build_factor_tables():
+    # Tabelas (tipo x contraparte x nível x faixa) com o fator de cada métrica, em fração
+    forma = (len(TIPOS), len(CONTRAPARTES), len(NIVEIS_ATIVO), len(LIMITES_FAIXAS) + 1)
+    tabelas = {metrica: np.zeros(forma) for metrica in METRICAS[1:]}
+
+    deposito, funding, capital, titulo, emprestimo = (
+        TIPOS.index(t) for t in ('deposito', 'funding', 'capital', 'titulo', 'emprestimo')
+    )
+    nao_hqla = NIVEIS_ATIVO.index('nao_hqla')
+
+    for c, contraparte in enumerate(CONTRAPARTES):
+        for t in (deposito, funding):
+            tabelas['saidas'][t, c, :, 0] = TAXAS_SAIDA[contraparte] / 100
+            tabelas['asf'][t, c, :, :2] = FATORES_ASF[contraparte][0] / 100
+            tabelas['asf'][t, c, :, 2] = FATORES_ASF[contraparte][1] / 100
+            tabelas['asf'][t, c, :, 3] = FATORES_ASF[contraparte][2] / 100
+
+        tabelas['entradas'][emprestimo, c, :, 0] = TAXAS_ENTRADA[contraparte] / 100
+        fatores = np.array(FATORES_RSF_EMPRESTIMOS[contraparte]) / 100
+        tabelas['rsf'][emprestimo, c, :, :] = fatores[[0, 0, 1, 2]]
+
+        # Títulos fora do HQLA que vencem em 30 dias entram integralmente como fluxo de caixa
+        tabelas['entradas'][titulo, c, nao_hqla, 0] = 1.0
+        for n, nivel in enumerate(NIVEIS_ATIVO):
+            tabelas['rsf'][titulo, c, n, :] = (np.array(FATORES_RSF_TITULOS[nivel]) / 100)[[0, 0, 1, 2]]
+
+    tabelas['asf'][capital] = 1.0
+    return tabelas
+
+
+TABELAS_FATORES = _build_factor_tables()
+
+
+def _encode(coluna, categorias, nome, padrao=None):
+    # Converte uma coluna de texto em códigos inteiros, rejeitando valores desconhecidos
+    codigos = pd.Categorical(coluna, categories=categorias).codes
+    if padrao is not None:
+        codigos = np.where(pd.isna(coluna), categorias.index(padrao), codigos)
+    invalidos = codigos < 0
+    if invalidos.any():
+        valores = sorted(pd.unique(np.asarray(coluna, dtype=object)[invalidos]).astype(str))
+        raise ValueError(f"Valores inválidos na coluna '{nome}': {', '.join(valores[:5])}")
+    return codigos
+
+
+def apply_level2_caps(nivel_1, nivel_2a, nivel_2b):
+    """Aplica os limites de composição de Basileia ao HQLA já com haircuts"""
+    ajuste_2b = max(nivel_2b - LIMITE_NIVEL_2B / (1 - LIMITE_NIVEL_2B) * (nivel_1 + nivel_2a),
+                    nivel_2b - LIMITE_NIVEL_2B / (1 - LIMITE_NIVEL_2) * nivel_1, 0)
+    ajuste_2 = max(nivel_2a + nivel_2b - ajuste_2b - LIMITE_NIVEL_2 / (1 - LIMITE_NIVEL_2) * nivel_1, 0)
+    return nivel_1 + nivel_2a + nivel_2b - ajuste_2b - ajuste_2
+
+
+class ContractLiquidityAggregator:
+    """Agrega posições contratuais em lotes e calcula LCR e NSFR ao final.
+
+    Todas as somas intermediárias são aditivas, de modo que o arquivo pode ser
+    processado em partes; os limites não lineares (Nível 2 e entradas) só são
+    aplicados em result().
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.n_contratos = 0
+        self._somas = np.zeros((len(METRICAS), len(TIPOS) * len(CONTRAPARTES)))
+        self._estoque_hqla = np.zeros(len(NIVEIS_ATIVO))
+
+    def update(self, posicoes):
+        """Acrescenta um lote de posições (DataFrame com COLUNAS_POSICOES)"""
+        tipo = _encode(posicoes['tipo'], TIPOS, 'tipo')
+        contraparte = _encode(posicoes['contraparte'], CONTRAPARTES, 'contraparte')
+        # Nível do ativo só é relevante para títulos; vazio equivale a fora do HQLA
+        nivel = _encode(posicoes['nivel_ativo'], NIVEIS_ATIVO, 'nivel_ativo', padrao='nao_hqla')
+        faixa = np.searchsorted(LIMITES_FAIXAS, posicoes['vencimento_dias'].to_numpy(), side='right')
+        valor = posicoes['valor'].to_numpy(dtype=float)
+
+        grupo = tipo.astype(np.int64) * len(CONTRAPARTES) + contraparte
+        n_grupos = self._somas.shape[1]
+
+        self._somas[0] += np.bincount(grupo, weights=valor, minlength=n_grupos)
+        for i, metrica in enumerate(METRICAS[1:], start=1):
+            fatores = TABELAS_FATORES[metrica][tipo, contraparte, nivel, faixa]
+            self._somas[i] += np.bincount(grupo, weights=valor * fatores, minlength=n_grupos)
+
+        titulos = tipo == TIPOS.index('titulo')
+        self._estoque_hqla += np.bincount(nivel[titulos], weights=valor[titulos], minlength=len(NIVEIS_ATIVO))
+        self.n_contratos += len(posicoes)
+
+    def result(self):
+        """Retorna o LCR, o NSFR e o detalhamento por tipo e contraparte"""
+        estoque = dict(zip(NIVEIS_ATIVO, self._estoque_hqla))
+        ajustado = {nivel: estoque[nivel] * (1 - haircut / 100) for nivel, haircut in HAIRCUTS_HQLA.items()}
+        hqla = apply_level2_caps(ajustado['1'], ajustado['2A'], ajustado['2B'])
+
+        saidas = self._somas[METRICAS.index('saidas')].sum()
+        entradas = self._somas[METRICAS.index('entradas')].sum()
+        entradas_consideradas = min(entradas, LIMITE_ENTRADAS * saidas)
+        asf = self._somas[METRICAS.index('asf')].sum()
+        rsf = self._somas[METRICAS.index('rsf')].sum()
+
+        indice = pd.MultiIndex.from_product([TIPOS, CONTRAPARTES], names=['Tipo', 'Contraparte'])
+        detalhe = pd.DataFrame(self._somas.T, index=indice, columns=['Valor', 'Saídas 30d', 'Entradas 30d', 'ASF', 'RSF'])
+        detalhe = detalhe[detalhe['Valor'] != 0].reset_index()
+
+        return {
+            'n_contratos': self.n_contratos,
+            'estoque_hqla': estoque,
+            'hqla_ajustado': ajustado,
+            'hqla': hqla,
+            'saidas': saidas,
+            'entradas': entradas,
+            'entradas_consideradas': entradas_consideradas,
+            'saidas_liquidas': saidas - entradas_consideradas,
+            'lcr': calculate_lcr(hqla, saidas - entradas_consideradas),
+            'asf': asf,
+            'rsf': rsf,
+            'nsfr': calculate_nsfr(asf, rsf),
+            'detalhe': detalhe,
+        }
+
+
+def compute_contract_liquidity(posicoes):
+    """Calcula LCR e NSFR para um DataFrame de posições em memória"""
+    agregador = ContractLiquidityAggregator()
+    agregador.update(posicoes)
+    return agregador.result()
+
+
+def compute_contract_liquidity_from_csv(arquivo, chunksize=1_000_000):
+    """Calcula LCR e NSFR lendo o arquivo CSV em lotes, sem carregá-lo inteiro na memória"""
+    agregador = ContractLiquidityAggregator()
+    leitor = pd.read_csv(
+        arquivo,
+        usecols=COLUNAS_POSICOES,
+        dtype={'tipo': 'category', 'contraparte': 'category', 'nivel_ativo': 'category',
+               'vencimento_dias': np.int64, 'valor': np.float64},
+        chunksize=chunksize,
+    )
+    for lote in leitor:
+        agregador.update(lote)
+    return agregador.result()
+
+
+def generate_sample_positions(n_contratos=100_000, seed=42):
+    """Gera uma carteira de posições sintética para demonstração"""
+    rng = np.random.default_rng(seed)
+
+    # Composição aproximada de um balanço: passivos (depósitos, funding, capital) e ativos (títulos, empréstimos)
+    pesos_tipo = np.array([0.45, 0.10, 0.01, 0.14, 0.30])
+    tipo = rng.choice(len(TIPOS), n_contratos, p=pesos_tipo)
+    contraparte = rng.choice(len(CONTRAPARTES), n_contratos, p=[0.30, 0.20, 0.15, 0.10, 0.12, 0.03, 0.10])
+    nivel = rng.choice(len(NIVEIS_ATIVO), n_contratos, p=[0.50, 0.20, 0.05, 0.25])
+    nivel = np.where(tipo == TIPOS.index('titulo'), nivel, NIVEIS_ATIVO.index('nao_hqla'))
+
+    # Depósitos à vista (vencimento 0) são comuns; os demais contratos vencem em até 10 anos
+    vencimento = rng.integers(1, 3650, n_contratos)
+    a_vista = (tipo == TIPOS.index('deposito')) & (rng.random(n_contratos) < 0.6)
+    vencimento[a_vista] = 0
+
+    valor = rng.lognormal(mean=0, sigma=1.2, size=n_contratos)
+    # Contratos de capital são maiores que depósitos individuais
+    valor *= np.where(tipo == TIPOS.index('capital'), 20, 1)
+
+    return pd.DataFrame({
+        'tipo': pd.Categorical.from_codes(tipo, TIPOS),
+        'contraparte': pd.Categorical.from_codes(contraparte, CONTRAPARTES),
+        'nivel_ativo': pd.Categorical.from_codes(nivel, NIVEIS_ATIVO),
+        'vencimento_dias': vencimento,
+        'valor': valor.round(2),
+    })
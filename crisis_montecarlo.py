@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from liquidity_engine import DIAS_SIMULACAO
+
+DISTRIBUICOES = ["lognormal", "normal"]
+
+
+def _daily_shocks(rng, n, vol_varejo, vol_wholesale, correlacao, distribuicao):
+    # Choques diários correlacionados (média 1) para as saídas de varejo e wholesale
+    z1 = rng.standard_normal(n)
+    z2 = correlacao * z1 + np.sqrt(1 - correlacao ** 2) * rng.standard_normal(n)
+
+    if distribuicao == "lognormal":
+        return (np.exp(vol_varejo * z1 - vol_varejo ** 2 / 2),
+                np.exp(vol_wholesale * z2 - vol_wholesale ** 2 / 2))
+    if distribuicao == "normal":
+        return np.maximum(0, 1 + vol_varejo * z1), np.maximum(0, 1 + vol_wholesale * z2)
+    raise ValueError(f"Distribuição desconhecida: {distribuicao}")
+
+
+def simulate_chunk(seed, n_paths, ativos_liquidos_pct, wholesale_funding_pct, stress_level,
+                   vol_varejo, vol_wholesale, correlacao, contagio, distribuicao,
+                   dias_simulacao=DIAS_SIMULACAO, n_amostras=0):
+    """Simula um lote de trajetórias estocásticas da corrida bancária"""
+    rng = np.random.default_rng(seed)
+
+    impacto_varejo = min(50, stress_level * 5)
+    impacto_wholesale = min(90, stress_level * 9)
+
+    depositos_varejo = np.full(n_paths, 100.0 - wholesale_funding_pct)
+    funding_wholesale = np.full(n_paths, float(wholesale_funding_pct))
+    ativos_liquidos = np.full(n_paths, float(ativos_liquidos_pct))
+    dias_falha = np.zeros(n_paths, dtype=np.int16)
+
+    amostras = np.empty((min(n_amostras, n_paths), dias_simulacao + 1))
+    amostras[:, 0] = ativos_liquidos_pct
+
+    for dia in range(1, dias_simulacao + 1):
+        prob_corrida = min(1.0, dia / dias_simulacao * (stress_level / 10))
+        choque_varejo, choque_wholesale = _daily_shocks(
+            rng, n_paths, vol_varejo, vol_wholesale, correlacao, distribuicao
+        )
+
+        # Contágio: a perda de ativos líquidos amplifica as saídas (perda de confiança)
+        if ativos_liquidos_pct > 0:
+            perda_liquidez = np.clip(1 - ativos_liquidos / ativos_liquidos_pct, 0, 1)
+        else:
+            perda_liquidez = np.ones(n_paths)
+        amplificacao = 1 + contagio * perda_liquidez
+
+        taxa_varejo = np.minimum(1, (impacto_varejo / 100) * prob_corrida / dias_simulacao * choque_varejo * amplificacao)
+        taxa_wholesale = np.minimum(1, (impacto_wholesale / 100) * prob_corrida / (dias_simulacao / 2) * choque_wholesale * amplificacao)
+
+        saida_varejo = depositos_varejo * taxa_varejo
+        saida_wholesale = funding_wholesale * taxa_wholesale
+
+        depositos_varejo -= saida_varejo
+        funding_wholesale -= saida_wholesale
+        ativos_liquidos -= saida_varejo + saida_wholesale
+
+        # Registrar o primeiro dia em que os ativos líquidos se esgotam
+        dias_falha[(ativos_liquidos <= 0) & (dias_falha == 0)] = dia
+        np.maximum(ativos_liquidos, 0, out=ativos_liquidos)
+
+        amostras[:, dia] = ativos_liquidos[:len(amostras)]
+
+    return dias_falha, amostras
+
+
+def run_monte_carlo(ativos_liquidos_pct, wholesale_funding_pct, stress_level,
+                    n_paths=100_000, chunk_size=10_000, vol_varejo=0.5, vol_wholesale=0.8,
+                    correlacao=0.5, contagio=1.0, distribuicao="lognormal", seed=42,
+                    max_workers=None, n_amostras=50):
+    """Executa a simulação Monte Carlo em lotes distribuídos em um pool de processos.
+
+    Retorna o dia de falha de cada trajetória (0 = sobreviveu), a probabilidade de
+    falha dentro do horizonte e algumas trajetórias de ativos líquidos para exibição.
+    """
+    if n_paths < 1 or chunk_size < 1:
+        raise ValueError("n_paths e chunk_size devem ser pelo menos 1")
+    tamanhos = [min(chunk_size, n_paths - inicio) for inicio in range(0, n_paths, chunk_size)]
+    # Sementes independentes e reprodutíveis para cada lote
+    sementes = np.random.SeedSequence(seed).spawn(len(tamanhos))
+
+    parametros = (ativos_liquidos_pct, wholesale_funding_pct, stress_level,
+                  vol_varejo, vol_wholesale, correlacao, contagio, distribuicao)
+    amostras_por_lote = [n_amostras] + [0] * (len(tamanhos) - 1)
+
+    max_workers = max_workers or min(len(tamanhos), os.cpu_count() or 1)
+    if max_workers == 1:
+        resultados = [
+            simulate_chunk(s, n, *parametros, n_amostras=a)
+            for s, n, a in zip(sementes, tamanhos, amostras_por_lote)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(simulate_chunk, s, n, *parametros, n_amostras=a)
+                for s, n, a in zip(sementes, tamanhos, amostras_por_lote)
+            ]
+            resultados = [future.result() for future in futures]
+
+    dias_falha = np.concatenate([r[0] for r in resultados])
+
+    return {
+        'dias_falha': dias_falha,
+        'prob_falha': float((dias_falha > 0).mean()),
+        'dias_simulacao': DIAS_SIMULACAO,
+        'trajetorias_amostra': resultados[0][1],
+    }
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# Faixas de referência usuais do mercado para o PSI/CSI
+LIMIAR_PSI_MODERADO = 0.10
+LIMIAR_PSI_SIGNIFICATIVO = 0.25
+
+
+def build_bin_edges(values, n_bins=10):
+    """Define os limites internos das faixas fixas a partir da base de referência"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    unique_values = np.unique(values)
+
+    if len(unique_values) <= n_bins:
+        # Variáveis discretas (dummies de grade, delinq_2yrs): uma faixa por valor observado
+        return (unique_values[:-1] + unique_values[1:]) / 2
+
+    # Variáveis contínuas: faixas por quantis, sem limites repetidos
+    quantis = np.linspace(0, 1, n_bins + 1)[1:-1]
+    return np.unique(np.quantile(values, quantis))
+
+
+def histogram_counts(values, edges):
+    """Conta as observações em cada faixa em uma única passada O(n log bins), ignorando valores ausentes"""
+    values = np.asarray(values, dtype=float)
+    # NaN seria posicionado após o último limite e contado na faixa superior
+    values = values[~np.isnan(values)]
+    idx = np.searchsorted(edges, values, side='right')
+    return np.bincount(idx, minlength=len(edges) + 1)
+
+
+def population_stability_index(expected_counts, actual_counts, eps=1e-6):
+    """Calcula o PSI entre duas distribuições já agregadas em faixas (custo O(bins))"""
+    expected = np.asarray(expected_counts, dtype=float)
+    actual = np.asarray(actual_counts, dtype=float)
+    if expected.sum() == 0 or actual.sum() == 0:
+        return np.nan
+
+    # Suavização para evitar log(0) em faixas vazias
+    expected_pct = np.clip(expected / expected.sum(), eps, None)
+    actual_pct = np.clip(actual / actual.sum(), eps, None)
+    return float(np.sum((actual_pct - expected_pct) * np.log(actual_pct / expected_pct)))
+
+
+def classify_psi(psi):
+    """Classifica o PSI nas faixas usuais de estabilidade"""
+    if np.isnan(psi):
+        return "Sem dados"
+    if psi < LIMIAR_PSI_MODERADO:
+        return "Estável"
+    if psi < LIMIAR_PSI_SIGNIFICATIVO:
+        return "Mudança Moderada"
+    return "Mudança Significativa"
+
+
+class PopulationDriftMonitor:
+    """Monitora o drift entre a população de treinamento e os novos proponentes.
+
+    Os histogramas de referência são construídos uma única vez; os histogramas dos
+    proponentes são acumulados a cada lote escorado, de modo que o PSI/CSI pode ser
+    recalculado a qualquer momento em O(bins), sem revisitar os dados.
+    """
+
+    def __init__(self, reference_df, features, reference_scores=None, n_bins=10):
+        self.features = list(features)
+        self.n_bins = n_bins
+
+        self.edges = {}
+        self.reference_counts = {}
+        for feature in self.features:
+            values = reference_df[feature].to_numpy(dtype=float)
+            self.edges[feature] = build_bin_edges(values, n_bins)
+            self.reference_counts[feature] = histogram_counts(values, self.edges[feature])
+
+        # Distribuição do score: faixas fixas de largura igual em [0, 1]
+        self.score_edges = np.linspace(0, 1, n_bins + 1)[1:-1]
+        self.reference_score_counts = None
+        if reference_scores is not None:
+            self.reference_score_counts = histogram_counts(reference_scores, self.score_edges)
+
+        self.reset()
+
+    def reset(self):
+        """Zera os histogramas acumulados dos proponentes"""
+        self.current_counts = {f: np.zeros_like(c) for f, c in self.reference_counts.items()}
+        self.current_score_counts = np.zeros(len(self.score_edges) + 1, dtype=np.int64)
+        self.n_observations = 0
+
+    def update(self, chunk_df, scores=None):
+        """Acumula um novo lote de proponentes nos histogramas"""
+        for feature in self.features:
+            values = chunk_df[feature].to_numpy(dtype=float)
+            self.current_counts[feature] += histogram_counts(values, self.edges[feature])
+
+        if scores is not None:
+            self.current_score_counts += histogram_counts(scores, self.score_edges)
+
+        self.n_observations += len(chunk_df)
+
+    def feature_stability(self):
+        """Retorna o CSI de cada variável com a respectiva classificação"""
+        csi = [
+            population_stability_index(self.reference_counts[f], self.current_counts[f])
+            for f in self.features
+        ]
+        df = pd.DataFrame({'Variável': self.features, 'CSI': csi})
+        df['Classificação'] = df['CSI'].apply(classify_psi)
+        return df.sort_values('CSI', ascending=False).reset_index(drop=True)
+
+    def score_stability(self):
+        """Retorna o PSI da distribuição do score"""
+        if self.reference_score_counts is None:
+            return np.nan
+        return population_stability_index(self.reference_score_counts, self.current_score_counts)
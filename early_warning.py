@@ -0,0 +1,240 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Indicadores monitorados: limite absoluto, direção adversa (+1 = alta é ruim, -1 = queda é ruim)
+# e limite de z-score em relação à janela móvel
+INDICADORES_PADRAO = {
+    'saida_depositos': {'limite': 2.0, 'direcao': 1, 'z_limite': 3.0},    # % dos depósitos por período
+    'spread_cds': {'limite': 300.0, 'direcao': 1, 'z_limite': 3.0},       # pontos-base
+    'taxa_rolagem': {'limite': 70.0, 'direcao': -1, 'z_limite': 3.0},     # % do funding de atacado renovado
+}
+JANELA_PADRAO = 60
+
+# Estado de cada indicador e níveis do plano de contingência
+NORMAL, DESVIO, LIMITE = 0, 1, 2
+NIVEIS_CONTINGENCIA = ["Normal", "Alerta Inicial", "Tensão Elevada", "Crise Severa", "Sobrevivência"]
+ROTULOS_ESTADO = ["Normal", "Desvio anormal (z-score)", "Limite rompido"]
+
+
+class RollingWindow:
+    """Janela móvel de tamanho fixo com média e variância atualizadas em O(1).
+
+    Os valores ficam em um buffer circular; ao entrar um valor novo com a janela
+    cheia, o mais antigo sai e média e soma dos quadrados dos desvios (M2) são
+    corrigidas pela diferença entre os dois (variante de Welford para janelas).
+    """
+
+    __slots__ = ('tamanho', 'n', 'media', '_m2', '_valores', '_posicao')
+
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self._valores = [0.0] * self.tamanho
+        self._posicao = 0
+
+    def push(self, valor):
+        """Inclui um valor, descartando o mais antigo se a janela estiver cheia"""
+        if self.n < self.tamanho:
+            self.n += 1
+            delta = valor - self.media
+            self.media += delta / self.n
+            self._m2 += delta * (valor - self.media)
+        else:
+            antigo = self._valores[self._posicao]
+            media_anterior = self.media
+            self.media += (valor - antigo) / self.n
+            self._m2 += (valor - antigo) * (valor - self.media + antigo - media_anterior)
+        self._valores[self._posicao] = valor
+        self._posicao = (self._posicao + 1) % self.tamanho
+
+    @property
+    def cheia(self):
+        return self.n == self.tamanho
+
+    @property
+    def desvio(self):
+        """Desvio-padrão amostral da janela"""
+        return math.sqrt(max(self._m2, 0.0) / (self.n - 1)) if self.n > 1 else math.nan
+
+
+def contingency_level(estados):
+    """Nível do plano de contingência a partir dos estados dos indicadores.
+
+    Qualquer desvio anormal leva ao Alerta Inicial; cada limite rompido eleva um
+    nível a partir de Tensão Elevada.
+    """
+    n_limites = sum(1 for estado in estados if estado == LIMITE)
+    if n_limites:
+        return min(1 + n_limites, len(NIVEIS_CONTINGENCIA) - 1)
+    return DESVIO if any(estado == DESVIO for estado in estados) else NORMAL
+
+
+class EarlyWarningEngine:
+    """Motor de alerta precoce para séries de indicadores recebidas uma observação por vez.
+
+    O z-score de cada observação é calculado contra a janela anterior a ela (o
+    próprio choque não dilui a referência), e só depois a observação entra na
+    janela. Alertas de z-score exigem a janela cheia; valores ausentes (NaN) são
+    ignorados.
+    """
+
+    def __init__(self, indicadores=None, janela=JANELA_PADRAO):
+        self.indicadores = dict(indicadores or INDICADORES_PADRAO)
+        self.nomes = list(self.indicadores)
+        self.janela = janela
+        self._config = [(c['limite'], c['direcao'], c['z_limite']) for c in self.indicadores.values()]
+        self.reset()
+
+    def reset(self):
+        self.janelas = [RollingWindow(self.janela) for _ in self.nomes]
+        self.estados = [NORMAL] * len(self.nomes)
+
+    def update(self, valores):
+        """Processa uma observação (valores na ordem de self.nomes).
+
+        Retorna os z-scores, os estados dos indicadores e o nível de contingência.
+        """
+        zs = []
+        for k, valor in enumerate(valores):
+            janela = self.janelas[k]
+            if valor != valor:  # NaN: mantém o estado anterior
+                zs.append(math.nan)
+                continue
+
+            limite, direcao, z_limite = self._config[k]
+            z = math.nan
+            if janela.cheia:
+                desvio = janela.desvio
+                if desvio > 0:
+                    z = (valor - janela.media) / desvio
+            janela.push(valor)
+
+            if (valor - limite) * direcao > 0:
+                self.estados[k] = LIMITE
+            elif z == z and z * direcao > z_limite:
+                self.estados[k] = DESVIO
+            else:
+                self.estados[k] = NORMAL
+            zs.append(z)
+
+        return zs, list(self.estados), contingency_level(self.estados)
+
+    def run(self, matriz):
+        """Reproduz uma série completa (períodos x indicadores) observação a observação"""
+        n_periodos = len(matriz)
+        z = np.empty((n_periodos, len(self.nomes)))
+        estados = np.empty((n_periodos, len(self.nomes)), dtype=np.int8)
+        nivel = np.empty(n_periodos, dtype=np.int8)
+        for t, valores in enumerate(np.asarray(matriz, dtype=float).tolist()):
+            z[t], estados[t], nivel[t] = self.update(valores)
+        return {'z': z, 'estado': estados, 'nivel': nivel}
+
+
+def evaluate_history(serie, indicadores=None, janela=JANELA_PADRAO):
+    """Avalia uma série histórica inteira de forma vetorizada (mesmo resultado de EarlyWarningEngine.run).
+
+    As janelas móveis de cada indicador são calculadas sobre as observações não
+    ausentes dele, deslocadas de um período para excluir a observação corrente.
+    """
+    indicadores = dict(indicadores or INDICADORES_PADRAO)
+    n_periodos = len(serie)
+    z = np.full((n_periodos, len(indicadores)), np.nan)
+    estados = np.zeros((n_periodos, len(indicadores)), dtype=np.int8)
+
+    for k, (nome, config) in enumerate(indicadores.items()):
+        valores = serie[nome].to_numpy(dtype=float)
+        presentes = np.flatnonzero(~np.isnan(valores))
+        observados = pd.Series(valores[presentes])
+        rolagem = observados.rolling(janela)
+        media = rolagem.mean().shift(1).to_numpy()
+        desvio = rolagem.std().shift(1).to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_obs = np.where(desvio > 0, (observados.to_numpy() - media) / desvio, np.nan)
+
+        adverso = (observados.to_numpy() - config['limite']) * config['direcao'] > 0
+        desvio_anormal = z_obs * config['direcao'] > config['z_limite']
+        estado_obs = np.where(adverso, LIMITE, np.where(desvio_anormal, DESVIO, NORMAL))
+
+        z[presentes, k] = z_obs
+        # Períodos sem observação herdam o último estado conhecido
+        ultimo = np.maximum.accumulate(np.where(~np.isnan(valores), np.arange(n_periodos), -1))
+        estados[:, k] = np.where(ultimo >= 0, np.r_[estado_obs, NORMAL][np.searchsorted(presentes, ultimo)], NORMAL)
+
+    n_limites = (estados == LIMITE).sum(axis=1)
+    algum_desvio = (estados == DESVIO).any(axis=1)
+    nivel = np.where(n_limites > 0, np.minimum(1 + n_limites, len(NIVEIS_CONTINGENCIA) - 1),
+                     np.where(algum_desvio, DESVIO, NORMAL)).astype(np.int8)
+    return {'z': z, 'estado': estados, 'nivel': nivel}
+
+
+def alert_log(datas, resultado, nomes):
+    """Lista os disparos de alerta: períodos em que o estado de um indicador se agrava"""
+    estados = resultado['estado']
+    anterior = np.vstack([np.zeros((1, estados.shape[1]), dtype=estados.dtype), estados[:-1]])
+    periodo, indicador = np.nonzero(estados > anterior)
+    ordem = np.lexsort((indicador, periodo))
+    periodo, indicador = periodo[ordem], indicador[ordem]
+
+    return pd.DataFrame({
+        'Data': np.asarray(datas)[periodo],
+        'Indicador': np.asarray(nomes)[indicador],
+        'Alerta': np.asarray(ROTULOS_ESTADO)[estados[periodo, indicador]],
+        'Z-score': resultado['z'][periodo, indicador],
+        'Nível do Plano': np.asarray(NIVEIS_CONTINGENCIA)[resultado['nivel'][periodo]],
+    })
+
+
+def load_indicators(arquivo, indicadores=None):
+    """Lê a série de indicadores (CSV com a coluna data e uma coluna por indicador)"""
+    indicadores = indicadores or INDICADORES_PADRAO
+    serie = pd.read_csv(arquivo, parse_dates=['data'])
+    faltantes = [c for c in indicadores if c not in serie.columns]
+    if faltantes:
+        raise ValueError(f"Indicadores ausentes no arquivo: {', '.join(faltantes)}")
+    if serie.empty:
+        raise ValueError("O arquivo não contém observações")
+    if not pd.api.types.is_datetime64_any_dtype(serie['data']):
+        raise ValueError("A coluna data contém valores que não são datas")
+    nao_numericos = [c for c in indicadores if not pd.api.types.is_numeric_dtype(serie[c])]
+    if nao_numericos:
+        raise ValueError(f"Indicadores com valores não numéricos: {', '.join(nao_numericos)}")
+    return serie.sort_values('data', kind='stable').reset_index(drop=True)
+
+
+def generate_sample_indicators(n_periodos=2520, freq='D', inicio='2000-01-03', inicio_crise=0.85, seed=42):
+    """Gera uma série sintética de indicadores com um período calmo seguido de uma crise de funding.
+
+    A partir da fração inicio_crise da série, a saída de depósitos e o spread de
+    CDS sobem gradualmente e a taxa de rolagem do atacado cai, como no segundo
+    semestre de 2007.
+    """
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range(inicio, periods=n_periodos, freq=freq)
+
+    # Intensidade da crise: zero no período calmo, crescendo até 1 no fim da série
+    t = np.arange(n_periodos)
+    marco = int(n_periodos * inicio_crise)
+    crise = np.clip((t - marco) / max(n_periodos - marco, 1), 0, 1) ** 1.5
+
+    saida_depositos = 0.3 + 0.1 * rng.standard_normal(n_periodos) + 3.0 * crise
+    # Spread de CDS: passeio aleatório reversível em torno de 60 pb, mais o salto da crise
+    ruido = np.zeros(n_periodos)
+    choques = rng.standard_normal(n_periodos) * 2
+    for i in range(1, n_periodos):
+        ruido[i] = 0.98 * ruido[i - 1] + choques[i]
+    spread_cds = 60 + ruido + 400 * crise
+    taxa_rolagem = np.clip(95 + 1.5 * rng.standard_normal(n_periodos) - 45 * crise, 0, 100)
+
+    return pd.DataFrame({
+        'data': datas,
+        'saida_depositos': saida_depositos.round(3),
+        'spread_cds': spread_cds.round(1),
+        'taxa_rolagem': taxa_rolagem.round(2),
+    })
@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from liquidity_engine import PARAMETROS_CENARIO
+
+# Colunas do arquivo de linhas de funding; vencimento é uma data (AAAA-MM-DD)
+COLUNAS_FUNDING = ['contraparte', 'instrumento', 'vencimento', 'valor']
+
+# Instrumentos de funding; os demais, além dos depósitos, compõem o funding de atacado
+INSTRUMENTOS = ['deposito_varejo', 'deposito_corporate', 'interbancario', 'emissao', 'securitizacao', 'covered_bond']
+INSTRUMENTOS_ATACADO = INSTRUMENTOS[2:]
+ROTULOS_INSTRUMENTOS = ["Depósitos de Varejo", "Depósitos Corporativos", "Empréstimos Interbancários",
+                        "Emissões de Dívida", "Securitização", "Covered Bonds"]
+
+# Horizonte da escada diária de rolagem, prazo que separa funding de curto e longo prazo
+# e horizonte do cenário de concentração (dias)
+HORIZONTE_ESCADA = 365
+LIMITE_CURTO_PRAZO = 365
+HORIZONTE_ESTRESSE = 30
+
+# Participação mínima no funding total para uma contraparte ser considerada significativa (%)
+LIMITE_SIGNIFICATIVA = 1.0
+MAIORES_PADRAO = (1, 5, 10, 20)
+
+# Colunas da decomposição por contraparte: depósitos e atacado por prazo até o vencimento
+CATEGORIAS = ['depositos_varejo', 'depositos_corporate', 'atacado_30d', 'atacado_curto', 'atacado_longo']
+
+NOME_CENARIO_CONCENTRACAO = "Saída dos Maiores Financiadores"
+
+
+def _encode_instrument(instrumento):
+    codigos = pd.Categorical(instrumento, categories=INSTRUMENTOS).codes
+    if (codigos < 0).any():
+        invalidos = pd.unique(np.asarray(instrumento)[codigos < 0])
+        raise ValueError(f"Instrumentos desconhecidos: {', '.join(map(str, invalidos[:5]))}")
+    return codigos.astype(np.int64)
+
+
+class FundingConcentrationAggregator:
+    """Agrega linhas de funding em lotes: concentração por contraparte e escada de rolagem.
+
+    Cada lote é reduzido a somas por contraparte e categoria (group-by), que são
+    incorporadas às somas acumuladas, e a um histograma diário de vencimentos
+    por instrumento. A memória fica limitada ao número de pares contraparte x
+    categoria, qualquer que seja o tamanho do book.
+    """
+
+    def __init__(self, data_base):
+        self.data_base = np.datetime64(pd.Timestamp(data_base).normalize(), 'D')
+        self.reset()
+
+    def reset(self):
+        self.n_linhas = 0
+        self._somas = None
+        # Colunas 0..HORIZONTE_ESCADA são dias; a última acumula os vencimentos além do horizonte
+        self._escada = np.zeros((len(INSTRUMENTOS), HORIZONTE_ESCADA + 2))
+
+    def update(self, linhas):
+        """Acrescenta um lote de linhas de funding (DataFrame com COLUNAS_FUNDING)"""
+        instrumento = _encode_instrument(linhas['instrumento'])
+        vencimento = pd.to_datetime(linhas['vencimento']).to_numpy().astype('datetime64[D]')
+        sem_vencimento = np.isnat(vencimento)
+        if sem_vencimento.any():
+            # Tratá-las como vencidas inflaria a necessidade de rolagem do dia da data-base
+            raise ValueError(f"Linhas sem data de vencimento: {int(sem_vencimento.sum())}")
+        # Linhas já vencidas são tratadas como exigíveis no dia da data-base
+        dias = np.maximum((vencimento - self.data_base).astype(np.int64), 0)
+        valor = linhas['valor'].to_numpy(dtype=float)
+
+        coluna = np.minimum(dias, HORIZONTE_ESCADA + 1)
+        n_colunas = self._escada.shape[1]
+        self._escada += np.bincount(instrumento * n_colunas + coluna, weights=valor,
+                                    minlength=self._escada.size).reshape(self._escada.shape)
+
+        # Categoria de cada linha: depósitos por tipo, atacado pelo prazo até o vencimento
+        atacado = np.where(dias <= HORIZONTE_ESTRESSE, 2, np.where(dias <= LIMITE_CURTO_PRAZO, 3, 4))
+        categoria = np.where(instrumento < 2, instrumento, atacado)
+        grupos = pd.DataFrame({'contraparte': linhas['contraparte'].to_numpy(), 'categoria': categoria, 'valor': valor})
+        parcial = grupos.groupby(['contraparte', 'categoria'], sort=False)['valor'].sum()
+        if self._somas is not None:
+            parcial = pd.concat([self._somas, parcial]).groupby(level=[0, 1], sort=False).sum()
+        self._somas = parcial
+        self.n_linhas += len(linhas)
+
+    def result(self, maiores=MAIORES_PADRAO):
+        """Retorna os indicadores de concentração, a escada de rolagem e o balanço do book"""
+        somas = self._somas
+        if somas is None:
+            somas = pd.Series([], dtype=float, index=pd.MultiIndex.from_arrays([[], []]))
+        por_contraparte = (somas.unstack(fill_value=0.0)
+                           .reindex(columns=range(len(CATEGORIAS)), fill_value=0.0))
+        por_contraparte.columns = CATEGORIAS
+        por_contraparte.insert(0, 'valor', por_contraparte.sum(axis=1))
+        por_contraparte = por_contraparte.sort_values('valor', ascending=False)
+
+        total = por_contraparte['valor'].sum()
+        participacao = por_contraparte['valor'].to_numpy() / total * 100 if total > 0 else np.zeros(len(por_contraparte))
+        por_contraparte.insert(1, 'participacao', participacao)
+
+        por_instrumento = self._escada.sum(axis=1)
+        participacao_instrumento = por_instrumento / total * 100 if total > 0 else np.zeros(len(INSTRUMENTOS))
+
+        escada = pd.DataFrame(self._escada[:, :HORIZONTE_ESCADA + 1].T, columns=INSTRUMENTOS)
+        escada.index.name = 'dia'
+        escada['total'] = escada[INSTRUMENTOS].sum(axis=1)
+        escada['acumulado'] = escada['total'].cumsum()
+
+        balanco = {coluna: por_contraparte[coluna].sum() for coluna in CATEGORIAS[:2]}
+        balanco['funding_curto'] = por_contraparte['atacado_30d'].sum() + por_contraparte['atacado_curto'].sum()
+        balanco['funding_longo'] = por_contraparte['atacado_longo'].sum()
+
+        acumulada = np.cumsum(participacao)
+        return {
+            'n_linhas': self.n_linhas,
+            'total': total,
+            'por_contraparte': por_contraparte,
+            'hhi_contraparte': float(np.sum(participacao ** 2)),
+            'hhi_instrumento': float(np.sum(participacao_instrumento ** 2)),
+            'participacao_maiores': {n: float(acumulada[min(n, len(acumulada)) - 1]) if len(acumulada) else 0.0
+                                     for n in maiores},
+            'contrapartes_significativas': int((participacao > LIMITE_SIGNIFICATIVA).sum()),
+            'por_instrumento': pd.DataFrame({'instrumento': INSTRUMENTOS, 'valor': por_instrumento,
+                                             'participacao': participacao_instrumento}),
+            'escada': escada,
+            'acima_horizonte': self._escada[:, -1].sum(),
+            'balanco': balanco,
+        }
+
+
+def compute_funding_concentration(linhas, data_base):
+    """Calcula concentração e escada de rolagem para um DataFrame de linhas em memória"""
+    agregador = FundingConcentrationAggregator(data_base)
+    agregador.update(linhas)
+    return agregador.result()
+
+
+def compute_funding_concentration_from_csv(arquivo, data_base, chunksize=1_000_000):
+    """Calcula concentração e escada de rolagem lendo o arquivo CSV em lotes"""
+    agregador = FundingConcentrationAggregator(data_base)
+    leitor = pd.read_csv(
+        arquivo,
+        usecols=COLUNAS_FUNDING,
+        dtype={'contraparte': str, 'instrumento': 'category', 'vencimento': str, 'valor': np.float64},
+        chunksize=chunksize,
+    )
+    for lote in leitor:
+        agregador.update(lote)
+    return agregador.result()
+
+
+def concentration_scenario(resultado, n_maiores=10, impacto_hqla=0):
+    """Cenário de estresse em que os n_maiores financiadores retiram todo o funding exigível no horizonte.
+
+    Os percentuais de saída de depósitos e de não renovação do funding de curto
+    prazo são as participações desses financiadores em cada categoria do book;
+    o vetor segue a ordem de PARAMETROS_CENARIO.
+    """
+    maiores = resultado['por_contraparte'].head(n_maiores)
+    balanco = resultado['balanco']
+
+    def _pct(parcela, base):
+        return parcela / base * 100 if base > 0 else 0.0
+
+    parametros = {
+        'saida_varejo': _pct(maiores['depositos_varejo'].sum(), balanco['depositos_varejo']),
+        'saida_corporate': _pct(maiores['depositos_corporate'].sum(), balanco['depositos_corporate']),
+        'renovacao_curto': _pct(maiores['atacado_30d'].sum(), balanco['funding_curto']),
+        'impacto_hqla': impacto_hqla,
+        'duracao': HORIZONTE_ESTRESSE,
+    }
+    return np.array([parametros[p] for p in PARAMETROS_CENARIO], dtype=float)
+
+
+def generate_sample_funding(n_linhas=200_000, n_contrapartes=50_000, data_base='2007-06-30', seed=42):
+    """Gera um book de funding sintético: muitos depositantes pequenos e poucos financiadores de atacado grandes"""
+    rng = np.random.default_rng(seed)
+    instrumento = rng.choice(len(INSTRUMENTOS), n_linhas, p=[0.62, 0.15, 0.08, 0.06, 0.06, 0.03])
+    varejo = instrumento == 0
+
+    # Depositantes de varejo sorteados uniformemente; demais contrapartes com porte de cauda pesada
+    n_atacado = max(n_contrapartes // 50, 10)
+    porte = rng.pareto(1.1, n_atacado) + 1
+    contraparte = np.where(
+        varejo,
+        n_atacado + rng.integers(0, max(n_contrapartes - n_atacado, 1), n_linhas),
+        rng.choice(n_atacado, n_linhas, p=porte / porte.sum()),
+    )
+    nomes = np.char.add(np.where(contraparte < n_atacado, 'Instituição ', 'Cliente '),
+                        (contraparte + 1).astype(str))
+
+    valor = np.where(varejo, rng.lognormal(1.5, 1.0, n_linhas), rng.lognormal(3, 1.2, n_linhas))
+
+    # Prazos típicos por instrumento (dias): depósitos com parcela à vista, interbancário curto, emissões longas
+    prazo_maximo = np.array([720, 360, 90, 1825, 3650, 2555])[instrumento]
+    dias = rng.integers(0, prazo_maximo + 1)
+    dias[(instrumento < 2) & (rng.random(n_linhas) < 0.6)] = 0
+    vencimento = np.datetime64(pd.Timestamp(data_base).normalize(), 'D') + dias
+
+    return pd.DataFrame({
+        'contraparte': nomes,
+        'instrumento': pd.Categorical.from_codes(instrumento, INSTRUMENTOS),
+        'vencimento': vencimento,
+        'valor': valor.round(2),
+    })
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from liquidity_engine import COLUNAS_ENTIDADE, PARAMETROS_CENARIO, entity_stress_matrix
+from scenario_library import scenario_matrix
+
+# Colunas do arquivo de entidades: identificação, região (opcional) e balanço
+COLUNA_ENTIDADE = 'entidade'
+COLUNA_REGIAO = 'regiao'
+
+
+def load_entities(arquivo):
+    """Lê a tabela de entidades (CSV) e valida as colunas obrigatórias"""
+    entidades = pd.read_csv(arquivo)
+    faltantes = [c for c in (COLUNA_ENTIDADE,) + COLUNAS_ENTIDADE if c not in entidades.columns]
+    if faltantes:
+        raise ValueError(f"Colunas ausentes no arquivo de entidades: {', '.join(faltantes)}")
+    return entidades
+
+
+def generate_sample_entities(n_entidades=200, seed=42):
+    """Gera um grupo sintético de entidades com perfis de liquidez variados"""
+    rng = np.random.default_rng(seed)
+    regioes = np.array(['Norte', 'Sul', 'Leste', 'Oeste', 'Centro'])
+
+    # Porte da entidade e composição do funding variam de forma independente
+    porte = rng.lognormal(mean=np.log(5000), sigma=0.8, size=n_entidades)
+    composicao = rng.dirichlet([4, 1.5, 3, 2.5], size=n_entidades)
+    passivos = composicao * porte[:, None]
+
+    ativos_liquidos_pct = rng.uniform(5, 40, n_entidades)
+    hqla = porte * ativos_liquidos_pct / 100 * rng.uniform(0.5, 0.9, n_entidades)
+
+    return pd.DataFrame({
+        COLUNA_ENTIDADE: [f"Entidade {i + 1:03d}" for i in range(n_entidades)],
+        COLUNA_REGIAO: rng.choice(regioes, n_entidades),
+        'ativos_liquidos_pct': ativos_liquidos_pct.round(1),
+        'hqla': hqla.round(0),
+        'depositos_varejo': passivos[:, 0].round(0),
+        'depositos_corporate': passivos[:, 1].round(0),
+        'funding_curto': passivos[:, 2].round(0),
+        'funding_longo': passivos[:, 3].round(0),
+    })
+
+
+def screen_entities(entidades, cenarios, nomes_cenarios):
+    """Monta a tabela de triagem do grupo: indicadores pré-estresse e dias de sobrevivência por cenário"""
+    resultado = entity_stress_matrix(
+        entidades[list(COLUNAS_ENTIDADE)].to_numpy(dtype=float),
+        scenario_matrix(cenarios, PARAMETROS_CENARIO, nomes_cenarios)
+    )
+    falhas = ~resultado['sobrevive']
+
+    tabela = pd.DataFrame({'Entidade': entidades[COLUNA_ENTIDADE].to_numpy()})
+    if COLUNA_REGIAO in entidades.columns:
+        tabela['Região'] = entidades[COLUNA_REGIAO].to_numpy()
+    tabela['LCR Pré-Estresse (%)'] = resultado['lcr_pre']
+    tabela['NSFR Pré-Estresse (%)'] = resultado['nsfr_pre']
+    tabela['Cenários com Falha'] = falhas.sum(axis=1)
+    tabela['Menor Sobrevivência (dias)'] = resultado['dias_sobrevivencia'].min(axis=1) if len(nomes_cenarios) else np.nan
+
+    for i, nome in enumerate(nomes_cenarios):
+        tabela[f'Dias - {nome}'] = resultado['dias_sobrevivencia'][:, i]
+
+    return tabela
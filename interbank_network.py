@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from liquidity_engine import calculate_lcr, calculate_nsfr
+
+# Colunas da tabela de bancos (uma linha por instituição, na mesma ordem da matriz de exposições)
+COLUNAS_BANCO = ('hqla', 'ativos_iliquidos', 'passivos_externos', 'saidas_30d', 'funding_estavel', 'rsf')
+
+# Fator de funding estável disponível atribuído aos empréstimos interbancários recebidos
+FATOR_ASF_INTERBANCARIO = 0.5
+
+
+def load_network(arquivo_bancos, arquivo_exposicoes):
+    """Carrega a tabela de bancos (CSV) e a matriz de exposições bilaterais.
+
+    As exposições podem vir em formato esparso do scipy (.npz) ou como lista de
+    arestas em CSV com as colunas devedor, credor e valor (índices das linhas da
+    tabela de bancos). O elemento [i, j] da matriz é o valor que i deve a j.
+    """
+    bancos = pd.read_csv(arquivo_bancos)
+    faltantes = [c for c in COLUNAS_BANCO if c not in bancos.columns]
+    if faltantes:
+        raise ValueError(f"Colunas ausentes na tabela de bancos: {', '.join(faltantes)}")
+
+    n_bancos = len(bancos)
+    if str(getattr(arquivo_exposicoes, 'name', arquivo_exposicoes)).endswith('.npz'):
+        exposicoes = sparse.load_npz(arquivo_exposicoes).tocsr()
+    else:
+        arestas = pd.read_csv(arquivo_exposicoes, usecols=['devedor', 'credor', 'valor'])
+        exposicoes = sparse.csr_matrix(
+            (arestas['valor'].to_numpy(dtype=float), (arestas['devedor'].to_numpy(), arestas['credor'].to_numpy())),
+            shape=(n_bancos, n_bancos)
+        )
+
+    if exposicoes.shape != (n_bancos, n_bancos):
+        raise ValueError("A matriz de exposições deve ser quadrada, com uma linha por banco")
+    return bancos, exposicoes
+
+
+def generate_sample_network(n_bancos=1000, grau_medio=8, seed=42):
+    """Gera uma rede interbancária sintética com estrutura centro-periferia.
+
+    O porte dos bancos segue uma distribuição de cauda pesada, e a chance de um
+    par de bancos estar ligado é proporcional ao porte de ambos, de modo que
+    poucos bancos grandes concentram a maior parte das exposições.
+    """
+    rng = np.random.default_rng(seed)
+    porte = rng.pareto(1.5, n_bancos) + 1
+
+    # Arestas sorteadas proporcionalmente ao porte de devedor e credor
+    n_arestas = n_bancos * grau_medio
+    peso = porte / porte.sum()
+    devedor = rng.choice(n_bancos, n_arestas, p=peso)
+    credor = rng.choice(n_bancos, n_arestas, p=peso)
+    validas = devedor != credor
+    devedor, credor = devedor[validas], credor[validas]
+    valor = 0.005 * np.sqrt(porte[devedor] * porte[credor]) * rng.lognormal(0, 0.5, len(devedor))
+
+    # Arestas repetidas entre o mesmo par são somadas na conversão para CSR
+    exposicoes = sparse.csr_matrix((valor, (devedor, credor)), shape=(n_bancos, n_bancos))
+    passivo_interbancario = np.asarray(exposicoes.sum(axis=1)).ravel()
+    ativo_interbancario = np.asarray(exposicoes.sum(axis=0)).ravel()
+
+    hqla = porte * rng.uniform(0.08, 0.20, n_bancos)
+    ativos_iliquidos = porte * rng.uniform(0.70, 0.85, n_bancos)
+    ativos_totais = hqla + ativos_iliquidos + ativo_interbancario
+
+    # Capital entre 4% e 10% dos ativos; o restante do passivo é captação externa
+    capital = ativos_totais * rng.uniform(0.04, 0.10, n_bancos)
+    passivos_externos = np.maximum(ativos_totais - capital - passivo_interbancario, 0)
+
+    bancos = pd.DataFrame({
+        'banco': [f"Banco {i + 1:05d}" for i in range(n_bancos)],
+        'hqla': hqla,
+        'ativos_iliquidos': ativos_iliquidos,
+        'passivos_externos': passivos_externos,
+        'saidas_30d': passivos_externos * rng.uniform(0.03, 0.08, n_bancos),
+        'funding_estavel': passivos_externos * 0.8 + capital,
+        'rsf': ativos_iliquidos * 0.85 + hqla * 0.05,
+    })
+    return bancos, exposicoes
+
+
+def clearing_payments(exposicoes, caixa_externo, tol=1e-9, max_iter=1000):
+    """Vetor de pagamentos de Eisenberg-Noe por iteração de ponto fixo.
+
+    p = min(p_barra, max(0, e + Pi^T p)), em que p_barra é o total devido por
+    cada banco na rede e Pi a matriz de passivos relativos. Partindo de
+    p = p_barra, a sequência é monótona decrescente e converge para o maior
+    vetor de compensação. Cada iteração é um único produto matriz-vetor esparso.
+    """
+    p_barra = np.asarray(exposicoes.sum(axis=1)).ravel()
+    escala = np.divide(1.0, p_barra, out=np.zeros_like(p_barra), where=p_barra > 0)
+    pi_t = (sparse.diags(escala) @ exposicoes).T.tocsr()
+
+    pagamentos = p_barra.copy()
+    for iteracao in range(1, max_iter + 1):
+        novos = np.minimum(p_barra, np.maximum(0, caixa_externo + pi_t @ pagamentos))
+        convergiu = np.abs(novos - pagamentos).max(initial=0) <= tol * max(1.0, p_barra.max(initial=0))
+        pagamentos = novos
+        if convergiu:
+            break
+
+    return pagamentos, p_barra, iteracao
+
+
+def simulate_contagion(bancos, exposicoes, bancos_choque, choque_ativos=30, taxa_retirada=50, limite_lcr=100):
+    """Simula o contágio de solvência e de liquidez a partir de um choque inicial.
+
+    1. Solvência: os bancos atingidos perdem choque_ativos% dos ativos ilíquidos
+       e a compensação de Eisenberg-Noe define quem fica inadimplente na rede.
+    2. Liquidez: os bancos atingidos, os inadimplentes e os com LCR abaixo de
+       limite_lcr entram em estresse e retiram
+       taxa_retirada% do funding interbancário concedido aos seus devedores.
+       As retiradas entram como saídas no LCR dos devedores, que por sua vez
+       podem ficar em estresse e retirar funding na rodada seguinte.
+    """
+    n_bancos = exposicoes.shape[0]
+    dados = {coluna: bancos[coluna].to_numpy(dtype=float) for coluna in COLUNAS_BANCO}
+
+    choque = np.zeros(n_bancos)
+    choque[np.asarray(bancos_choque, dtype=int)] = choque_ativos / 100
+
+    # Passivos externos têm prioridade; o caixa que sobra remunera os credores interbancários
+    caixa_externo = dados['hqla'] + dados['ativos_iliquidos'] * (1 - choque) - dados['passivos_externos']
+    pagamentos, p_barra, n_iter = clearing_payments(exposicoes, caixa_externo)
+    inadimplente = pagamentos < p_barra * (1 - 1e-9)
+
+    hqla = dados['hqla']
+    passivo_interbancario = p_barra
+
+    lcr_pre = calculate_lcr(hqla, dados['saidas_30d'])
+    nsfr_pre = calculate_nsfr(dados['funding_estavel'] + FATOR_ASF_INTERBANCARIO * passivo_interbancario, dados['rsf'])
+
+    # Rodadas de retirada de funding: cada rodada é um produto matriz-vetor esparso
+    taxa = taxa_retirada / 100
+    retiradas = np.zeros(n_bancos)
+    estresse = inadimplente | (choque > 0) | (lcr_pre < limite_lcr)
+    rodada_estresse = np.where(estresse, 0, -1)
+    ja_retirou = np.zeros(n_bancos, dtype=bool)
+    rodada = 0
+
+    while True:
+        novos_credores = estresse & ~ja_retirou
+        if not novos_credores.any():
+            break
+        rodada += 1
+        retiradas += exposicoes @ (taxa * novos_credores)
+        ja_retirou |= novos_credores
+
+        lcr = calculate_lcr(hqla, dados['saidas_30d'] + retiradas)
+        novos_estresse = (lcr < limite_lcr) & ~estresse
+        rodada_estresse[novos_estresse] = rodada
+        estresse |= novos_estresse
+
+    lcr_pos = calculate_lcr(hqla, dados['saidas_30d'] + retiradas)
+    nsfr_pos = calculate_nsfr(
+        dados['funding_estavel'] + FATOR_ASF_INTERBANCARIO * (passivo_interbancario - retiradas), dados['rsf']
+    )
+
+    return {
+        'pagamentos': pagamentos,
+        'passivo_interbancario': passivo_interbancario,
+        'perda_credores': p_barra - pagamentos,
+        'inadimplente': inadimplente,
+        'iteracoes_compensacao': n_iter,
+        'retiradas': retiradas,
+        'estresse_liquidez': estresse,
+        'falha_liquidez': hqla < dados['saidas_30d'] + retiradas,
+        'rodada_estresse': rodada_estresse,
+        'n_rodadas': rodada,
+        'lcr_pre': lcr_pre,
+        'lcr_pos': lcr_pos,
+        'nsfr_pre': nsfr_pre,
+        'nsfr_pos': nsfr_pos,
+    }
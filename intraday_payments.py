@@ -0,0 +1,285 @@
+import heapq
+import time
+
+import numpy as np
+import pandas as pd
+
+# Colunas do arquivo de pagamentos; prioridade é opcional (menor = mais urgente)
+COLUNAS_PAGAMENTOS = ['horario', 'pagador', 'recebedor', 'valor']
+COLUNAS_PARTICIPANTES = ['participante', 'saldo_inicial', 'limite_credito']
+
+# Janela do dia operacional em segundos (8h às 18h) e intervalo padrão de resolução de gridlock
+ABERTURA = 8 * 3600
+FECHAMENTO = 18 * 3600
+INTERVALO_GRIDLOCK = 15 * 60
+
+
+def _parse_time(horario):
+    # Aceita segundos desde a meia-noite ou texto HH:MM[:SS]
+    if pd.api.types.is_numeric_dtype(horario):
+        return horario.to_numpy(dtype=float)
+    texto = horario.astype(str).str.strip()
+    # to_timedelta exige hh:mm:ss; horários sem segundos recebem ":00"
+    texto = texto.where(texto.str.count(':') != 1, texto + ':00')
+    return pd.to_timedelta(texto).dt.total_seconds().to_numpy()
+
+
+def load_payments(arquivo_pagamentos, arquivo_participantes=None):
+    """Lê os pagamentos (e, opcionalmente, os saldos e limites dos participantes) de arquivos CSV"""
+    pagamentos = pd.read_csv(arquivo_pagamentos)
+    faltantes = [c for c in COLUNAS_PAGAMENTOS if c not in pagamentos.columns]
+    if faltantes:
+        raise ValueError(f"Colunas ausentes no arquivo de pagamentos: {', '.join(faltantes)}")
+
+    participantes = None
+    if arquivo_participantes is not None:
+        participantes = pd.read_csv(arquivo_participantes)
+        faltantes = [c for c in COLUNAS_PARTICIPANTES if c not in participantes.columns]
+        if faltantes:
+            raise ValueError(f"Colunas ausentes no arquivo de participantes: {', '.join(faltantes)}")
+    return pagamentos, participantes
+
+
+def generate_sample_payments(n_pagamentos=100_000, n_participantes=50, liquidez_inicial=0.05, seed=42):
+    """Gera um dia sintético de pagamentos entre participantes de portes variados.
+
+    O saldo inicial de cada participante é liquidez_inicial vezes o valor que ele
+    envia no dia; o limite de crédito intradiário é metade do saldo inicial.
+    """
+    rng = np.random.default_rng(seed)
+    porte = rng.pareto(1.2, n_participantes) + 1
+    peso = porte / porte.sum()
+
+    pagador = rng.choice(n_participantes, n_pagamentos, p=peso)
+    # Recebedores também proporcionais ao porte, para que os fluxos de cada participante se equilibrem no dia
+    recebedor = rng.choice(n_participantes, n_pagamentos, p=peso)
+    recebedor = np.where(recebedor == pagador, (recebedor + 1) % n_participantes, recebedor)
+    valor = rng.lognormal(mean=0, sigma=1.5, size=n_pagamentos).round(2)
+
+    # Concentração de pagamentos no início da manhã e no fim da tarde
+    horario = np.sort(ABERTURA + (FECHAMENTO - ABERTURA) * rng.beta(0.8, 0.8, n_pagamentos)).round()
+
+    nomes = np.array([f"P{i + 1:03d}" for i in range(n_participantes)])
+    enviado = np.bincount(pagador, weights=valor, minlength=n_participantes)
+    saldo_inicial = (enviado * liquidez_inicial).round(2)
+
+    pagamentos = pd.DataFrame({
+        'horario': horario,
+        'pagador': nomes[pagador],
+        'recebedor': nomes[recebedor],
+        'valor': valor,
+        'prioridade': rng.choice([0, 1], n_pagamentos, p=[0.1, 0.9]),
+    })
+    participantes = pd.DataFrame({
+        'participante': nomes,
+        'saldo_inicial': saldo_inicial,
+        'limite_credito': (saldo_inicial * 0.5).round(2),
+    })
+    return pagamentos, participantes
+
+
+class IntradaySettlement:
+    """Sistema de liquidação bruta em tempo real (LBTR) orientado a eventos.
+
+    Cada pagamento é liquidado na chegada se o pagador tem saldo mais limite de
+    crédito suficientes e não há pagamentos à sua frente; caso contrário, entra
+    na fila do pagador, um heap ordenado por (prioridade, ordem de chegada).
+    Cada crédito recebido tenta liberar a fila do recebedor, em cadeia.
+    Periodicamente, um algoritmo de compensação multilateral resolve gridlocks
+    (filas que só se liberariam simultaneamente).
+    """
+
+    def __init__(self, saldo_inicial, limite_credito):
+        self.saldo = [float(x) for x in saldo_inicial]
+        self.limite = [float(x) for x in limite_credito]
+        self.saldo_minimo = list(self.saldo)
+        n = len(self.saldo)
+        self.filas = [[] for _ in range(n)]
+        self.n_gridlocks = 0
+
+    def _settle(self, k, t):
+        p = self.pagador[k]
+        r = self.recebedor[k]
+        v = self.valor[k]
+        self.saldo[p] -= v
+        self.saldo[r] += v
+        if self.saldo[p] < self.saldo_minimo[p]:
+            self.saldo_minimo[p] = self.saldo[p]
+        self.liquidacao[k] = t
+        return r
+
+    def _release(self, participante, t):
+        # Libera em cadeia as filas que passam a ter cobertura após um crédito
+        pendentes = [participante]
+        saldo, limite, valor, filas = self.saldo, self.limite, self.valor, self.filas
+        while pendentes:
+            q = pendentes.pop()
+            fila = filas[q]
+            while fila and saldo[q] + limite[q] >= valor[fila[0][1]]:
+                _, k = heapq.heappop(fila)
+                r = self._settle(k, t)
+                if filas[r]:
+                    pendentes.append(r)
+
+    def _resolve_gridlock(self, t):
+        # Compensação multilateral: corta o fim da fila dos participantes sem cobertura até que
+        # o conjunto restante possa ser liquidado simultaneamente
+        enfileirados = np.array([k for fila in self.filas for _, k in fila], dtype=np.int64)
+        if enfileirados.size == 0:
+            return 0
+
+        n = len(self.saldo)
+        # Ordena por pagador e, dentro de cada fila, por prioridade e chegada
+        enfileirados = enfileirados[np.lexsort((enfileirados, self._prioridade_np[enfileirados],
+                                                self._pagador_np[enfileirados]))]
+        pagador = self._pagador_np[enfileirados]
+        recebedor = self._recebedor_np[enfileirados]
+        valor = self._valor_np[enfileirados]
+        inicio_fila = np.flatnonzero(np.r_[True, pagador[1:] != pagador[:-1]])
+        tamanho_fila = np.diff(np.r_[inicio_fila, len(pagador)])
+
+        disponivel = np.array(self.saldo) + np.array(self.limite)
+        ativo = np.ones(len(enfileirados), dtype=bool)
+        while True:
+            # Saída acumulada de cada pagador ao longo da própria fila
+            acumulado = np.cumsum(valor * ativo)
+            base = np.repeat(acumulado[inicio_fila] - (valor * ativo)[inicio_fila], tamanho_fila)
+            cobertura = disponivel + np.bincount(recebedor[ativo], weights=valor[ativo], minlength=n)
+            # Mantém o maior prefixo de cada fila coberto pelo saldo mais as entradas ainda ativas
+            novo_ativo = ativo & (acumulado - base <= cobertura[pagador] + 1e-9)
+            if novo_ativo.sum() == ativo.sum():
+                break
+            ativo = novo_ativo
+
+        liquidados = enfileirados[ativo]
+        if liquidados.size == 0:
+            return 0
+
+        # Liquidação simultânea: só a posição líquida de cada participante afeta o saldo
+        liquido = (np.bincount(recebedor[ativo], weights=valor[ativo], minlength=n)
+                   - np.bincount(pagador[ativo], weights=valor[ativo], minlength=n))
+        self.saldo[:] = (np.array(self.saldo) + liquido).tolist()
+        for k in liquidados.tolist():
+            self.liquidacao[k] = t
+        for p in np.unique(pagador[ativo]).tolist():
+            self.saldo_minimo[p] = min(self.saldo_minimo[p], self.saldo[p])
+            self.filas[p] = [item for item in self.filas[p] if self.liquidacao[item[1]] < 0]
+            heapq.heapify(self.filas[p])
+
+        self.n_gridlocks += 1
+        return int(liquidados.size)
+
+    def run(self, horario, pagador, recebedor, valor, prioridade, intervalo_gridlock=INTERVALO_GRIDLOCK):
+        """Processa os pagamentos em ordem cronológica e retorna o horário de liquidação de cada um (-1 = não liquidado)"""
+        self._pagador_np = np.asarray(pagador, dtype=np.int64)
+        self._recebedor_np = np.asarray(recebedor, dtype=np.int64)
+        self._valor_np = np.asarray(valor, dtype=float)
+        self._prioridade_np = np.asarray(prioridade, dtype=np.int64)
+
+        # Listas Python: o laço de eventos acessa elementos individuais, mais rápido que arrays NumPy
+        self.pagador = self._pagador_np.tolist()
+        self.recebedor = self._recebedor_np.tolist()
+        self.valor = self._valor_np.tolist()
+        prioridade = self._prioridade_np.tolist()
+        horario = np.asarray(horario, dtype=float).tolist()
+        self.liquidacao = [-1.0] * len(self.valor)
+
+        saldo, limite, filas, valores = self.saldo, self.limite, self.filas, self.valor
+        proximo_gridlock = (horario[0] + intervalo_gridlock) if horario else 0
+
+        for k in range(len(horario)):
+            t = horario[k]
+            if t >= proximo_gridlock:
+                if self._resolve_gridlock(proximo_gridlock):
+                    for q in range(len(filas)):
+                        if filas[q]:
+                            self._release(q, proximo_gridlock)
+                proximo_gridlock = t + intervalo_gridlock
+
+            p = self.pagador[k]
+            if not filas[p] and saldo[p] + limite[p] >= valores[k]:
+                r = self._settle(k, t)
+                if filas[r]:
+                    self._release(r, t)
+            else:
+                heapq.heappush(filas[p], (prioridade[k], k))
+                self._release(p, t)
+
+        # Resolução final de gridlock no fechamento
+        if horario and self._resolve_gridlock(horario[-1]):
+            for q in range(len(filas)):
+                if filas[q]:
+                    self._release(q, horario[-1])
+
+        return np.array(self.liquidacao)
+
+
+def simulate_intraday(pagamentos, participantes=None, intervalo_gridlock=INTERVALO_GRIDLOCK):
+    """Simula o dia de liquidação e calcula o uso de liquidez intradiária por participante.
+
+    Sem a tabela de participantes, todos começam com saldo zero e crédito
+    ilimitado: nada fica na fila, e o pico de uso de liquidez mede a necessidade
+    de liquidez de cada participante.
+    """
+    inicio = time.perf_counter()
+
+    horario = _parse_time(pagamentos['horario'])
+    prioridade = pagamentos['prioridade'].to_numpy() if 'prioridade' in pagamentos.columns else np.zeros(len(pagamentos))
+
+    # Códigos inteiros para os participantes (os da tabela primeiro, na mesma ordem)
+    nomes_base = participantes['participante'].astype(str) if participantes is not None else pd.Series([], dtype=str)
+    codigos, nomes = pd.factorize(pd.concat([
+        nomes_base, pagamentos['pagador'].astype(str), pagamentos['recebedor'].astype(str)
+    ], ignore_index=True))
+    n_base, n_pagamentos = len(nomes_base), len(pagamentos)
+    pagador = codigos[n_base:n_base + n_pagamentos]
+    recebedor = codigos[n_base + n_pagamentos:]
+
+    saldo_inicial = np.zeros(len(nomes))
+    limite_credito = np.full(len(nomes), np.inf)
+    if participantes is not None:
+        saldo_inicial[:n_base] = participantes['saldo_inicial'].to_numpy(dtype=float)
+        limite_credito[:n_base] = participantes['limite_credito'].to_numpy(dtype=float)
+        # Participantes ausentes da tabela operam sem saldo nem crédito
+        limite_credito[n_base:] = 0
+
+    # Ordem cronológica estável (empates mantêm a ordem do arquivo)
+    ordem = np.argsort(horario, kind='stable')
+    sistema = IntradaySettlement(saldo_inicial, limite_credito)
+    liquidacao_ordenada = sistema.run(horario[ordem], pagador[ordem], recebedor[ordem],
+                                      pagamentos['valor'].to_numpy(dtype=float)[ordem], prioridade[ordem],
+                                      intervalo_gridlock)
+    liquidacao = np.empty_like(liquidacao_ordenada)
+    liquidacao[ordem] = liquidacao_ordenada
+
+    valor = pagamentos['valor'].to_numpy(dtype=float)
+    liquidado = liquidacao >= 0
+    n_participantes = len(nomes)
+    saldo_inicial_ = np.asarray(saldo_inicial)
+    saldo_minimo = np.array(sistema.saldo_minimo)
+
+    por_participante = pd.DataFrame({
+        'Participante': np.asarray(nomes),
+        'Saldo Inicial': saldo_inicial_,
+        'Saldo Final': np.array(sistema.saldo),
+        'Pico de Uso de Liquidez': saldo_inicial_ - saldo_minimo,
+        'Uso de Crédito Intradiário': np.maximum(0, -saldo_minimo),
+        'Valor Enviado': np.bincount(pagador, weights=valor, minlength=n_participantes),
+        'Valor Não Liquidado': np.bincount(pagador, weights=valor * ~liquidado, minlength=n_participantes),
+    })
+
+    atraso = np.where(liquidado, liquidacao - horario, np.nan)
+    duracao = time.perf_counter() - inicio
+
+    return {
+        'liquidacao': liquidacao,
+        'atraso': atraso,
+        'por_participante': por_participante,
+        'n_pagamentos': n_pagamentos,
+        'n_liquidados': int(liquidado.sum()),
+        'valor_liquidado': float(valor[liquidado].sum()),
+        'valor_total': float(valor.sum()),
+        'n_gridlocks': sistema.n_gridlocks,
+        'tempo_processamento': duracao,
+        'eventos_por_minuto': n_pagamentos / duracao * 60 if duracao > 0 else np.inf,
+    }
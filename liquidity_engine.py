@@ -0,0 +1,318 @@
+import numpy as np
+
+# Horizonte padrão da simulação de crise (dias)
+DIAS_SIMULACAO = 30
+
+
+def first_failure_day(ativos_liquidos):
+    """Retorna, para cada cenário, o primeiro dia (> 0) em que os ativos líquidos se esgotam.
+
+    O valor 0 indica que o banco sobreviveu a todo o horizonte simulado.
+    """
+    esgotado = ativos_liquidos[:, 1:] <= 0
+    return np.where(esgotado.any(axis=1), esgotado.argmax(axis=1) + 1, 0)
+
+
+def _broadcast_params(ativos_liquidos_pct, wholesale_funding_pct, stress_level):
+    ativos, wholesale, stress = np.broadcast_arrays(
+        np.asarray(ativos_liquidos_pct, dtype=float),
+        np.asarray(wholesale_funding_pct, dtype=float),
+        np.asarray(stress_level, dtype=float),
+    )
+    return ativos.ravel(), wholesale.ravel(), stress.ravel()
+
+
+def _decay_factors(stress, dias_simulacao):
+    # Fatores acumulados de permanência do funding (dias 1..N), calculados uma vez por nível de estresse
+    niveis, idx = np.unique(stress, return_inverse=True)
+
+    impacto_varejo = np.minimum(50, niveis * 5)
+    impacto_wholesale = np.minimum(90, niveis * 9)
+
+    dias = np.arange(1, dias_simulacao + 1)
+    prob_corrida = np.minimum(1.0, dias[None, :] / dias_simulacao * (niveis[:, None] / 10))
+
+    # Taxas diárias de saída; no máximo 0,5/N e 0,9/(N/2), logo o max(0, ...) da recursão nunca atua
+    taxa_varejo = (impacto_varejo[:, None] / 100) * prob_corrida / dias_simulacao
+    taxa_wholesale = (impacto_wholesale[:, None] / 100) * prob_corrida / (dias_simulacao / 2)
+
+    fator_varejo = np.cumprod(1 - taxa_varejo, axis=1)
+    fator_wholesale = np.cumprod(1 - taxa_wholesale, axis=1)
+    return fator_varejo, fator_wholesale, idx.ravel()
+
+
+def _funding_balances(ativos, wholesale, stress, dias_simulacao):
+    # Saldos de depósitos de varejo e funding wholesale em forma fechada (cenários x dias)
+    fator_varejo, fator_wholesale, idx = _decay_factors(stress, dias_simulacao)
+
+    depositos_varejo = np.empty((ativos.size, dias_simulacao + 1))
+    funding_wholesale = np.empty((ativos.size, dias_simulacao + 1))
+    depositos_varejo[:, 0] = 100 - wholesale
+    funding_wholesale[:, 0] = wholesale
+    depositos_varejo[:, 1:] = depositos_varejo[:, :1] * fator_varejo[idx]
+    funding_wholesale[:, 1:] = funding_wholesale[:, :1] * fator_wholesale[idx]
+    return depositos_varejo, funding_wholesale
+
+
+def _liquid_assets_before_floor(ativos, depositos_varejo, funding_wholesale):
+    # As saídas acumuladas são exatamente a queda acumulada dos saldos de funding
+    saidas_acumuladas = (depositos_varejo[:, :1] - depositos_varejo) + (funding_wholesale[:, :1] - funding_wholesale)
+    return ativos[:, None] - saidas_acumuladas
+
+
+def simulate_crisis_paths(ativos_liquidos_pct, wholesale_funding_pct, stress_level, dias_simulacao=DIAS_SIMULACAO):
+    """Simula a crise de liquidez para vários bancos/cenários de uma só vez.
+
+    Os parâmetros podem ser escalares ou arrays (com broadcasting entre si), e os
+    resultados são matrizes (cenários x dias). A recursão diária é resolvida de
+    forma fechada: cada saldo de funding decai por um fator geométrico diário
+    (produto acumulado), e os ativos líquidos são o saldo inicial menos a queda
+    acumulada do funding, truncado em zero.
+    """
+    ativos, wholesale, stress = _broadcast_params(ativos_liquidos_pct, wholesale_funding_pct, stress_level)
+    depositos_varejo, funding_wholesale = _funding_balances(ativos, wholesale, stress, dias_simulacao)
+
+    # Uma vez esgotados, os ativos líquidos permanecem em zero: basta truncar o saldo acumulado
+    ativos_liquidos = np.maximum(0, _liquid_assets_before_floor(ativos, depositos_varejo, funding_wholesale))
+
+    saida_total = -np.diff(depositos_varejo, axis=1) - np.diff(funding_wholesale, axis=1)
+    saldo_liquido = np.zeros_like(ativos_liquidos)
+    saldo_liquido[:, 1:] = ativos_liquidos[:, 1:] - (ativos_liquidos[:, :-1] - saida_total)
+
+    return {
+        'dias': np.arange(dias_simulacao + 1),
+        'depositos_varejo': depositos_varejo,
+        'funding_wholesale': funding_wholesale,
+        'ativos_liquidos': ativos_liquidos,
+        'ativos_iliquidos': 100 - ativos,
+        'saldo_liquido': saldo_liquido,
+        'failed_day': first_failure_day(ativos_liquidos),
+    }
+
+
+def crisis_failure_day(ativos_liquidos_pct, wholesale_funding_pct, stress_level, dias_simulacao=DIAS_SIMULACAO):
+    """Calcula apenas o dia de falha (0 = sobreviveu), sem montar as trajetórias completas.
+
+    Como as saídas acumuladas só crescem, o banco falha se e somente se as saídas
+    acumuladas no último dia superam os ativos líquidos iniciais. A busca do dia
+    exato é feita apenas para os cenários que falham.
+    """
+    ativos, wholesale, stress = _broadcast_params(ativos_liquidos_pct, wholesale_funding_pct, stress_level)
+    fator_varejo, fator_wholesale, idx = _decay_factors(stress, dias_simulacao)
+    depositos_varejo = 100 - wholesale
+
+    saidas_finais = (depositos_varejo - depositos_varejo * fator_varejo[idx, -1]) + \
+                    (wholesale - wholesale * fator_wholesale[idx, -1])
+    falha = np.flatnonzero(ativos - saidas_finais <= 0)
+
+    dias_falha = np.zeros(ativos.size, dtype=np.int64)
+    if falha.size:
+        dv = depositos_varejo[falha, None]
+        fw = wholesale[falha, None]
+        saidas = (dv - dv * fator_varejo[idx[falha]]) + (fw - fw * fator_wholesale[idx[falha]])
+        dias_falha[falha] = np.argmax(ativos[falha, None] - saidas <= 0, axis=1) + 1
+    return dias_falha
+
+
+def simulate_crisis_paths_reference(ativos_liquidos_pct, wholesale_funding_pct, stress_level, dias_simulacao=DIAS_SIMULACAO):
+    """Implementação de referência: recursão dia a dia, vetorizada apenas entre cenários"""
+    ativos, wholesale, stress = _broadcast_params(ativos_liquidos_pct, wholesale_funding_pct, stress_level)
+    n_cenarios = ativos.size
+
+    impacto_varejo = np.minimum(50, stress * 5)  # Impacto limitado nos depósitos de varejo
+    impacto_wholesale = np.minimum(90, stress * 9)  # Impacto maior no funding wholesale
+
+    depositos_varejo = np.empty((n_cenarios, dias_simulacao + 1))
+    funding_wholesale = np.empty((n_cenarios, dias_simulacao + 1))
+    ativos_liquidos = np.empty((n_cenarios, dias_simulacao + 1))
+    saldo_liquido = np.empty((n_cenarios, dias_simulacao + 1))
+
+    depositos_varejo[:, 0] = 100 - wholesale
+    funding_wholesale[:, 0] = wholesale
+    ativos_liquidos[:, 0] = ativos
+    saldo_liquido[:, 0] = 0
+
+    for dia in range(1, dias_simulacao + 1):
+        # Probabilidade crescente de corrida bancária
+        prob_corrida = np.minimum(1.0, dia / dias_simulacao * (stress / 10))
+
+        saida_varejo = depositos_varejo[:, dia - 1] * (impacto_varejo / 100) * prob_corrida / dias_simulacao
+        saida_wholesale = funding_wholesale[:, dia - 1] * (impacto_wholesale / 100) * prob_corrida / (dias_simulacao / 2)
+
+        depositos_varejo[:, dia] = np.maximum(0, depositos_varejo[:, dia - 1] - saida_varejo)
+        funding_wholesale[:, dia] = np.maximum(0, funding_wholesale[:, dia - 1] - saida_wholesale)
+
+        # Uso de ativos líquidos para cobrir saídas
+        ativos_antes = ativos_liquidos[:, dia - 1] - (saida_varejo + saida_wholesale)
+        ativos_liquidos[:, dia] = np.maximum(0, ativos_antes)
+        saldo_liquido[:, dia] = ativos_liquidos[:, dia] - ativos_antes
+
+    return {
+        'dias': np.arange(dias_simulacao + 1),
+        'depositos_varejo': depositos_varejo,
+        'funding_wholesale': funding_wholesale,
+        'ativos_liquidos': ativos_liquidos,
+        'ativos_iliquidos': 100 - ativos,
+        'saldo_liquido': saldo_liquido,
+        'failed_day': first_failure_day(ativos_liquidos),
+    }
+
+
+def _ratio_pct(numerador, denominador):
+    # Razão percentual com divisão mascarada: denominador zero resulta em infinito.
+    # Entradas escalares devolvem um escalar; arrays e Series devolvem um array.
+    numerador, denominador = np.broadcast_arrays(np.asarray(numerador, dtype=float), np.asarray(denominador, dtype=float))
+    resultado = np.full(numerador.shape, np.inf)
+    np.divide(numerador, denominador, out=resultado, where=denominador != 0)
+    return resultado[()] * 100
+
+
+def calculate_lcr(hqla, saidas_30dias):
+    """Calcula o Liquidity Coverage Ratio (escalares ou arrays com broadcasting)"""
+    return _ratio_pct(hqla, saidas_30dias)
+
+
+def calculate_nsfr(funding_estavel, ativos_longo_prazo):
+    """Calcula o Net Stable Funding Ratio (escalares ou arrays com broadcasting)"""
+    return _ratio_pct(funding_estavel, ativos_longo_prazo)
+
+
+# Colunas da matriz de cenários e da matriz de configurações de balanço
+COLUNAS_CENARIO = ('retail_outflow', 'wholesale_outflow', 'market_liquidity')
+COLUNAS_CONFIGURACAO = ('ativos_liquidos_pct', 'wholesale_funding_pct')
+
+
+def stress_test_matrix(cenarios, configuracoes):
+    """Aplica todos os cenários de estresse a todas as configurações de balanço.
+
+    cenarios: array (S x 3) com saída de varejo (%), saída de wholesale (%) e
+    fator de liquidez de mercado. configuracoes: array (B x 2) com ativos
+    líquidos (%) e funding wholesale (%). Os resultados são matrizes (S x B).
+    """
+    cenarios = np.atleast_2d(np.asarray(cenarios, dtype=float))
+    configuracoes = np.atleast_2d(np.asarray(configuracoes, dtype=float))
+
+    retail_outflow = cenarios[:, 0, None]
+    wholesale_outflow = cenarios[:, 1, None]
+    market_liquidity = cenarios[:, 2, None]
+    ativos_liquidos_pct = configuracoes[None, :, 0]
+    wholesale_funding_pct = configuracoes[None, :, 1]
+
+    # Calcular novos valores após o estresse
+    new_retail = (100 - wholesale_funding_pct) * (1 - retail_outflow / 100)
+    new_wholesale = wholesale_funding_pct * (1 - wholesale_outflow / 100)
+    new_liquid_assets = ativos_liquidos_pct * market_liquidity
+
+    # Calcular novos indicadores
+    new_lcr = calculate_lcr(new_liquid_assets, (new_retail + new_wholesale) * 0.3)
+    new_nsfr = calculate_nsfr(new_retail + (new_wholesale * 0.5), np.broadcast_to(100 - ativos_liquidos_pct, new_lcr.shape))
+
+    return {
+        'survived': (new_lcr >= 70) & (new_liquid_assets > 0),
+        'new_lcr': new_lcr,
+        'new_nsfr': new_nsfr,
+        'liquid_assets_remaining': new_liquid_assets,
+    }
+
+
+# Parâmetros de cada cenário da simulação de estresse do balanço (percentuais e duração em dias)
+PARAMETROS_CENARIO = ('saida_varejo', 'saida_corporate', 'renovacao_curto', 'impacto_hqla', 'duracao')
+
+
+def project_stress_liquidity(hqla, depositos_varejo, depositos_corporate, funding_curto, cenarios):
+    """Projeta a liquidez diária de todos os cenários de estresse de uma só vez.
+
+    cenarios: array (S x 5) com as colunas de PARAMETROS_CENARIO. As saídas de
+    cada cenário são distribuídas uniformemente ao longo da sua duração, de modo
+    que a trajetória é linear e o dia de esgotamento do HQLA é obtido
+    analiticamente. Retorna a matriz de liquidez (cenários x dias), com NaN após
+    o fim de cada cenário.
+    """
+    cenarios = np.atleast_2d(np.asarray(cenarios, dtype=float))
+    resultado = _scenario_outflows(hqla, depositos_varejo, depositos_corporate, funding_curto, cenarios)
+    duracao = cenarios[:, 4]
+
+    dias = np.arange(int(duracao.max()) + 1)
+    saida_diaria = resultado['total_saidas'] / duracao
+    liquidez = np.maximum(0, resultado['hqla_ajustado'][:, None] - saida_diaria[:, None] * dias[None, :])
+    liquidez[dias[None, :] > duracao[:, None]] = np.nan
+
+    resultado['dias'] = dias
+    resultado['liquidez'] = liquidez
+    return resultado
+
+
+def scenario_survival_days(hqla, depositos_varejo, depositos_corporate, funding_curto, cenarios):
+    """Dias de sobrevivência em cada cenário, sem a projeção diária.
+
+    Os parâmetros do balanço podem ser escalares ou arrays alinhados aos
+    cenários (um balanço por cenário), como nas buscas de colchão mínimo.
+    """
+    cenarios = np.atleast_2d(np.asarray(cenarios, dtype=float))
+    return _scenario_outflows(hqla, depositos_varejo, depositos_corporate, funding_curto, cenarios)['dias_sobrevivencia']
+
+
+def _scenario_outflows(hqla, depositos_varejo, depositos_corporate, funding_curto, cenarios):
+    # Saídas, HQLA ajustado e dias de sobrevivência; o balanço pode ter uma dimensão extra à esquerda dos cenários
+    saida_varejo, saida_corporate, renovacao_curto, impacto_hqla, duracao = cenarios.T
+
+    saida_dep_varejo = depositos_varejo * (saida_varejo / 100)
+    saida_dep_corp = depositos_corporate * (saida_corporate / 100)
+    nao_renovacao_curto = funding_curto * (renovacao_curto / 100)
+    total_saidas = saida_dep_varejo + saida_dep_corp + nao_renovacao_curto
+    hqla_ajustado = hqla * (1 - impacto_hqla / 100)
+
+    # Fração da duração coberta pelo HQLA (infinita quando não há saídas)
+    cobertura = _ratio_pct(hqla_ajustado, total_saidas) / 100
+    dias_sobrevivencia = np.minimum(duracao, cobertura * duracao)
+
+    return {
+        'saida_dep_varejo': saida_dep_varejo,
+        'saida_dep_corp': saida_dep_corp,
+        'nao_renovacao_curto': nao_renovacao_curto,
+        'total_saidas': total_saidas,
+        'hqla_ajustado': hqla_ajustado,
+        'sobrevive': hqla_ajustado >= total_saidas,
+        'dias_sobrevivencia': dias_sobrevivencia,
+    }
+
+
+# Colunas do balanço de cada entidade na visão de grupo
+COLUNAS_ENTIDADE = ('ativos_liquidos_pct', 'hqla', 'depositos_varejo', 'depositos_corporate', 'funding_curto', 'funding_longo')
+
+
+def balance_sheet_ratios(ativos_liquidos_pct, hqla, depositos_varejo, depositos_corporate, funding_curto, funding_longo):
+    """Calcula LCR e NSFR pré-estresse do balanço simplificado (escalares ou arrays)"""
+    total_passivos = depositos_varejo + depositos_corporate + funding_curto + funding_longo
+    total_ativos = total_passivos  # Assumindo balanço equilibrado
+    ativos_liquidos = total_ativos * (ativos_liquidos_pct / 100)
+    ativos_iliquidos = total_ativos - ativos_liquidos
+
+    return {
+        'total_passivos': total_passivos,
+        'total_ativos': total_ativos,
+        'ativos_liquidos': ativos_liquidos,
+        'ativos_iliquidos': ativos_iliquidos,
+        'lcr_pre': calculate_lcr(hqla, funding_curto * 0.5 + depositos_varejo * 0.1 + depositos_corporate * 0.2),
+        'nsfr_pre': calculate_nsfr(depositos_varejo * 0.9 + depositos_corporate * 0.5 + funding_longo * 0.8,
+                                   ativos_iliquidos * 0.85 + ativos_liquidos * 0.15),
+    }
+
+
+def entity_stress_matrix(entidades, cenarios):
+    """Avalia todas as entidades em todos os cenários de estresse em uma única passada.
+
+    entidades: array (E x 6) com as colunas de COLUNAS_ENTIDADE. cenarios: array
+    (S x 5) com as colunas de PARAMETROS_CENARIO. Os indicadores pré-estresse têm
+    forma (E,) e os resultados por cenário, (E x S).
+    """
+    entidades = np.atleast_2d(np.asarray(entidades, dtype=float))
+    cenarios = np.atleast_2d(np.asarray(cenarios, dtype=float))
+
+    indicadores = balance_sheet_ratios(*entidades.T)
+    hqla, depositos_varejo, depositos_corporate, funding_curto = (entidades[:, i, None] for i in range(1, 5))
+    resultado = _scenario_outflows(hqla, depositos_varejo, depositos_corporate, funding_curto, cenarios)
+
+    resultado['lcr_pre'] = indicadores['lcr_pre']
+    resultado['nsfr_pre'] = indicadores['nsfr_pre']
+    return resultado
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+# Limites superiores (em dias) das faixas de vencimento padrão; a última faixa é aberta
+LIMITES_PADRAO = [7, 30, 90, 180, 360]
+ROTULOS_PADRAO = ["0-7 dias", "8-30 dias", "31-90 dias", "91-180 dias", "181-360 dias", "Acima de 1 ano"]
+
+# Tipos de contrato que geram entradas (ativos) e saídas (passivos) no vencimento
+TIPOS_ATIVO = ['titulo', 'emprestimo']
+TIPOS_PASSIVO = ['deposito', 'funding']
+
+# Horizonte dos histogramas diários (dias); vencimentos posteriores vão para uma posição de excedente
+HORIZONTE_DIARIO = 3650
+
+
+def bucket_labels(limites):
+    """Gera os rótulos das faixas a partir dos limites em dias"""
+    if list(limites) == LIMITES_PADRAO:
+        return list(ROTULOS_PADRAO)
+    inicios = [0] + [limite + 1 for limite in limites[:-1]]
+    rotulos = [f"{inicio}-{limite} dias" for inicio, limite in zip(inicios, limites)]
+    return rotulos + [f"Acima de {limites[-1]} dias"]
+
+
+def bucket_cash_flows(dias_vencimento, valores, limites=LIMITES_PADRAO):
+    """Soma os fluxos de caixa por faixa de vencimento (len(limites) + 1 faixas)"""
+    faixa = np.searchsorted(limites, dias_vencimento, side='left')
+    return np.bincount(faixa, weights=valores, minlength=len(limites) + 1)
+
+
+class MaturityLadder:
+    """Escada de vencimentos com atualização incremental.
+
+    Os fluxos são mantidos como histogramas diários (índice = dias até o
+    vencimento), de modo que incluir ou baixar contratos custa apenas um
+    bincount do lote, e a passagem do tempo é um deslocamento dos histogramas.
+    As faixas são recalculadas a partir dos histogramas sob demanda.
+
+    Os histogramas têm tamanho fixo: vencimentos além de horizonte_diario são
+    somados em uma posição de excedente, que cai sempre na última faixa (aberta).
+    Por isso o horizonte deve superar o último limite pelo menos pelo total de
+    dias avançados com advance().
+    """
+
+    def __init__(self, limites=LIMITES_PADRAO, horizonte_diario=HORIZONTE_DIARIO):
+        self.limites = list(limites)
+        self.horizonte_diario = max(horizonte_diario, self.limites[-1])
+        self.reset()
+
+    def reset(self):
+        # Posições 0..horizonte_diario são dias; a última acumula os vencimentos além do horizonte
+        self._ativos = np.zeros(self.horizonte_diario + 2)
+        self._passivos = np.zeros(self.horizonte_diario + 2)
+
+    def _accumulate(self, fluxos, dias_vencimento, valores):
+        dias_vencimento = np.asarray(dias_vencimento, dtype=np.int64)
+        if dias_vencimento.size and dias_vencimento.min() < 0:
+            raise ValueError("Dias até o vencimento não podem ser negativos")
+
+        posicao = np.minimum(dias_vencimento, self.horizonte_diario + 1)
+        fluxos += np.bincount(posicao, weights=valores, minlength=len(fluxos))
+        return fluxos
+
+    def _shift(self, fluxos, n_dias):
+        # Desloca os dias do histograma; o excedente além do horizonte permanece na última posição
+        deslocado = np.zeros_like(fluxos)
+        deslocado[:-1 - n_dias] = fluxos[n_dias:-1]
+        deslocado[-1] = fluxos[-1]
+        return deslocado
+
+    def add(self, dias_vencimento, valores, passivo=False):
+        """Inclui contratos na escada (valores positivos)"""
+        if passivo:
+            self._passivos = self._accumulate(self._passivos, dias_vencimento, valores)
+        else:
+            self._ativos = self._accumulate(self._ativos, dias_vencimento, valores)
+
+    def remove(self, dias_vencimento, valores, passivo=False):
+        """Baixa contratos da escada (liquidação antecipada, venda, cancelamento)"""
+        self.add(dias_vencimento, -np.asarray(valores, dtype=float), passivo)
+
+    def add_positions(self, posicoes):
+        """Inclui um lote de posições contratuais (formato de contract_liquidity)"""
+        for tipos, passivo in ((TIPOS_ATIVO, False), (TIPOS_PASSIVO, True)):
+            selecao = posicoes['tipo'].isin(tipos).to_numpy()
+            self.add(posicoes['vencimento_dias'].to_numpy()[selecao],
+                     posicoes['valor'].to_numpy(dtype=float)[selecao], passivo)
+
+    def advance(self, n_dias):
+        """Avança o relógio em n_dias: os contratos vencidos saem da escada.
+
+        Retorna as entradas e saídas realizadas no período.
+        """
+        n_dias = min(n_dias, self.horizonte_diario + 1)
+        realizado = {'entradas': self._ativos[:n_dias].sum(), 'saidas': self._passivos[:n_dias].sum()}
+        self._ativos = self._shift(self._ativos, n_dias)
+        self._passivos = self._shift(self._passivos, n_dias)
+        return realizado
+
+    def ladder(self):
+        """Retorna ativos, passivos, gap e gap acumulado por faixa de vencimento"""
+        ativos = bucket_cash_flows(np.arange(len(self._ativos)), self._ativos, self.limites)
+        passivos = bucket_cash_flows(np.arange(len(self._passivos)), self._passivos, self.limites)
+        gap = ativos - passivos
+
+        return pd.DataFrame({
+            'Faixa': bucket_labels(self.limites),
+            'Ativos': ativos,
+            'Passivos': passivos,
+            'Gap': gap,
+            'Gap Acumulado': np.cumsum(gap),
+        })
+
+
+def maturity_ladder_from_csv(arquivo, limites=LIMITES_PADRAO, chunksize=1_000_000):
+    """Monta a escada de vencimentos lendo o arquivo de posições em lotes"""
+    escada = MaturityLadder(limites)
+    leitor = pd.read_csv(
+        arquivo,
+        usecols=['tipo', 'vencimento_dias', 'valor'],
+        dtype={'tipo': 'category', 'vencimento_dias': np.int64, 'valor': np.float64},
+        chunksize=chunksize,
+    )
+    for lote in leitor:
+        escada.add_positions(lote)
+    return escada
@@ -0,0 +1,92 @@
+import os
+import pickle
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+
+# Modelos candidatos: nome -> (família, hiperparâmetros)
+MODELOS_PADRAO = {
+    "Logística (C=0.01)": ("logistic", {"C": 0.01}),
+    "Logística (C=1.0)": ("logistic", {"C": 1.0}),
+    "Logística (C=100)": ("logistic", {"C": 100.0}),
+    "Gradient Boosting": ("gradient_boosting", {"max_iter": 200, "learning_rate": 0.1}),
+    "Random Forest": ("random_forest", {"n_estimators": 100, "max_depth": 10}),
+}
+
+# Base de treino/teste compartilhada por cada processo (enviada uma única vez por worker)
+_split = {}
+
+
+def _init_worker(X_train, y_train, X_test, y_test):
+    _split['X_train'] = X_train
+    _split['y_train'] = y_train
+    _split['X_test'] = X_test
+    _split['y_test'] = y_test
+
+
+def build_model(family, params):
+    """Instancia um modelo da família indicada"""
+    if family == "logistic":
+        return LogisticRegression(max_iter=1000, random_state=42, **params)
+    if family == "gradient_boosting":
+        return HistGradientBoostingClassifier(random_state=42, **params)
+    if family == "random_forest":
+        # n_jobs=1: o paralelismo já é feito entre modelos, no pool de processos
+        return RandomForestClassifier(random_state=42, n_jobs=1, **params)
+    raise ValueError(f"Família de modelo desconhecida: {family}")
+
+
+def evaluate_model(name, family, params):
+    """Treina e avalia um modelo na base compartilhada do processo"""
+    X_train, y_train = _split['X_train'], _split['y_train']
+    X_test, y_test = _split['X_test'], _split['y_test']
+
+    # Tempo do ajuste, sem rastreamento de memória (o tracemalloc torna as alocações bem mais lentas)
+    model = build_model(family, params)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    # Pico de memória medido em um segundo ajuste, separado, com o tracemalloc ativo
+    tracemalloc.start()
+    build_model(family, params).fit(X_train, y_train)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Vazão de escoragem
+    start = time.perf_counter()
+    y_proba = model.predict_proba(X_test)[:, 1]
+    predict_time = time.perf_counter() - start
+
+    return {
+        'Modelo': name,
+        'AUC': roc_auc_score(y_test, y_proba),
+        'Tempo de Ajuste (s)': fit_time,
+        'Previsões por Segundo': len(X_test) / predict_time if predict_time > 0 else float('inf'),
+        'Pico de Memória no Ajuste (MB)': peak_memory / 1024 ** 2,
+        'Tamanho do Modelo (KB)': len(pickle.dumps(model)) / 1024,
+    }
+
+
+def compare_models(X_train, y_train, X_test, y_test, models=None, max_workers=None):
+    """Treina os modelos candidatos em paralelo e consolida os resultados em uma tabela"""
+    models = models or MODELOS_PADRAO
+    max_workers = max_workers or min(len(models), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(X_train, y_train, X_test, y_test),
+    ) as executor:
+        futures = [
+            executor.submit(evaluate_model, name, family, params)
+            for name, (family, params) in models.items()
+        ]
+        results = [future.result() for future in futures]
+
+    return pd.DataFrame(results).sort_values('AUC', ascending=False).reset_index(drop=True)
@@ -0,0 +1,88 @@
+import numpy as np
+
+from liquidity_engine import calculate_lcr
+
+# LCR mínimo após o estresse abaixo do qual o banco é considerado quebrado
+LIMITE_LCR_POS = 70
+
+# Dimensões do espaço de cenários (todas em %)
+DIMENSOES_ESTRESSE = ('Saída de Varejo (%)', 'Saída Wholesale / Não Renovação (%)', 'Haircut de HQLA (%)')
+
+
+def breaks_survival(balanco, saida_varejo, saida_wholesale, haircut_hqla, limite_lcr=LIMITE_LCR_POS):
+    """Indica, para cada combinação de choques, se o banco deixa de sobreviver.
+
+    A saída wholesale se aplica aos depósitos corporativos e à não renovação do
+    funding de curto prazo. O banco quebra se o HQLA após o haircut não cobre as
+    saídas ou se o LCR remanescente fica abaixo de limite_lcr.
+    """
+    hqla = balanco['hqla']
+    depositos_varejo = balanco['depositos_varejo']
+    depositos_corporate = balanco['depositos_corporate']
+    funding_curto = balanco['funding_curto']
+
+    hqla_ajustado = hqla * (1 - haircut_hqla / 100)
+    total_saidas = depositos_varejo * saida_varejo / 100 + (depositos_corporate + funding_curto) * saida_wholesale / 100
+
+    # Base de saídas de 30 dias remanescente após o choque (mesmos fatores do LCR pré-estresse)
+    base_saidas = (funding_curto * (1 - saida_wholesale / 100) * 0.5 +
+                   depositos_varejo * (1 - saida_varejo / 100) * 0.1 +
+                   depositos_corporate * (1 - saida_wholesale / 100) * 0.2)
+    lcr_pos = calculate_lcr(hqla_ajustado - total_saidas, base_saidas)
+
+    return (hqla_ajustado < total_saidas) | (lcr_pos < limite_lcr)
+
+
+def simplex_directions(resolucao=20):
+    """Gera as direções do espaço de cenários como pesos não negativos que somam 1"""
+    pesos = [
+        (i, j, resolucao - i - j)
+        for i in range(resolucao + 1)
+        for j in range(resolucao + 1 - i)
+    ]
+    return np.array(pesos, dtype=float) / resolucao
+
+
+def reverse_stress_test(balanco, limite_lcr=LIMITE_LCR_POS, resolucao=20, n_grade=21, n_bissecao=30):
+    """Encontra a fronteira de quebra do banco em todas as direções de uma só vez.
+
+    Para cada direção w (pesos dos três choques), busca a menor severidade k tal
+    que o cenário k * w quebra o banco, com cada choque limitado a 100%. Uma grade
+    grossa localiza o primeiro intervalo de quebra e a bisseção vetorizada o
+    refina em todas as direções simultaneamente.
+    """
+    direcoes = simplex_directions(resolucao)
+    k_max = 100 / direcoes.max(axis=1)
+
+    def quebra(k):
+        pontos = direcoes * k[..., None] if k.ndim == 1 else direcoes[:, None, :] * k[..., None]
+        return breaks_survival(balanco, pontos[..., 0], pontos[..., 1], pontos[..., 2], limite_lcr)
+
+    # Grade grossa ao longo de cada direção
+    k_grade = np.linspace(0, 1, n_grade)[None, :] * k_max[:, None]
+    falhas = quebra(k_grade)
+    quebra_encontrada = falhas.any(axis=1)
+    primeiro = falhas.argmax(axis=1)
+
+    # Intervalo [lo, hi] contendo a primeira quebra em cada direção
+    linhas = np.arange(len(direcoes))
+    hi = k_grade[linhas, primeiro]
+    lo = k_grade[linhas, np.maximum(primeiro - 1, 0)]
+
+    for _ in range(n_bissecao):
+        meio = (lo + hi) / 2
+        falha_meio = quebra(meio)
+        hi = np.where(falha_meio, meio, hi)
+        lo = np.where(falha_meio, lo, meio)
+
+    severidade = np.where(quebra_encontrada, hi, np.nan)
+    fronteira = direcoes * severidade[:, None]
+
+    return {
+        'direcoes': direcoes,
+        'severidade': severidade,
+        'fronteira': fronteira,
+        'quebra_encontrada': quebra_encontrada,
+        'quebra_sem_estresse': bool(quebra(np.zeros(1))[0]),
+        'indice_minimo': int(np.nanargmin(severidade)) if quebra_encontrada.any() else None,
+    }
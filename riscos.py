@@ -4,8 +4,25 @@ import numpy as np
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 import plotly.express as px
+from plotly.subplots import make_subplots
 from PIL import Image
 import base64
+import inspect
+import time
+from liquidity_engine import COLUNAS_CENARIO, PARAMETROS_CENARIO, balance_sheet_ratios, calculate_lcr, calculate_nsfr, project_stress_liquidity, simulate_crisis_paths, stress_test_matrix
+from survival_surface import load_survival_surface
+from crisis_montecarlo import DISTRIBUICOES, run_monte_carlo
+from reverse_stress import DIMENSOES_ESTRESSE, LIMITE_LCR_POS, reverse_stress_test
+from contract_liquidity import COLUNAS_POSICOES, compute_contract_liquidity, compute_contract_liquidity_from_csv, generate_sample_positions
+from maturity_ladder import MaturityLadder, maturity_ladder_from_csv
+from scenario_library import balance_sheet_scenarios, scenario_matrix, simulator_scenarios
+from group_liquidity import generate_sample_entities, load_entities, screen_entities
+from assets import page_payload, reset_payload, show_image
+from bank_history import bank_history
+from early_warning import INDICADORES_PADRAO, LIMITE, NIVEIS_CONTINGENCIA, ROTULOS_ESTADO, EarlyWarningEngine, alert_log, evaluate_history, generate_sample_indicators, load_indicators
+from funding_concentration import COLUNAS_FUNDING, INSTRUMENTOS, NOME_CENARIO_CONCENTRACAO, ROTULOS_INSTRUMENTOS, compute_funding_concentration, compute_funding_concentration_from_csv, concentration_scenario, generate_sample_funding
+from intraday_payments import COLUNAS_PAGAMENTOS, COLUNAS_PARTICIPANTES, generate_sample_payments, load_payments, simulate_intraday
+from buffer_optimizer import HORIZONTE_PADRAO, maximum_wholesale_share, minimum_hqla
 
 # Configuração da página
 st.set_page_config(
@@ -72,51 +89,6 @@ def add_logo_and_styling():
     </style>
     """, unsafe_allow_html=True)
 
-def create_northern_rock_data():
-    # Dados históricos do Northern Rock
-    dates = ["Jun-98", "Dec-98", "Jun-99", "Dec-99", "Jun-00", "Dec-00", "Jun-01", 
-             "Dec-01", "Jun-02", "Dec-02", "Jun-03", "Dec-03", "Jun-04", "Dec-04", 
-             "Jun-05", "Dec-05", "Jun-06", "Dec-06", "Jun-07"]
-    
-    # Composição de passivos em bilhões de libras
-    retail_deposits = [8.0, 9.0, 10.0, 11.0, 12.0, 12.5, 13.0, 13.5, 14.0, 15.0, 16.0, 17.0, 18.0, 20.0, 22.0, 22.5, 23.0, 24.0, 24.4]
-    securitized_notes = [0.0, 0.0, 0.0, 0.0, 0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 15.0, 18.0, 22.0, 26.0, 30.0, 35.0, 40.0, 45.7]
-    other_liabilities = [8.0, 10.0, 12.0, 14.0, 16.0, 16.5, 17.0, 18.5, 21.0, 23.0, 25.0, 26.0, 30.0, 32.0, 35.0, 37.5, 40.0, 42.0, 42.0]
-    equity = [2.0, 2.0, 2.0, 2.2, 2.5, 2.7, 2.8, 3.0, 3.2, 3.5, 3.7, 3.8, 4.0, 4.2, 4.5, 4.7, 4.8, 5.0, 5.3]
-    
-    total_assets = [sum(x) for x in zip(retail_deposits, securitized_notes, other_liabilities, equity)]
-    
-    # Para os cálculos de risco
-    leverage = [round(total_assets[i] / equity[i], 1) for i in range(len(dates))]
-    retail_deposit_ratio = [round(retail_deposits[i] / total_assets[i] * 100, 1) for i in range(len(dates))]
-    securitized_ratio = [round(securitized_notes[i] / total_assets[i] * 100, 1) for i in range(len(dates))]
-    
-    df = pd.DataFrame({
-        'Data': dates,
-        'Depósitos de Varejo': retail_deposits,
-        'Notas Securitizadas': securitized_notes,
-        'Outros Passivos': other_liabilities,
-        'Patrimônio': equity,
-        'Total de Ativos': total_assets,
-        'Alavancagem': leverage,
-        'Proporção de Depósitos (%)': retail_deposit_ratio,
-        'Proporção de Securitização (%)': securitized_ratio
-    })
-    
-    return df
-
-def calculate_lcr(hqla, saidas_30dias):
-    """Calcula o Liquidity Coverage Ratio"""
-    if saidas_30dias == 0:
-        return float('inf')
-    return (hqla / saidas_30dias) * 100
-
-def calculate_nsfr(funding_estavel, ativos_longo_prazo):
-    """Calcula o Net Stable Funding Ratio"""
-    if ativos_longo_prazo == 0:
-        return float('inf')
-    return (funding_estavel / ativos_longo_prazo) * 100
-
 def calculate_liquidity_risk(ativos_liquidos_pct, wholesale_funding_pct):
     """Calcula o risco de liquidez com base na composição de ativos e fontes de financiamento"""
     # Quanto menor a proporção de ativos líquidos e maior a dependência de wholesale funding, maior o risco
@@ -212,69 +184,26 @@ def plot_balance_sheet(ativos_liquidos_pct, wholesale_funding_pct):
 
 def simulate_crisis(ativos_liquidos_pct, wholesale_funding_pct, stress_level):
     """Simula uma crise de liquidez e seu impacto no banco"""
-    # Parâmetros de simulação
-    dias_simulacao = 30
-    impacto_varejo = min(50, stress_level * 5)  # Impacto limitado nos depósitos de varejo
-    impacto_wholesale = min(90, stress_level * 9)  # Impacto maior no funding wholesale
-    
-    # Calcular valores iniciais
-    depositos_varejo_inicial = 100 - wholesale_funding_pct
-    funding_wholesale_inicial = wholesale_funding_pct
-    ativos_liquidos_inicial = ativos_liquidos_pct
-    ativos_iliquidos_inicial = 100 - ativos_liquidos_pct
-    
-    # Arrays para armazenar resultados da simulação
-    dias = list(range(dias_simulacao + 1))
-    depositos_varejo_arr = [depositos_varejo_inicial]
-    funding_wholesale_arr = [funding_wholesale_inicial]
-    ativos_liquidos_arr = [ativos_liquidos_inicial]
-    ativos_iliquidos_arr = [ativos_iliquidos_inicial]
-    saldo_liquido_arr = [0]
-    
-    # Simular dia a dia
-    for dia in range(1, dias_simulacao + 1):
-        # Probabilidade crescente de corrida bancária
-        prob_corrida = min(1.0, dia / dias_simulacao * (stress_level / 10))
-        
-        # Cálculo de saídas
-        saida_varejo = depositos_varejo_arr[dia-1] * (impacto_varejo/100) * prob_corrida / dias_simulacao
-        saida_wholesale = funding_wholesale_arr[dia-1] * (impacto_wholesale/100) * prob_corrida / (dias_simulacao/2)
-        
-        # Novos valores
-        novo_deposito_varejo = max(0, depositos_varejo_arr[dia-1] - saida_varejo)
-        novo_funding_wholesale = max(0, funding_wholesale_arr[dia-1] - saida_wholesale)
-        
-        # Uso de ativos líquidos para cobrir saídas
-        saida_total = saida_varejo + saida_wholesale
-        novo_ativos_liquidos = max(0, ativos_liquidos_arr[dia-1] - saida_total)
-        
-        # Se não houver ativos líquidos suficientes, o banco falha
-        saldo_liquido = novo_ativos_liquidos - (ativos_liquidos_arr[dia-1] - saida_total)
-        
-        # Adicionar aos arrays
-        depositos_varejo_arr.append(novo_deposito_varejo)
-        funding_wholesale_arr.append(novo_funding_wholesale)
-        ativos_liquidos_arr.append(novo_ativos_liquidos)
-        ativos_iliquidos_arr.append(ativos_iliquidos_inicial)  # não muda no curto prazo
-        saldo_liquido_arr.append(saldo_liquido)
-    
-    # Detecção de falha de liquidez
-    failed_day = None
-    for i, saldo in enumerate(ativos_liquidos_arr):
-        if saldo <= 0 and i > 0:
-            failed_day = i
-            break
+    # Núcleo numérico vetorizado (um único cenário aqui)
+    paths = simulate_crisis_paths(ativos_liquidos_pct, wholesale_funding_pct, stress_level)
+    failed_day = int(paths['failed_day'][0]) or None
     
     # Criar dataframe com os resultados
     results_df = pd.DataFrame({
-        'Dia': dias,
-        'Depósitos de Varejo': depositos_varejo_arr,
-        'Funding Wholesale': funding_wholesale_arr,
-        'Ativos Líquidos': ativos_liquidos_arr,
-        'Ativos Ilíquidos': ativos_iliquidos_arr,
-        'Saldo Líquido': saldo_liquido_arr
+        'Dia': paths['dias'],
+        'Depósitos de Varejo': paths['depositos_varejo'][0],
+        'Funding Wholesale': paths['funding_wholesale'][0],
+        'Ativos Líquidos': paths['ativos_liquidos'][0],
+        'Ativos Ilíquidos': paths['ativos_iliquidos'][0],
+        'Saldo Líquido': paths['saldo_liquido'][0]
     })
     
+    fig = plot_crisis_simulation(results_df, failed_day)
+    
+    return fig, failed_day, results_df
+
+def plot_crisis_simulation(results_df, failed_day):
+    """Cria o gráfico da simulação de crise de liquidez"""
     # Gráfico dos resultados
     fig = go.Figure()
     
@@ -340,1385 +269,2294 @@ def simulate_crisis(ativos_liquidos_pct, wholesale_funding_pct, stress_level):
         )
     )
     
-    return fig, failed_day, results_df
+    return fig
+
+@st.cache_resource
+def get_survival_surface():
+    """Carrega uma única vez por processo a superfície de sobrevivência pré-calculada"""
+    return load_survival_surface()
+
+def plot_survival_surface(surface, stress_level, ativos_liquidos_pct, wholesale_funding_pct):
+    """Cria o mapa de calor do dia de falha no plano ativos líquidos x funding wholesale"""
+    k = int(np.searchsorted(surface['stress_level'], stress_level))
+    dias_falha = surface['dias_falha'][k]
+    dias_simulacao = surface['dias_simulacao']
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Heatmap(
+        x=surface['ativos_liquidos_pct'],
+        y=surface['wholesale_funding_pct'],
+        z=dias_falha,
+        zmin=1,
+        zmax=dias_simulacao + 1,
+        colorscale='RdYlGn',
+        colorbar=dict(title=f'Dias até a falha<br>({dias_simulacao + 1} = sobrevive)'),
+        hovertemplate='Ativos Líquidos: %{x}%<br>Funding Wholesale: %{y}%<br>Dia da falha: %{z}<extra></extra>'
+    ))
+    
+    # Fronteira da região segura
+    fig.add_trace(go.Contour(
+        x=surface['ativos_liquidos_pct'],
+        y=surface['wholesale_funding_pct'],
+        z=(dias_falha > dias_simulacao).astype(int),
+        contours=dict(start=0.5, end=0.5, coloring='none'),
+        line=dict(color='black', width=2),
+        showscale=False,
+        hoverinfo='skip'
+    ))
+    
+    # Configuração atual do banco
+    fig.add_trace(go.Scatter(
+        x=[ativos_liquidos_pct],
+        y=[wholesale_funding_pct],
+        mode='markers',
+        marker=dict(size=14, color='white', line=dict(color='black', width=2), symbol='x'),
+        name='Seu banco',
+        hovertemplate='Seu banco<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title=f'Mapa de Sobrevivência (Nível de Estresse = {stress_level})',
+        xaxis_title='Ativos Líquidos (%)',
+        yaxis_title='Funding Wholesale/Securitizado (%)',
+        height=500,
+        showlegend=False
+    )
+    
+    return fig
+
+def plot_monte_carlo_results(mc):
+    """Cria os gráficos da distribuição do dia de falha e das trajetórias simuladas"""
+    dias_simulacao = mc['dias_simulacao']
+    contagem = np.bincount(mc['dias_falha'], minlength=dias_simulacao + 1)
+    n_paths = len(mc['dias_falha'])
+    
+    # Distribuição do dia de falha (o dia 0 representa as trajetórias que sobreviveram)
+    fig_dist = go.Figure()
+    fig_dist.add_trace(go.Bar(
+        x=np.arange(1, dias_simulacao + 1),
+        y=contagem[1:] / n_paths * 100,
+        name='Falha',
+        marker_color='rgba(220, 38, 38, 0.8)'
+    ))
+    fig_dist.add_trace(go.Bar(
+        x=[dias_simulacao + 1],
+        y=[contagem[0] / n_paths * 100],
+        name='Sobrevive',
+        marker_color='rgba(16, 185, 129, 0.8)'
+    ))
+    fig_dist.update_layout(
+        title='Distribuição do Dia de Falha',
+        xaxis_title=f'Dia da falha ({dias_simulacao + 1} = sobrevive)',
+        yaxis_title='% das trajetórias',
+        height=400
+    )
+    
+    # Amostra de trajetórias dos ativos líquidos
+    fig_paths = go.Figure()
+    for trajetoria in mc['trajetorias_amostra']:
+        fig_paths.add_trace(go.Scatter(
+            x=np.arange(dias_simulacao + 1),
+            y=trajetoria,
+            mode='lines',
+            line=dict(color='rgba(37, 99, 235, 0.25)', width=1),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+    fig_paths.update_layout(
+        title='Amostra de Trajetórias dos Ativos Líquidos',
+        xaxis_title='Dias',
+        yaxis_title='Ativos Líquidos (%)',
+        height=400
+    )
+    
+    return fig_dist, fig_paths
+
+def plot_stress_liquidity_projection(projecao, nomes_cenarios):
+    """Cria um único gráfico com a evolução da liquidez de todos os cenários"""
+    fig = go.Figure()
+    
+    for nome, liquidez in zip(nomes_cenarios, projecao['liquidez']):
+        fig.add_trace(go.Scatter(
+            x=projecao['dias'],
+            y=liquidez,
+            mode='lines',
+            name=nome
+        ))
+    
+    # Marcadores no dia de esgotamento do HQLA dos cenários que falham
+    falha = ~projecao['sobrevive']
+    if falha.any():
+        fig.add_trace(go.Scatter(
+            x=projecao['dias_sobrevivencia'][falha],
+            y=np.zeros(falha.sum()),
+            mode='markers',
+            name='Falha',
+            marker=dict(color='red', size=12, symbol='x'),
+            text=[f"{nome}: falha no dia {dia:.1f}" for nome, dia in
+                  zip(np.asarray(nomes_cenarios)[falha], projecao['dias_sobrevivencia'][falha])],
+            hoverinfo='text'
+        ))
+    
+    fig.update_layout(
+        title='Evolução da Liquidez por Cenário',
+        xaxis_title='Dia',
+        yaxis_title='Milhões £',
+        height=450
+    )
+    
+    return fig
+
+def plot_contagion_results(resultado):
+    """Cria os gráficos da propagação do contágio por rodada e do LCR antes e depois"""
+    rodadas = resultado['rodada_estresse'][resultado['rodada_estresse'] >= 0]
+    contagem = np.bincount(rodadas, minlength=resultado['n_rodadas'] + 1)
+    
+    fig_rodadas = go.Figure()
+    fig_rodadas.add_trace(go.Bar(
+        x=np.arange(len(contagem)),
+        y=contagem,
+        marker_color=['rgba(220, 38, 38, 0.8)'] + ['rgba(245, 158, 11, 0.8)'] * (len(contagem) - 1)
+    ))
+    fig_rodadas.update_layout(
+        title='Bancos que Entram em Estresse por Rodada',
+        xaxis_title='Rodada (0 = choque inicial e inadimplências)',
+        yaxis_title='Número de bancos',
+        height=400
+    )
+    
+    # LCR limitado a 500% para a visualização
+    fig_lcr = go.Figure()
+    fig_lcr.add_trace(go.Histogram(x=np.minimum(resultado['lcr_pre'], 500), name='Antes do contágio',
+                                   opacity=0.6, marker_color='rgba(16, 185, 129, 0.8)'))
+    fig_lcr.add_trace(go.Histogram(x=np.minimum(resultado['lcr_pos'], 500), name='Após o contágio',
+                                   opacity=0.6, marker_color='rgba(220, 38, 38, 0.8)'))
+    fig_lcr.update_layout(
+        title='Distribuição do LCR dos Bancos',
+        xaxis_title='LCR (%)',
+        yaxis_title='Número de bancos',
+        barmode='overlay',
+        height=400
+    )
+    
+    return fig_rodadas, fig_lcr
+
+def plot_intraday_results(resultado, n_participantes=20):
+    """Cria os gráficos do pico de uso de liquidez por participante e dos atrasos de liquidação"""
+    maiores = resultado['por_participante'].nlargest(n_participantes, 'Pico de Uso de Liquidez')
+    
+    fig_pico = go.Figure()
+    fig_pico.add_trace(go.Bar(
+        x=maiores['Participante'],
+        y=maiores['Pico de Uso de Liquidez'] - maiores['Uso de Crédito Intradiário'],
+        name='Saldo de reservas',
+        marker_color='rgba(16, 185, 129, 0.8)'
+    ))
+    fig_pico.add_trace(go.Bar(
+        x=maiores['Participante'],
+        y=maiores['Uso de Crédito Intradiário'],
+        name='Crédito intradiário',
+        marker_color='rgba(245, 158, 11, 0.8)'
+    ))
+    fig_pico.update_layout(
+        title='Pico de Uso de Liquidez Intradiária (maiores participantes)',
+        xaxis_title='Participante',
+        yaxis_title='Liquidez utilizada',
+        barmode='stack',
+        height=400
+    )
+    
+    # Atrasos em minutos, apenas dos pagamentos que passaram pela fila
+    atraso = resultado['atraso'][resultado['atraso'] > 0] / 60
+    fig_atraso = go.Figure()
+    fig_atraso.add_trace(go.Histogram(x=atraso, marker_color='rgba(59, 130, 246, 0.8)'))
+    fig_atraso.update_layout(
+        title='Tempo na Fila dos Pagamentos Retidos',
+        xaxis_title='Atraso até a liquidação (minutos)',
+        yaxis_title='Número de pagamentos',
+        height=400
+    )
+    
+    return fig_pico, fig_atraso
+
+def plot_rollover_ladder(escada):
+    """Cria o gráfico da escada diária de rolagem do funding por instrumento"""
+    fig = go.Figure()
+    
+    for instrumento, rotulo in zip(INSTRUMENTOS, ROTULOS_INSTRUMENTOS):
+        fig.add_trace(go.Bar(x=escada.index, y=escada[instrumento], name=rotulo))
+    
+    fig.add_trace(go.Scatter(
+        x=escada.index,
+        y=escada['acumulado'],
+        mode='lines',
+        name='Vencimentos acumulados',
+        line=dict(color='black', width=2),
+        yaxis='y2'
+    ))
+    
+    fig.update_layout(
+        title='Escada de Rolagem do Funding (vencimentos diários)',
+        xaxis_title='Dias até o vencimento',
+        yaxis=dict(title='Vencimentos no dia'),
+        yaxis2=dict(title='Vencimentos acumulados', overlaying='y', side='right', showgrid=False),
+        barmode='stack',
+        bargap=0,
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+        height=450
+    )
+    
+    return fig
+
+def plot_early_warning(serie, resultado, indicadores, rotulos):
+    """Cria o gráfico dos indicadores de alerta precoce, com limites, alertas e nível do plano de contingência"""
+    n = len(indicadores)
+    fig = make_subplots(rows=n + 1, cols=1, shared_xaxes=True, vertical_spacing=0.03,
+                        subplot_titles=list(rotulos) + ['Nível do Plano de Contingência'])
+    
+    for k, (nome, config) in enumerate(indicadores.items()):
+        estado = resultado['estado'][:, k]
+        fig.add_trace(go.Scatter(x=serie['data'], y=serie[nome], mode='lines', name=rotulos[k],
+                                 line=dict(color='rgba(37, 99, 235, 0.8)', width=1)), row=k + 1, col=1)
+        fig.add_hline(y=config['limite'], line=dict(color='rgba(220, 38, 38, 0.8)', dash='dash'), row=k + 1, col=1)
+        
+        # Alertas: amarelo para desvio anormal, vermelho para limite rompido
+        alerta = estado > 0
+        fig.add_trace(go.Scatter(
+            x=serie['data'][alerta], y=serie[nome][alerta], mode='markers', showlegend=False,
+            marker=dict(size=4, color=np.where(estado[alerta] == LIMITE, 'rgba(220, 38, 38, 0.9)', 'rgba(245, 158, 11, 0.9)'))
+        ), row=k + 1, col=1)
+    
+    fig.add_trace(go.Scatter(x=serie['data'], y=resultado['nivel'], mode='lines', line_shape='hv',
+                             line=dict(color='rgba(220, 38, 38, 0.8)'), name='Nível'), row=n + 1, col=1)
+    fig.update_yaxes(tickvals=list(range(len(NIVEIS_CONTINGENCIA))), ticktext=NIVEIS_CONTINGENCIA, row=n + 1, col=1)
+    fig.update_layout(showlegend=False, height=200 * (n + 1), margin=dict(t=40))
+    
+    return fig
+
+def plot_reverse_stress_frontier(resultado):
+    """Cria o gráfico 3D da fronteira de quebra do teste de estresse reverso"""
+    encontrada = resultado['quebra_encontrada']
+    fronteira = resultado['fronteira'][encontrada]
+    severidade = resultado['severidade'][encontrada]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter3d(
+        x=fronteira[:, 0],
+        y=fronteira[:, 1],
+        z=fronteira[:, 2],
+        mode='markers',
+        marker=dict(size=4, color=severidade, colorscale='RdYlGn',
+                    colorbar=dict(title='Soma dos<br>choques (%)')),
+        hovertemplate='Varejo: %{x:.1f}%<br>Wholesale: %{y:.1f}%<br>Haircut: %{z:.1f}%<extra></extra>'
+    ))
+    
+    if resultado['indice_minimo'] is not None:
+        minimo = resultado['fronteira'][resultado['indice_minimo']]
+        fig.add_trace(go.Scatter3d(
+            x=[minimo[0]], y=[minimo[1]], z=[minimo[2]],
+            mode='markers',
+            marker=dict(size=8, color='black', symbol='diamond'),
+            name='Combinação mínima'
+        ))
+    
+    fig.update_layout(
+        title='Fronteira de Quebra (Estresse Reverso)',
+        scene=dict(
+            xaxis_title=DIMENSOES_ESTRESSE[0],
+            yaxis_title=DIMENSOES_ESTRESSE[1],
+            zaxis_title=DIMENSOES_ESTRESSE[2],
+        ),
+        showlegend=False,
+        height=600
+    )
+    
+    return fig
 
 def apply_stress_test(lcr_value, nsfr_value, ativos_liquidos_pct, wholesale_funding_pct):
     """Aplica testes de estresse para avaliar a resistência do banco"""
-    # Cenários de estresse
-    scenarios = {
-        "Corrida Bancária Moderada": {
-            "retail_outflow": 15,  # 15% dos depósitos de varejo saem
-            "wholesale_outflow": 35,  # 35% do funding wholesale sai
-            "market_liquidity": 0.8  # Liquidez de mercado reduzida em 20%
-        },
-        "Crise de Funding": {
-            "retail_outflow": 5,
-            "wholesale_outflow": 70,
-            "market_liquidity": 0.6
-        },
-        "Choque Sistêmico": {
-            "retail_outflow": 25,
-            "wholesale_outflow": 80,
-            "market_liquidity": 0.4
-        }
-    }
+    # Cenários lidos da biblioteca em arquivo (cenarios_simulador.csv)
+    cenarios = simulator_scenarios()
+    
+    # Todos os cenários avaliados de uma só vez pela matriz cenários x configurações
+    matrix = stress_test_matrix(scenario_matrix(cenarios, COLUNAS_CENARIO), [[ativos_liquidos_pct, wholesale_funding_pct]])
     
     results = {}
     
-    for scenario_name, params in scenarios.items():
-        # Calcular novos valores após o estresse
-        new_retail = (100 - wholesale_funding_pct) * (1 - params["retail_outflow"]/100)
-        new_wholesale = wholesale_funding_pct * (1 - params["wholesale_outflow"]/100)
-        new_liquid_assets = ativos_liquidos_pct * params["market_liquidity"]
-        
-        # Calcular novos indicadores
-        new_lcr = calculate_lcr(new_liquid_assets, (new_retail + new_wholesale) * 0.3)
-        new_nsfr = calculate_nsfr(new_retail + (new_wholesale * 0.5), (100 - ativos_liquidos_pct))
-        
-        # Verificar sobrevivência
-        survived = new_lcr >= 70 and new_liquid_assets > 0
-        
+    for i, scenario_name in enumerate(cenarios['nome']):
         results[scenario_name] = {
-            "survived": survived,
-            "new_lcr": new_lcr,
-            "new_nsfr": new_nsfr,
-            "liquid_assets_remaining": new_liquid_assets
+            "survived": bool(matrix["survived"][i, 0]),
+            "new_lcr": float(matrix["new_lcr"][i, 0]),
+            "new_nsfr": float(matrix["new_nsfr"][i, 0]),
+            "liquid_assets_remaining": float(matrix["liquid_assets_remaining"][i, 0])
         }
     
     return results
 
-# Aplicativo principal
-def main():
-    add_logo_and_styling()
-    
-    # Cabeçalho principal
-    st.markdown("<h1 class='main-header'>Risco de Liquidez Bancário</h1>", unsafe_allow_html=True)
-    st.markdown("<h2 class='sub-header'>O Caso Northern Rock e Lições para a Gestão de Risco de Liquidez</h2>", unsafe_allow_html=True)
-    
-    # Barra lateral com navegação
-    st.sidebar.image("https://raw.githubusercontent.com/JAmerico1898/gereneciamento_riscos/e0978ccb2502a2b6a3f03dbe6f2ebe6773812b7a/nothern_rock_logo.png", width=200)
-    st.sidebar.markdown("## Navegação")
-    menu = st.sidebar.selectbox(
-        "Escolha um módulo:",
-        ["Introdução ao Risco de Liquidez", 
-         "O Caso Northern Rock", 
-         "Simulador de Balanço e Risco",
-         "Técnicas de Gestão de Risco",
-         "Stress Testing de Liquidez",
-         "Sobre o Aplicativo"]
-    )
+# Abas com estado (key, on_change e TabContainer.open) só existem em versões recentes do Streamlit
+ABAS_SOB_DEMANDA = 'on_change' in inspect.signature(st.tabs).parameters
+
+
+def render_tabs(abas, key):
+    """Renderiza as abas executando apenas o corpo da aba selecionada.
+
+    Os widgets das abas ocultas não são montados, e por isso voltam aos valores
+    iniciais (e os arquivos enviados são descartados) quando a aba é reaberta.
+    Em versões do Streamlit sem abas com estado, todas as abas são renderizadas.
+    """
+    if not ABAS_SOB_DEMANDA:
+        for container, render in zip(st.tabs(list(abas)), abas.values()):
+            with container:
+                render()
+        return
+
+    # Com estado (key) e on_change="rerun", st.tabs informa a aba aberta em .open
+    containers = st.tabs(list(abas), key=key, on_change="rerun")
+    for container, render in zip(containers, abas.values()):
+        if container.open:
+            with container:
+                render()
+
+def page_introduction():
+    """Página de introdução: conceito e importância do risco de liquidez"""
+    st.markdown("## 📚 Conceito e Importância")
     
-    # Dados históricos do Northern Rock
-    df_northern_rock = create_northern_rock_data()
+    col1, col2 = st.columns([3, 2])
     
-    # Conteúdo baseado na opção selecionada
-    if menu == "Introdução ao Risco de Liquidez":
-        st.markdown("## 📚 Conceito e Importância")
+    with col1:
+        st.markdown("""
+        ### O que é Risco de Liquidez?
         
-        col1, col2 = st.columns([3, 2])
+        O risco de liquidez refere-se à incapacidade de uma instituição financeira honrar suas obrigações de curto prazo sem incorrer em perdas inaceitáveis. Ele ocorre quando um banco não consegue obter recursos suficientes para atender suas necessidades imediatas de caixa, seja por não conseguir vender ativos rapidamente a preços razoáveis (risco de liquidez de mercado) ou por não conseguir obter financiamento adequado (risco de liquidez de financiamento).
         
-        with col1:
-            st.markdown("""
-            ### O que é Risco de Liquidez?
-            
-            O risco de liquidez refere-se à incapacidade de uma instituição financeira honrar suas obrigações de curto prazo sem incorrer em perdas inaceitáveis. Ele ocorre quando um banco não consegue obter recursos suficientes para atender suas necessidades imediatas de caixa, seja por não conseguir vender ativos rapidamente a preços razoáveis (risco de liquidez de mercado) ou por não conseguir obter financiamento adequado (risco de liquidez de financiamento).
-            
-            ### Por que é crítico para bancos?
-            
-            Os bancos são particularmente vulneráveis ao risco de liquidez devido à natureza de seu modelo de negócios: eles captam recursos de curto prazo (como depósitos à vista) e os aplicam em ativos de longo prazo (como empréstimos imobiliários). Este **descasamento de prazos** é uma característica fundamental da intermediação financeira, mas também cria vulnerabilidades.
-            """)
-            
-            st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-            st.markdown("""
-            **Fontes típicas de risco de liquidez:**
-            - **Corridas bancárias**: Quando muitos depositantes retiram seus fundos simultaneamente
-            - **Perda de acesso ao mercado de funding**: Quando fontes de financiamento (depositantes) secam
-            - **Deterioração da confiança no banco**: Pode levar a dificuldades de refinanciamento
-            """)
-            st.markdown("</div>", unsafe_allow_html=True)
+        ### Por que é crítico para bancos?
         
-        with col2:
-            st.image("https://raw.githubusercontent.com/JAmerico1898/gereneciamento_riscos/9f1b012f661712ed63bb2896ddd375fb8fa6c2e0/liquidity_mismatch.jpg", 
-                     caption="Modelo básico de transformação de maturidade em bancos", 
-                     width=350)
-    
-        st.markdown("### Manifestações do Risco de Liquidez")
+        Os bancos são particularmente vulneráveis ao risco de liquidez devido à natureza de seu modelo de negócios: eles captam recursos de curto prazo (como depósitos à vista) e os aplicam em ativos de longo prazo (como empréstimos imobiliários). Este **descasamento de prazos** é uma característica fundamental da intermediação financeira, mas também cria vulnerabilidades.
+        """)
         
-        col1, col2 = st.columns(2)
+        st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        **Fontes típicas de risco de liquidez:**
+        - **Corridas bancárias**: Quando muitos depositantes retiram seus fundos simultaneamente
+        - **Perda de acesso ao mercado de funding**: Quando fontes de financiamento (depositantes) secam
+        - **Deterioração da confiança no banco**: Pode levar a dificuldades de refinanciamento
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    with col2:
+        show_image("liquidity_mismatch.jpg", 350,
+                 caption="Modelo básico de transformação de maturidade em bancos")
+
+    st.markdown("### Manifestações do Risco de Liquidez")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("<div class='reference-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        #### Liquidez de Financiamento (Passivos)
         
-        with col1:
-            st.markdown("<div class='reference-box'>", unsafe_allow_html=True)
-            st.markdown("""
-            #### Liquidez de Financiamento (Passivos)
-            
-            Refere-se à capacidade do banco de obter recursos para financiar seus ativos e atender suas obrigações.
-            
-            **Indicadores:**
-            - Concentração de fontes de funding
-            - Proporção de financiamento de curto prazo
-            - Custo de funding em comparação ao mercado
-            """)
-            st.markdown("</div>", unsafe_allow_html=True)
+        Refere-se à capacidade do banco de obter recursos para financiar seus ativos e atender suas obrigações.
         
-        with col2:
-            st.markdown("<div class='reference-box'>", unsafe_allow_html=True)
-            st.markdown("""
-            #### Liquidez de Mercado (Ativos)
-            
-            Refere-se à capacidade do banco de vender ativos rapidamente sem causar mudanças significativas em seus preços.
-            
-            **Indicadores:**
-            - Bid-ask spread dos ativos
-            - Volume de negociação
-            - Tempo necessário para liquidar posições
-            """)
-            st.markdown("</div>", unsafe_allow_html=True)
+        **Indicadores:**
+        - Concentração de fontes de funding
+        - Proporção de financiamento de curto prazo
+        - Custo de funding em comparação ao mercado
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("<div class='reference-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        #### Liquidez de Mercado (Ativos)
         
-        st.markdown("### Consequências de uma Crise de Liquidez")
+        Refere-se à capacidade do banco de vender ativos rapidamente sem causar mudanças significativas em seus preços.
         
+        **Indicadores:**
+        - Bid-ask spread dos ativos
+        - Volume de negociação
+        - Tempo necessário para liquidar posições
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    st.markdown("### Consequências de uma Crise de Liquidez")
+    
+    st.markdown("""
+    Se não gerenciado adequadamente, o risco de liquidez pode levar a:
+    
+    1. **Venda forçada de ativos** a preços descontados
+    2. **Aumento nos custos de financiamento**
+    3. **Intervenção regulatória**
+    4. **Falência do banco**
+    5. **Contágio para outras instituições financeiras**
+    
+    > *"A liquidez pode desaparecer rapidamente, e a iliquidez pode durar por um período prolongado. Como suas fontes são inerentemente imprevisíveis, o risco de liquidez deve ser considerado um dos riscos mais críticos em um ambiente bancário."*
+    > — Comitê de Basileia de Supervisão Bancária
+    """)
+
+def tab_historical_context():
+    """Aba do contexto histórico e da expansão do Northern Rock"""
+    # Dados históricos do Northern Rock (historico_bancos.csv, lidos uma vez por processo)
+    df_northern_rock = bank_history("Northern Rock")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
         st.markdown("""
-        Se não gerenciado adequadamente, o risco de liquidez pode levar a:
+        ### Origens e Crescimento
         
-        1. **Venda forçada de ativos** a preços descontados
-        2. **Aumento nos custos de financiamento**
-        3. **Intervenção regulatória**
-        4. **Falência do banco**
-        5. **Contágio para outras instituições financeiras**
+        O Northern Rock foi fundado em 1965, resultado da fusão entre a Northern Counties Permanent Building Society (estabelecida em 1850) e a Rock Building Society (estabelecida em 1865). Inicialmente operava como uma sociedade de crédito imobiliário (*building society*) mutuamente detida por seus membros, com foco na região nordeste da Inglaterra.
         
-        > *"A liquidez pode desaparecer rapidamente, e a iliquidez pode durar por um período prolongado. Como suas fontes são inerentemente imprevisíveis, o risco de liquidez deve ser considerado um dos riscos mais críticos em um ambiente bancário."*
-        > — Comitê de Basileia de Supervisão Bancária
+        Em 1997, o banco passou por um processo de "desmutualização" e se tornou uma companhia de capital aberto listada na Bolsa de Valores de Londres. Esta transição marcou o início de um período de crescimento agressivo.
         """)
     
-    elif menu == "O Caso Northern Rock":
-        st.markdown("## 🏦 O Caso Northern Rock: Anatomia de uma Quebra Bancária")
-        
-        tab1, tab2, tab3 = st.tabs(["Contexto Histórico", "Modelo de Negócios", "A Crise"])
+    with col2:
+        show_image("northern-rock-headquarters.jpg", 300,
+                caption="Sede do Northern Rock em Newcastle")            
+    st.markdown("""
+    ### Expansão Acelerada
+    
+    Entre 1998 e 2007, o Northern Rock experimentou um crescimento extraordinário:
+    
+    - Os ativos totais aumentaram de 17,4 bilhões para 113,5 bilhões de libras
+    - Uma taxa de crescimento anual equivalente a 23,2%
+    - Tornou-se o quinto maior banco hipotecário do Reino Unido
+    """)
+    
+    # Gráfico de crescimento do Northern Rock
+    st.markdown("#### Crescimento dos Ativos e Passivos (1998-2007)")
+    
+    fig = px.area(
+        df_northern_rock,
+        x='Data',
+        y=['Depósitos de Varejo', 'Notas Securitizadas', 'Outros Passivos', 'Patrimônio'],
+        title='Composição dos Passivos do Northern Rock, 1998-2007',
+        labels={'value': 'Bilhões de Libras', 'variable': 'Tipo de Passivo'},
+        color_discrete_map={
+            'Depósitos de Varejo': 'rgba(37, 99, 235, 0.8)',
+            'Notas Securitizadas': 'rgba(220, 38, 38, 0.8)',
+            'Outros Passivos': 'rgba(245, 158, 11, 0.8)',
+            'Patrimônio': 'rgba(16, 185, 129, 0.8)'
+        }
+    )
+    fig.update_layout(height=400)
+    st.plotly_chart(fig, use_container_width=True)
+
+def tab_business_model():
+    """Aba do modelo de negócios e da estrutura de funding"""
+    # Dados históricos do Northern Rock (historico_bancos.csv, lidos uma vez por processo)
+    df_northern_rock = bank_history("Northern Rock")
+    
+    st.markdown("""
+    ### Modelo de Negócios do Northern Rock
+    
+    O Northern Rock desenvolveu um modelo de negócios altamente dependente de financiamento no mercado de capitais, diferente do modelo bancário tradicional que se baseia principalmente em depósitos de varejo.
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        #### Ativo
         
-        with tab1:
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                st.markdown("""
-                ### Origens e Crescimento
-                
-                O Northern Rock foi fundado em 1965, resultado da fusão entre a Northern Counties Permanent Building Society (estabelecida em 1850) e a Rock Building Society (estabelecida em 1865). Inicialmente operava como uma sociedade de crédito imobiliário (*building society*) mutuamente detida por seus membros, com foco na região nordeste da Inglaterra.
-                
-                Em 1997, o banco passou por um processo de "desmutualização" e se tornou uma companhia de capital aberto listada na Bolsa de Valores de Londres. Esta transição marcou o início de um período de crescimento agressivo.
-                """)
-            
-            with col2:
-                st.image("https://raw.githubusercontent.com/JAmerico1898/gereneciamento_riscos/e0978ccb2502a2b6a3f03dbe6f2ebe6773812b7a/northern-rock-headquarters.jpg",
-                        caption="Sede do Northern Rock em Newcastle", 
-                        width=300)            
-            st.markdown("""
-            ### Expansão Acelerada
-            
-            Entre 1998 e 2007, o Northern Rock experimentou um crescimento extraordinário:
-            
-            - Os ativos totais aumentaram de 17,4 bilhões para 113,5 bilhões de libras
-            - Uma taxa de crescimento anual equivalente a 23,2%
-            - Tornou-se o quinto maior banco hipotecário do Reino Unido
-            """)
-            
-            # Gráfico de crescimento do Northern Rock
-            st.markdown("#### Crescimento dos Ativos e Passivos (1998-2007)")
-            
-            fig = px.area(
-                df_northern_rock,
-                x='Data',
-                y=['Depósitos de Varejo', 'Notas Securitizadas', 'Outros Passivos', 'Patrimônio'],
-                title='Composição dos Passivos do Northern Rock, 1998-2007',
-                labels={'value': 'Bilhões de Libras', 'variable': 'Tipo de Passivo'},
-                color_discrete_map={
-                    'Depósitos de Varejo': 'rgba(37, 99, 235, 0.8)',
-                    'Notas Securitizadas': 'rgba(220, 38, 38, 0.8)',
-                    'Outros Passivos': 'rgba(245, 158, 11, 0.8)',
-                    'Patrimônio': 'rgba(16, 185, 129, 0.8)'
-                }
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        - **Empréstimos hipotecários de alta qualidade**: Foco em empréstimos prime para o mercado residencial do Reino Unido
+        - **Baixa diversificação**: Concentração excessiva em um único tipo de ativo
+        - **Originar para distribuir**: Originação de hipotecas para securitização
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("<div class='warning-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        #### Passivo
         
-        with tab2:
-            st.markdown("""
-            ### Modelo de Negócios do Northern Rock
-            
-            O Northern Rock desenvolveu um modelo de negócios altamente dependente de financiamento no mercado de capitais, diferente do modelo bancário tradicional que se baseia principalmente em depósitos de varejo.
-            """)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-                st.markdown("""
-                #### Ativo
-                
-                - **Empréstimos hipotecários de alta qualidade**: Foco em empréstimos prime para o mercado residencial do Reino Unido
-                - **Baixa diversificação**: Concentração excessiva em um único tipo de ativo
-                - **Originar para distribuir**: Originação de hipotecas para securitização
-                """)
-                st.markdown("</div>", unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown("<div class='warning-box'>", unsafe_allow_html=True)
-                st.markdown("""
-                #### Passivo
-                
-                - **Dependência de funding de atacado**: Apenas 23% dos passivos eram depósitos de varejo em 2007
-                - **Securitização**: Extensa utilização de veículos de securitização (Granite)
-                - **Descasamento de prazos**: Financiamento de curto prazo para ativos de longo prazo
-                """)
-                st.markdown("</div>", unsafe_allow_html=True)
-            
-            st.markdown("#### Mecanismo de Securitização")
-            st.image("https://raw.githubusercontent.com/JAmerico1898/gereneciamento_riscos/9f1b012f661712ed63bb2896ddd375fb8fa6c2e0/securitization_structure.png", 
-                      caption="Estrutura típica de securitização", 
-                      width=700)
+        - **Dependência de funding de atacado**: Apenas 23% dos passivos eram depósitos de varejo em 2007
+        - **Securitização**: Extensa utilização de veículos de securitização (Granite)
+        - **Descasamento de prazos**: Financiamento de curto prazo para ativos de longo prazo
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    st.markdown("#### Mecanismo de Securitização")
+    show_image("securitization_structure.png", 700,
+              caption="Estrutura típica de securitização")
 
-           
-            st.markdown("""
-            ### Evolução da Estrutura de Funding
-            
-            Um aspecto crítico do modelo de negócios do Northern Rock foi a drástica mudança na sua estrutura de financiamento. Em junho de 1998, 60% dos passivos eram depósitos de varejo. Em junho de 2007, este percentual havia caído para apenas 23%.
-            """)
-            
-            # Gráfico da evolução das fontes de financiamento
-            fig = px.line(
-                df_northern_rock,
-                x='Data',
-                y=['Proporção de Depósitos (%)', 'Proporção de Securitização (%)'],
-                title='Evolução da Estrutura de Funding do Northern Rock',
-                labels={'value': 'Porcentagem (%)', 'variable': 'Fonte de Funding'},
-                color_discrete_map={
-                    'Proporção de Depósitos (%)': 'rgba(37, 99, 235, 0.8)',
-                    'Proporção de Securitização (%)': 'rgba(220, 38, 38, 0.8)'
-                }
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with tab3:
-            st.markdown("""
-            ### Cronologia da Crise
-            """)
-            
-            col1, col2 = st.columns([1, 3])
-            
-            with col1:
-                st.image("https://raw.githubusercontent.com/JAmerico1898/gereneciamento_riscos/e0978ccb2502a2b6a3f03dbe6f2ebe6773812b7a/images.jpg",
-                         caption="Clientes fazendo fila durante a corrida bancária", 
-                         width=250)
+   
+    st.markdown("""
+    ### Evolução da Estrutura de Funding
+    
+    Um aspecto crítico do modelo de negócios do Northern Rock foi a drástica mudança na sua estrutura de financiamento. Em junho de 1998, 60% dos passivos eram depósitos de varejo. Em junho de 2007, este percentual havia caído para apenas 23%.
+    """)
+    
+    # Gráfico da evolução das fontes de financiamento
+    fig = px.line(
+        df_northern_rock,
+        x='Data',
+        y=['Proporção de Depósitos (%)', 'Proporção de Securitização (%)'],
+        title='Evolução da Estrutura de Funding do Northern Rock',
+        labels={'value': 'Porcentagem (%)', 'variable': 'Fonte de Funding'},
+        color_discrete_map={
+            'Proporção de Depósitos (%)': 'rgba(37, 99, 235, 0.8)',
+            'Proporção de Securitização (%)': 'rgba(220, 38, 38, 0.8)'
+        }
+    )
+    fig.update_layout(height=400)
+    st.plotly_chart(fig, use_container_width=True)
 
-            with col2:
-                st.markdown("""
-                #### Eventos Principais
-                
-                - **9 de agosto de 2007**: BNP Paribas congela fundos de investimento com exposição a hipotecas subprime dos EUA, desencadeando uma crise de liquidez no mercado interbancário
-                
-                - **13-14 de agosto de 2007**: Northern Rock alerta os reguladores do Reino Unido sobre suas dificuldades de financiamento
-                
-                - **14 de agosto - 13 de setembro**: Tentativas frustradas de encontrar um comprador para o banco
-                
-                - **13 de setembro**: BBC anuncia que o Northern Rock buscou apoio de emergência do Banco da Inglaterra
-                
-                - **14 de setembro**: Banco da Inglaterra anuncia oficialmente suporte de liquidez de emergência
-                
-                - **14-17 de setembro**: Corrida bancária - clientes retiram £2 bilhões (cerca de 8% dos depósitos de varejo)
-                
-                - **17 de setembro**: Governo anuncia garantia para todos os depósitos existentes do Northern Rock
-                
-                - **22 de fevereiro de 2008**: Banco é nacionalizado pelo governo britânico
-                """)
-            
-            st.markdown("#### Composição dos Passivos Antes e Depois da Corrida")
-            
-            # Dados da composição de passivos antes e depois da corrida
-            data = {
-                'Categoria': ['Notas Securitizadas', 'Covered Bonds', 'Depósitos de Varejo', 'Funding Wholesale', 'Empréstimo do Banco da Inglaterra'],
-                'Junho 2007 (£m)': [45698, 8105, 24350, 26710, 0],
-                'Dezembro 2007 (£m)': [43070, 8938, 10469, 11472, 28473]
-            }
-            
-            df_corrida = pd.DataFrame(data)
-            
-            # Gráfico de barras lado a lado
-            fig = go.Figure()
-            
-            fig.add_trace(go.Bar(
-                x=df_corrida['Categoria'],
-                y=df_corrida['Junho 2007 (£m)'],
-                name='Junho 2007',
-                marker_color='rgba(55, 83, 109, 0.7)'
-            ))
-            
-            fig.add_trace(go.Bar(
-                x=df_corrida['Categoria'],
-                y=df_corrida['Dezembro 2007 (£m)'],
-                name='Dezembro 2007',
-                marker_color='rgba(26, 118, 255, 0.7)'
-            ))
-            
-            fig.update_layout(
-                title='Composição dos Passivos do Northern Rock Antes e Depois da Corrida (milhões £)',
-                xaxis_tickfont_size=14,
-                yaxis=dict(
-                    title='Valor (milhões £)',
-                    #titlefont_size=16,
-                    tickfont_size=14,
-                ),
-                
-            legend=dict(
-                x=1.02,
-                y=1,
-                xanchor='left',
-                yanchor='top',
-                bgcolor='rgba(255, 255, 255, 0)',
-                bordercolor='rgba(255, 255, 255, 0)'
-            ),
-            
-            barmode='group',
-                bargap=0.15,
-                bargroupgap=0.1,
-                height=500
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.markdown("""
-            ### Lições da Quebra do Northern Rock
-            
-            A falência do Northern Rock destaca várias vulnerabilidades críticas no modelo de negócios bancário:
-            
-            1. **Dependência excessiva de financiamento de atacado**: A confiança em funding de curto prazo nos mercados de capitais tornou o banco vulnerável a mudanças nas condições de liquidez do mercado
-            
-            2. **Descasamento de prazos extremo**: Ativos de longo prazo (hipotecas) financiados com passivos de curto prazo
-            
-            3. **Crescimento muito rápido**: Taxa de crescimento anual de 23% era insustentável e aumentou a vulnerabilidade
-            
-            4. **Falta de diversificação**: Concentração excessiva tanto nos ativos (hipotecas) quanto nas fontes de financiamento
-            
-            5. **Supervisão regulatória inadequada**: Falha dos reguladores em identificar os riscos acumulados no modelo de negócios
-            """)
-            
-    elif menu == "Simulador de Balanço e Risco":
-        st.markdown("## 📊 Simulador de Balanço e Risco de Liquidez")
-        
+def tab_crisis():
+    """Aba da cronologia e das causas da crise"""
+    st.markdown("""
+    ### Cronologia da Crise
+    """)
+    
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        show_image("images.jpg", 250,
+                 caption="Clientes fazendo fila durante a corrida bancária")
+
+    with col2:
         st.markdown("""
-        Este simulador permite você experimentar diferentes configurações de balanço patrimonial de um banco hipotético 
-        e visualizar o impacto dessas escolhas no risco de liquidez. Use os controles abaixo para ajustar as proporções.
-        """)
+        #### Eventos Principais
         
-        col1, col2 = st.columns([1, 1])
+        - **9 de agosto de 2007**: BNP Paribas congela fundos de investimento com exposição a hipotecas subprime dos EUA, desencadeando uma crise de liquidez no mercado interbancário
         
-        with col1:
-            st.markdown("### Composição dos Ativos")
-            ativos_liquidos_pct = st.slider("Ativos Líquidos (%)", 0, 100, 30, 
-                                         help="Ativos de alta qualidade que podem ser convertidos rapidamente em caixa")
-            ativos_iliquidos_pct = 100 - ativos_liquidos_pct
-            st.markdown(f"Financiamentos Imobiliários (Ilíquidos): **{ativos_iliquidos_pct}%**")
+        - **13-14 de agosto de 2007**: Northern Rock alerta os reguladores do Reino Unido sobre suas dificuldades de financiamento
         
-        with col2:
-            st.markdown("### Fontes de Financiamento")
-            wholesale_funding_pct = st.slider("Funding Wholesale/Securitizado (%)", 0, 100, 70,
-                                          help="Inclui empréstimos interbancários, notas securitizadas e outros financiamentos de mercado")
-            depositos_varejo_pct = 100 - wholesale_funding_pct
-            st.markdown(f"Depósitos de Varejo: **{depositos_varejo_pct}%**")
+        - **14 de agosto - 13 de setembro**: Tentativas frustradas de encontrar um comprador para o banco
         
-        # Visualização do balanço
-        st.markdown("### Balanço Patrimonial Simulado")
-        fig_balance = plot_balance_sheet(ativos_liquidos_pct, wholesale_funding_pct)
-        st.plotly_chart(fig_balance, use_container_width=True)
+        - **13 de setembro**: BBC anuncia que o Northern Rock buscou apoio de emergência do Banco da Inglaterra
         
-        # Cálculo de indicadores de risco
-        st.markdown("### Indicadores de Risco de Liquidez")
+        - **14 de setembro**: Banco da Inglaterra anuncia oficialmente suporte de liquidez de emergência
         
-        # Calcular LCR e NSFR simulados
-        lcr_value = calculate_lcr(ativos_liquidos_pct, wholesale_funding_pct * 0.3)
-        nsfr_value = calculate_nsfr(depositos_varejo_pct + (wholesale_funding_pct * 0.5), ativos_iliquidos_pct)
+        - **14-17 de setembro**: Corrida bancária - clientes retiram £2 bilhões (cerca de 8% dos depósitos de varejo)
         
-        # Calcular score de risco geral
-        risk_score = calculate_liquidity_risk(ativos_liquidos_pct, wholesale_funding_pct)
+        - **17 de setembro**: Governo anuncia garantia para todos os depósitos existentes do Northern Rock
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric(
-                label="Liquidity Coverage Ratio (LCR)",
-                value=f"{lcr_value:.1f}%",
-                delta=f"{lcr_value - 100:.1f}%" if lcr_value != 100 else "0%",
-                delta_color="normal" if lcr_value >= 100 else "inverse"
-            )
-            st.markdown("Requerimento regulatório: >= 100%")
-            st.markdown("Premissas:")
-            st.markdown("(i) depósitos de varejo são estáveis; (ii) resgate de 30% dos depósitos de atacado")
-        
-        with col2:
-            st.metric(
-                label="Net Stable Funding Ratio (NSFR)",
-                value=f"{nsfr_value:.1f}%",
-                delta=f"{nsfr_value - 100:.1f}%" if nsfr_value != 100 else "0%",
-                delta_color="normal" if nsfr_value >= 100 else "inverse"
-            )
-            st.markdown("Requerimento regulatório: >= 100%")
-        
-        with col3:
-            # Determinar nível de risco e formato de exibição
-            if risk_score < 30:
-                risk_level = "BAIXO"
-                risk_class = "risk-low"
-            elif risk_score < 60:
-                risk_level = "MÉDIO"
-                risk_class = "risk-medium"
-            else:
-                risk_level = "ALTO"
-                risk_class = "risk-high"
-            
-            st.metric(
-                label="Score de Risco de Liquidez",
-                value=f"{risk_score:.1f}/100",
-                delta=None
-            )
-            st.markdown(f"Nível de Risco: <span class='{risk_class}'>{risk_level}</span>", unsafe_allow_html=True)
-        
-        # Comparação com o Northern Rock
-        st.markdown("### Comparação com o Northern Rock")
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.markdown("""
-            **Composição do Northern Rock em Junho 2007:**
-            - Ativos Líquidos: aproximadamente 15%
-            - Funding Wholesale/Securitizado: aproximadamente 77%
-            - Alavancagem (Ativos/Patrimônio): 58.2x
-            """)
-        
-        with col2:
-            if risk_score > 50:
-                st.warning("⚠️ O seu modelo de balanço apresenta características de vulnerabilidade similares ao Northern Rock", icon="⚠️")
-            else:
-                st.success("✅ O seu modelo de balanço é mais resiliente que o do Northern Rock", icon="✅")
+        - **22 de fevereiro de 2008**: Banco é nacionalizado pelo governo britânico
+        """)
+    
+    st.markdown("#### Composição dos Passivos Antes e Depois da Corrida")
+    
+    # Dados da composição de passivos antes e depois da corrida
+    data = {
+        'Categoria': ['Notas Securitizadas', 'Covered Bonds', 'Depósitos de Varejo', 'Funding Wholesale', 'Empréstimo do Banco da Inglaterra'],
+        'Junho 2007 (£m)': [45698, 8105, 24350, 26710, 0],
+        'Dezembro 2007 (£m)': [43070, 8938, 10469, 11472, 28473]
+    }
+    
+    df_corrida = pd.DataFrame(data)
+    
+    # Gráfico de barras lado a lado
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=df_corrida['Categoria'],
+        y=df_corrida['Junho 2007 (£m)'],
+        name='Junho 2007',
+        marker_color='rgba(55, 83, 109, 0.7)'
+    ))
+    
+    fig.add_trace(go.Bar(
+        x=df_corrida['Categoria'],
+        y=df_corrida['Dezembro 2007 (£m)'],
+        name='Dezembro 2007',
+        marker_color='rgba(26, 118, 255, 0.7)'
+    ))
+    
+    fig.update_layout(
+        title='Composição dos Passivos do Northern Rock Antes e Depois da Corrida (milhões £)',
+        xaxis_tickfont_size=14,
+        yaxis=dict(
+            title='Valor (milhões £)',
+            #titlefont_size=16,
+            tickfont_size=14,
+        ),
         
-        # Análise de vulnerabilidade
-        st.markdown("### Análise de Vulnerabilidade")
+    legend=dict(
+        x=1.02,
+        y=1,
+        xanchor='left',
+        yanchor='top',
+        bgcolor='rgba(255, 255, 255, 0)',
+        bordercolor='rgba(255, 255, 255, 0)'
+    ),
+    
+    barmode='group',
+        bargap=0.15,
+        bargroupgap=0.1,
+        height=500
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("""
+    ### Lições da Quebra do Northern Rock
+    
+    A falência do Northern Rock destaca várias vulnerabilidades críticas no modelo de negócios bancário:
+    
+    1. **Dependência excessiva de financiamento de atacado**: A confiança em funding de curto prazo nos mercados de capitais tornou o banco vulnerável a mudanças nas condições de liquidez do mercado
+    
+    2. **Descasamento de prazos extremo**: Ativos de longo prazo (hipotecas) financiados com passivos de curto prazo
+    
+    3. **Crescimento muito rápido**: Taxa de crescimento anual de 23% era insustentável e aumentou a vulnerabilidade
+    
+    4. **Falta de diversificação**: Concentração excessiva tanto nos ativos (hipotecas) quanto nas fontes de financiamento
+    
+    5. **Supervisão regulatória inadequada**: Falha dos reguladores em identificar os riscos acumulados no modelo de negócios
+    """)
+
+ABAS_NORTHERN_ROCK = {
+    "Contexto Histórico": tab_historical_context,
+    "Modelo de Negócios": tab_business_model,
+    "A Crise": tab_crisis,
+}
+
+def page_northern_rock():
+    """Página do estudo de caso do Northern Rock"""
+    st.markdown("## 🏦 O Caso Northern Rock: Anatomia de uma Quebra Bancária")
+    
+    render_tabs(ABAS_NORTHERN_ROCK, key="abas_northern_rock")
+
+def page_balance_simulator():
+    """Página do simulador de balanço e risco de liquidez"""
+    st.markdown("## 📊 Simulador de Balanço e Risco de Liquidez")
+    
+    st.markdown("""
+    Este simulador permite você experimentar diferentes configurações de balanço patrimonial de um banco hipotético 
+    e visualizar o impacto dessas escolhas no risco de liquidez. Use os controles abaixo para ajustar as proporções.
+    """)
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.markdown("### Composição dos Ativos")
+        ativos_liquidos_pct = st.slider("Ativos Líquidos (%)", 0, 100, 30, 
+                                     help="Ativos de alta qualidade que podem ser convertidos rapidamente em caixa")
+        ativos_iliquidos_pct = 100 - ativos_liquidos_pct
+        st.markdown(f"Financiamentos Imobiliários (Ilíquidos): **{ativos_iliquidos_pct}%**")
+    
+    with col2:
+        st.markdown("### Fontes de Financiamento")
+        wholesale_funding_pct = st.slider("Funding Wholesale/Securitizado (%)", 0, 100, 70,
+                                      help="Inclui empréstimos interbancários, notas securitizadas e outros financiamentos de mercado")
+        depositos_varejo_pct = 100 - wholesale_funding_pct
+        st.markdown(f"Depósitos de Varejo: **{depositos_varejo_pct}%**")
+    
+    # Visualização do balanço
+    st.markdown("### Balanço Patrimonial Simulado")
+    fig_balance = plot_balance_sheet(ativos_liquidos_pct, wholesale_funding_pct)
+    st.plotly_chart(fig_balance, use_container_width=True)
+    
+    # Cálculo de indicadores de risco
+    st.markdown("### Indicadores de Risco de Liquidez")
+    
+    # Calcular LCR e NSFR simulados
+    lcr_value = calculate_lcr(ativos_liquidos_pct, wholesale_funding_pct * 0.3)
+    nsfr_value = calculate_nsfr(depositos_varejo_pct + (wholesale_funding_pct * 0.5), ativos_iliquidos_pct)
+    
+    # Calcular score de risco geral
+    risk_score = calculate_liquidity_risk(ativos_liquidos_pct, wholesale_funding_pct)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(
+            label="Liquidity Coverage Ratio (LCR)",
+            value=f"{lcr_value:.1f}%",
+            delta=f"{lcr_value - 100:.1f}%" if lcr_value != 100 else "0%",
+            delta_color="normal" if lcr_value >= 100 else "inverse"
+        )
+        st.markdown("Requerimento regulatório: >= 100%")
+        st.markdown("Premissas:")
+        st.markdown("(i) depósitos de varejo são estáveis; (ii) resgate de 30% dos depósitos de atacado")
+    
+    with col2:
+        st.metric(
+            label="Net Stable Funding Ratio (NSFR)",
+            value=f"{nsfr_value:.1f}%",
+            delta=f"{nsfr_value - 100:.1f}%" if nsfr_value != 100 else "0%",
+            delta_color="normal" if nsfr_value >= 100 else "inverse"
+        )
+        st.markdown("Requerimento regulatório: >= 100%")
+    
+    with col3:
+        # Determinar nível de risco e formato de exibição
+        if risk_score < 30:
+            risk_level = "BAIXO"
+            risk_class = "risk-low"
+        elif risk_score < 60:
+            risk_level = "MÉDIO"
+            risk_class = "risk-medium"
+        else:
+            risk_level = "ALTO"
+            risk_class = "risk-high"
+        
+        st.metric(
+            label="Score de Risco de Liquidez",
+            value=f"{risk_score:.1f}/100",
+            delta=None
+        )
+        st.markdown(f"Nível de Risco: <span class='{risk_class}'>{risk_level}</span>", unsafe_allow_html=True)
+    
+    # Comparação com o Northern Rock
+    st.markdown("### Comparação com o Northern Rock")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.markdown("""
+        **Composição do Northern Rock em Junho 2007:**
+        - Ativos Líquidos: aproximadamente 15%
+        - Funding Wholesale/Securitizado: aproximadamente 77%
+        - Alavancagem (Ativos/Patrimônio): 58.2x
+        """)
+    
+    with col2:
+        if risk_score > 50:
+            st.warning("⚠️ O seu modelo de balanço apresenta características de vulnerabilidade similares ao Northern Rock", icon="⚠️")
+        else:
+            st.success("✅ O seu modelo de balanço é mais resiliente que o do Northern Rock", icon="✅")
+    
+    # Análise de vulnerabilidade
+    st.markdown("### Análise de Vulnerabilidade")
+    
+    if wholesale_funding_pct > 60:
+        st.markdown("<div class='warning-box'>", unsafe_allow_html=True)
+        st.markdown(f"""
+        **Alta dependência de funding wholesale ({wholesale_funding_pct}%)**
+        
+        Uma dependência excessiva de financiamento de atacado/securitizado torna o banco vulnerável a 
+        interrupções no mercado de capitais, como ocorreu no caso do Northern Rock. A falta de acesso 
+        a este mercado pode rapidamente transformar-se em uma crise de liquidez.
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    if ativos_liquidos_pct < 20:
+        st.markdown("<div class='warning-box'>", unsafe_allow_html=True)
+        st.markdown(f"""
+        **Baixo nível de ativos líquidos ({ativos_liquidos_pct}%)**
+        
+        Um colchão de liquidez insuficiente limita a capacidade do banco de resistir a 
+        saídas inesperadas de caixa sem recorrer à venda de ativos ilíquidos com desconto 
+        ou a fontes de financiamento de emergência.
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Simulação de estresse
+    st.markdown("### Simulação de Estresse de Liquidez")
+    
+    stress_level = st.slider("Nível de Estresse do Mercado", 1, 10, 5,
+                           help="1 = condições normais, 10 = crise severa")
+    
+    if st.button("Executar Simulação"):
+        fig_sim, failed_day, sim_results = simulate_crisis(ativos_liquidos_pct, wholesale_funding_pct, stress_level)
+        st.plotly_chart(fig_sim, use_container_width=True)
         
-        if wholesale_funding_pct > 60:
-            st.markdown("<div class='warning-box'>", unsafe_allow_html=True)
+        if failed_day:
+            st.error(f"O banco falhou no dia {failed_day} da simulação devido à falta de liquidez.")
             st.markdown(f"""
-            **Alta dependência de funding wholesale ({wholesale_funding_pct}%)**
-            
-            Uma dependência excessiva de financiamento de atacado/securitizado torna o banco vulnerável a 
-            interrupções no mercado de capitais, como ocorreu no caso do Northern Rock. A falta de acesso 
-            a este mercado pode rapidamente transformar-se em uma crise de liquidez.
+            **Análise da Falha:**
+            - Os ativos líquidos foram esgotados devido à saída rápida de funding
+            - A alta proporção de financiamento wholesale acelerou a crise
+            - O banco não conseguiu vender ativos ilíquidos a tempo de cobrir as saídas
             """)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        if ativos_liquidos_pct < 20:
-            st.markdown("<div class='warning-box'>", unsafe_allow_html=True)
+        else:
+            st.success("O banco conseguiu sobreviver ao período de estresse simulado.")
+            final_liquidity = sim_results.iloc[-1]['Ativos Líquidos']
             st.markdown(f"""
-            **Baixo nível de ativos líquidos ({ativos_liquidos_pct}%)**
-            
-            Um colchão de liquidez insuficiente limita a capacidade do banco de resistir a 
-            saídas inesperadas de caixa sem recorrer à venda de ativos ilíquidos com desconto 
-            ou a fontes de financiamento de emergência.
+            **Análise da Resistência:**
+            - Ativos líquidos remanescentes: {final_liquidity:.2f}%
+            - O colchão de liquidez foi suficiente para absorver as saídas
+            - A proporção adequada entre ativos líquidos e funding wholesale contribuiu para a resiliência
             """)
-            st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Mapa de sobrevivência sobre todas as combinações de balanço
+    st.markdown("### Mapa de Sobrevivência")
+    st.markdown("""
+    O mapa mostra o dia da falha para todas as combinações de ativos líquidos e funding wholesale no nível de
+    estresse selecionado. A linha preta delimita a região segura (bancos que sobrevivem aos 30 dias) e o
+    marcador indica a configuração escolhida nos controles acima.
+    """)
+    
+    surface = get_survival_surface()
+    fig_surface = plot_survival_surface(surface, stress_level, ativos_liquidos_pct, wholesale_funding_pct)
+    st.plotly_chart(fig_surface, use_container_width=True)
+    
+    k = int(np.searchsorted(surface['stress_level'], stress_level))
+    regiao_segura = (surface['dias_falha'][k] > surface['dias_simulacao']).mean() * 100
+    st.markdown(f"Neste nível de estresse, **{regiao_segura:.1f}%** das combinações de balanço sobrevivem ao período simulado.")
+    
+    # Simulação estocástica
+    st.markdown("### Simulação Monte Carlo da Corrida Bancária")
+    st.markdown("""
+    Na simulação acima, as saídas diárias são determinísticas. Aqui, as saídas de varejo e wholesale recebem
+    choques aleatórios diários (correlacionados entre si), e a queda dos ativos líquidos amplifica as saídas
+    seguintes (contágio por perda de confiança). O resultado é a distribuição do dia de falha.
+    """)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        distribuicao = st.selectbox("Distribuição dos choques diários", DISTRIBUICOES)
+        n_paths = st.select_slider("Número de trajetórias", options=[10_000, 50_000, 100_000], value=100_000)
+    
+    with col2:
+        vol_varejo = st.slider("Volatilidade das saídas de varejo", 0.0, 2.0, 0.5, 0.1)
+        vol_wholesale = st.slider("Volatilidade das saídas de wholesale", 0.0, 2.0, 0.8, 0.1)
+    
+    with col3:
+        correlacao = st.slider("Correlação varejo-wholesale", 0.0, 1.0, 0.5, 0.05)
+        contagio = st.slider("Intensidade do contágio", 0.0, 3.0, 1.0, 0.1,
+                             help="0 = sem contágio; valores maiores aceleram as saídas quando a liquidez cai")
+    
+    if st.button("Executar Monte Carlo"):
+        with st.spinner("Simulando trajetórias..."):
+            mc = run_monte_carlo(
+                ativos_liquidos_pct, wholesale_funding_pct, stress_level,
+                n_paths=n_paths, vol_varejo=vol_varejo, vol_wholesale=vol_wholesale,
+                correlacao=correlacao, contagio=contagio, distribuicao=distribuicao
+            )
         
-        # Simulação de estresse
-        st.markdown("### Simulação de Estresse de Liquidez")
+        falhas = mc['dias_falha'][mc['dias_falha'] > 0]
         
-        stress_level = st.slider("Nível de Estresse do Mercado", 1, 10, 5,
-                               help="1 = condições normais, 10 = crise severa")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(f"Probabilidade de Falha em {mc['dias_simulacao']} dias", f"{mc['prob_falha'] * 100:.1f}%")
+        with col2:
+            st.metric("Dia Mediano de Falha", f"{np.median(falhas):.0f}" if len(falhas) else "-")
+        with col3:
+            st.metric("Dia de Falha (percentil 5%)", f"{np.percentile(falhas, 5):.0f}" if len(falhas) else "-")
         
-        if st.button("Executar Simulação"):
-            fig_sim, failed_day, sim_results = simulate_crisis(ativos_liquidos_pct, wholesale_funding_pct, stress_level)
-            st.plotly_chart(fig_sim, use_container_width=True)
-            
-            if failed_day:
-                st.error(f"O banco falhou no dia {failed_day} da simulação devido à falta de liquidez.")
-                st.markdown(f"""
-                **Análise da Falha:**
-                - Os ativos líquidos foram esgotados devido à saída rápida de funding
-                - A alta proporção de financiamento wholesale acelerou a crise
-                - O banco não conseguiu vender ativos ilíquidos a tempo de cobrir as saídas
-                """)
-            else:
-                st.success("O banco conseguiu sobreviver ao período de estresse simulado.")
-                final_liquidity = sim_results.iloc[-1]['Ativos Líquidos']
-                st.markdown(f"""
-                **Análise da Resistência:**
-                - Ativos líquidos remanescentes: {final_liquidity:.2f}%
-                - O colchão de liquidez foi suficiente para absorver as saídas
-                - A proporção adequada entre ativos líquidos e funding wholesale contribuiu para a resiliência
-                """)
+        fig_dist, fig_paths = plot_monte_carlo_results(mc)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(fig_dist, use_container_width=True)
+        with col2:
+            st.plotly_chart(fig_paths, use_container_width=True)
+
+def tab_liquidity_gap():
+    """Aba da análise de gap de liquidez e da escada de vencimentos"""
+    st.markdown("### 📈 Gap de Liquidez (Liquidity Gap Analysis)")
     
-    elif menu == "Técnicas de Gestão de Risco":
-        st.markdown("## 🛡️ Técnicas de Gestão do Risco de Liquidez")
-        
+    st.markdown("""
+    A análise de gap de liquidez avalia o descompasso entre ativos líquidos e passivos exigíveis em diferentes horizontes de tempo.
+    
+    #### Objetivo:
+    Identificar desequilíbrios potenciais entre entradas e saídas de caixa em diferentes períodos, permitindo um gerenciamento proativo do fluxo de caixa.
+    """)
+    
+    st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+    st.markdown("""
+    #### Implementação Prática:
+    1. Categorizar ativos e passivos por prazos de vencimento
+    2. Calcular o gap líquido (ativos - passivos) para cada período
+    3. Identificar períodos com gaps negativos significativos
+    4. Desenvolver estratégias para cobrir esses déficits potenciais
+    """)
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Exemplo de gráfico de gap de liquidez
+    st.markdown("#### Exemplo de Análise de Gap de Liquidez")
+    
+    st.markdown(f"""
+    A escada de vencimentos é montada contrato a contrato: títulos e empréstimos geram entradas e depósitos
+    e funding geram saídas no vencimento (depósitos à vista vencem no dia 0). Envie um arquivo CSV com as
+    colunas `{"`, `".join(COLUNAS_POSICOES)}` ou utilize uma carteira sintética.
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        arquivo_gap = st.file_uploader("Arquivo de posições (CSV)", type="csv", key="arquivo_gap")
+    
+    with col2:
+        dias_decorridos = st.slider("Dias decorridos desde a data-base", 0, 90, 0,
+                                    help="Os contratos que vencem no período saem da escada", key="dias_decorridos_gap")
+    
+    try:
+        if arquivo_gap is not None:
+            escada = maturity_ladder_from_csv(arquivo_gap)
+        else:
+            escada = MaturityLadder()
+            escada.add_positions(generate_sample_positions(100_000))
+    except (ValueError, KeyError) as e:
+        st.error(f"Não foi possível processar o arquivo de posições: {e}")
+        escada = MaturityLadder()
+    
+    # Avanço incremental do relógio: apenas desloca os fluxos diários
+    realizado = escada.advance(dias_decorridos)
+    if dias_decorridos > 0:
+        st.markdown(f"Fluxos realizados nos últimos {dias_decorridos} dias: entradas de {realizado['entradas']:,.0f} "
+                    f"e saídas de {realizado['saidas']:,.0f}.")
+    
+    df_gap = escada.ladder()
+    
+    # Gráfico de barras para ativos e passivos
+    fig1 = go.Figure()
+    
+    fig1.add_trace(go.Bar(
+        x=df_gap['Faixa'],
+        y=df_gap['Ativos'],
+        name='Ativos',
+        marker_color='rgba(16, 185, 129, 0.8)'
+    ))
+    
+    fig1.add_trace(go.Bar(
+        x=df_gap['Faixa'],
+        y=df_gap['Passivos'],
+        name='Passivos',
+        marker_color='rgba(220, 38, 38, 0.8)'
+    ))
+    
+    fig1.update_layout(
+        title='Ativos e Passivos por Faixa de Vencimento',
+        xaxis_title='Faixa de Vencimento',
+        yaxis_title='Valor',
+        barmode='group',
+        height=400
+    )
+    
+    # Gráfico de linha para o gap
+    fig2 = go.Figure()
+    
+    fig2.add_trace(go.Bar(
+        x=df_gap['Faixa'],
+        y=df_gap['Gap'],
+        name='Gap de Liquidez',
+        marker_color=['rgba(220, 38, 38, 0.8)' if x < 0 else 'rgba(16, 185, 129, 0.8)' for x in df_gap['Gap']]
+    ))
+    
+    fig2.add_trace(go.Scatter(
+        x=df_gap['Faixa'],
+        y=df_gap['Gap Acumulado'],
+        mode='lines+markers',
+        name='Gap Acumulado',
+        line=dict(color='rgba(37, 99, 235, 0.9)', width=2)
+    ))
+    
+    fig2.add_trace(go.Scatter(
+        x=df_gap['Faixa'],
+        y=[0] * len(df_gap),
+        mode='lines',
+        line=dict(color='black', width=1, dash='dash'),
+        showlegend=False
+    ))
+    
+    fig2.update_layout(
+        title='Gap de Liquidez por Faixa de Vencimento',
+        xaxis_title='Faixa de Vencimento',
+        yaxis_title='Gap',
+        height=300
+    )
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(fig1, use_container_width=True)
+    
+    with col2:
+        st.plotly_chart(fig2, use_container_width=True)
+    
+    st.markdown("""
+    #### Interpretação:
+    - **Gap positivo**: Indica excesso de liquidez no período
+    - **Gap negativo**: Indica déficit potencial de liquidez que precisará ser gerenciado
+    - **Gap acumulado**: Indica se os excessos das faixas anteriores cobrem os déficits até aquele horizonte
+    
+    #### Northern Rock - O que deu errado:
+    O Northern Rock apresentava grandes gaps negativos nos prazos mais curtos, devido ao seu forte descasamento de prazos. O banco não mantinha ativos líquidos suficientes para cobrir a potencial não renovação de seus financiamentos de curto prazo.
+    """)
+
+def tab_liquidity_buffer():
+    """Aba do colchão de liquidez, do LCR e do NSFR"""
+    st.markdown("### 💧 Colchão de Liquidez (Liquidity Buffer)")
+    
+    st.markdown("""
+    Um colchão de liquidez consiste na manutenção de ativos líquidos de alta qualidade (HQLA) que podem ser 
+    convertidos rapidamente em caixa com perda mínima de valor.
+    
+    #### Objetivo:
+    Garantir que a instituição tenha recursos líquidos suficientes para resistir a um período de estresse de liquidez.
+    """)
+    
+    st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+    st.markdown("""
+    #### Componentes típicos do colchão de liquidez:
+    1. **Caixa e reservas no banco central**
+    2. **Títulos soberanos de alta qualidade**
+    3. **Títulos corporativos de grau de investimento**
+    4. **Linhas de crédito comprometidas**
+    """)
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Simulador de colchão de liquidez
+    st.markdown("#### Simulador de Colchão de Liquidez")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        hqla = st.number_input("Ativos líquidos de alta qualidade (HQLA) (milhões)", min_value=0, max_value=1000, value=500, key="hqla_colchao")
         st.markdown("""
-        A gestão eficaz do risco de liquidez envolve várias estratégias e ferramentas complementares. 
-        As técnicas a seguir são essenciais para mitigar vulnerabilidades como as observadas no caso Northern Rock.
+        Exemplos de HQLA:
+        - Caixa
+        - Reservas no banco central
+        - Títulos soberanos AAA-AA
+        - Outros ativos líquidos de alta qualidade
         """)
+    
+    with col2:
+        saidas_esperadas = st.number_input("Saídas de caixa esperadas em 30 dias (milhões)", min_value=1, max_value=1000, value=400, key="saidas_colchao")
+        st.markdown("""
+        Componentes das saídas:
+        - Saques de depósitos
+        - Vencimento de dívidas
+        - Chamadas de margem
+        - Saques de linhas de crédito
+        """)
+    
+    # Calcular LCR
+    lcr = calculate_lcr(hqla, saidas_esperadas)
+    
+    # Calcular dias de cobertura
+    dias_cobertura = hqla / (saidas_esperadas / 30)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if lcr >= 100:
+            st.success(f"Liquidity Coverage Ratio (LCR): {lcr:.1f}%")
+        else:
+            st.error(f"Liquidity Coverage Ratio (LCR): {lcr:.1f}%")
         
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([
-            "Gap de Liquidez", 
-            "Colchão de Liquidez", 
-            "Diversificação", 
-            "Testes de Estresse", 
-            "Planos de Contingência"
-        ])
+        st.markdown("Requerimento Basileia III: LCR >= 100%")
+    
+    with col2:
+        if dias_cobertura >= 30:
+            st.success(f"Dias de cobertura de liquidez: {dias_cobertura:.1f} dias")
+        else:
+            st.error(f"Dias de cobertura de liquidez: {dias_cobertura:.1f} dias")
         
-        with tab1:
-            st.markdown("### 📈 Gap de Liquidez (Liquidity Gap Analysis)")
-            
-            st.markdown("""
-            A análise de gap de liquidez avalia o descompasso entre ativos líquidos e passivos exigíveis em diferentes horizontes de tempo.
-            
-            #### Objetivo:
-            Identificar desequilíbrios potenciais entre entradas e saídas de caixa em diferentes períodos, permitindo um gerenciamento proativo do fluxo de caixa.
-            """)
-            
-            st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-            st.markdown("""
-            #### Implementação Prática:
-            1. Categorizar ativos e passivos por prazos de vencimento
-            2. Calcular o gap líquido (ativos - passivos) para cada período
-            3. Identificar períodos com gaps negativos significativos
-            4. Desenvolver estratégias para cobrir esses déficits potenciais
-            """)
-            st.markdown("</div>", unsafe_allow_html=True)
-            
-            # Exemplo de gráfico de gap de liquidez
-            st.markdown("#### Exemplo de Análise de Gap de Liquidez")
-            
-            # Dados de exemplo para o gráfico
-            faixas = ["0-7 dias", "8-30 dias", "31-90 dias", "91-180 dias", "181-360 dias", "Acima de 1 ano"]
-            ativos_exemplo = [15, 10, 20, 25, 30, 100]
-            passivos_exemplo = [20, 15, 15, 20, 25, 80]
-            gap_exemplo = [a - p for a, p in zip(ativos_exemplo, passivos_exemplo)]
-            
-            # Criar dataframe
-            df_gap = pd.DataFrame({
-                'Faixa': faixas,
-                'Ativos': ativos_exemplo,
-                'Passivos': passivos_exemplo,
-                'Gap': gap_exemplo
-            })
-            
-            # Gráfico de barras para ativos e passivos
-            fig1 = go.Figure()
-            
-            fig1.add_trace(go.Bar(
-                x=df_gap['Faixa'],
-                y=df_gap['Ativos'],
-                name='Ativos',
-                marker_color='rgba(16, 185, 129, 0.8)'
-            ))
-            
-            fig1.add_trace(go.Bar(
-                x=df_gap['Faixa'],
-                y=df_gap['Passivos'],
-                name='Passivos',
-                marker_color='rgba(220, 38, 38, 0.8)'
-            ))
-            
-            fig1.update_layout(
-                title='Ativos e Passivos por Faixa de Vencimento',
-                xaxis_title='Faixa de Vencimento',
-                yaxis_title='Valor (milhões)',
-                barmode='group',
-                height=400
-            )
-            
-            # Gráfico de linha para o gap
-            fig2 = go.Figure()
-            
-            fig2.add_trace(go.Bar(
-                x=df_gap['Faixa'],
-                y=df_gap['Gap'],
-                name='Gap de Liquidez',
-                marker_color=['rgba(220, 38, 38, 0.8)' if x < 0 else 'rgba(16, 185, 129, 0.8)' for x in df_gap['Gap']]
-            ))
-            
-            fig2.add_trace(go.Scatter(
-                x=df_gap['Faixa'],
-                y=[0] * len(df_gap),
-                mode='lines',
-                line=dict(color='black', width=1, dash='dash'),
-                showlegend=False
-            ))
-            
-            fig2.update_layout(
-                title='Gap de Liquidez por Faixa de Vencimento',
-                xaxis_title='Faixa de Vencimento',
-                yaxis_title='Gap (milhões)',
-                height=300
-            )
+        st.markdown("Melhor prática: Mínimo de 30 dias de cobertura")
+    
+    st.markdown("""
+    #### Importância do LCR:
+    O Liquidity Coverage Ratio (LCR) foi introduzido pelo Comitê de Basileia após a crise financeira de 2008, 
+    em parte como resposta a falhas como as do Northern Rock. Ele exige que os bancos mantenham um estoque 
+    adequado de ativos líquidos de alta qualidade para sobreviver a um cenário de estresse de 30 dias.
+    
+    #### Northern Rock - O que deu errado:
+    O Northern Rock mantinha um colchão de liquidez claramente insuficiente para seu modelo de negócios. 
+    O banco não possuía HQLA suficientes para cobrir a potencial não renovação de seu funding de curto prazo.
+    """)
+    
+    # LCR e NSFR calculados contrato a contrato
+    st.markdown("#### LCR e NSFR a partir de Posições Contratuais")
+    
+    st.markdown(f"""
+    Na prática, o LCR e o NSFR são calculados a partir de cada contrato do balanço: cada depósito ou linha
+    de funding recebe a taxa de saída de Basileia de acordo com a contraparte e o vencimento, cada título
+    recebe o haircut do seu nível de HQLA (com os limites de 40% para Nível 2 e 15% para Nível 2B) e os
+    fatores de ASF/RSF do NSFR dependem do prazo residual.
+    
+    Envie um arquivo CSV com as colunas `{"`, `".join(COLUNAS_POSICOES)}` ou utilize uma carteira sintética.
+    """)
+    
+    arquivo_posicoes = st.file_uploader("Arquivo de posições (CSV)", type="csv", key="arquivo_colchao")
+    n_contratos = st.select_slider(
+        "Número de contratos da carteira sintética",
+        options=[10_000, 100_000, 1_000_000],
+        value=100_000,
+        disabled=arquivo_posicoes is not None,
+        key="contratos_colchao"
+    )
+    
+    if st.button("Calcular LCR Contratual", key="calcular_lcr_contratual"):
+        try:
+            if arquivo_posicoes is not None:
+                resultado = compute_contract_liquidity_from_csv(arquivo_posicoes)
+            else:
+                resultado = compute_contract_liquidity(generate_sample_positions(n_contratos))
+        except (ValueError, KeyError) as e:
+            st.error(f"Não foi possível processar o arquivo de posições: {e}")
+        else:
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Contratos", f"{resultado['n_contratos']:,}")
+            col2.metric("HQLA (após haircuts e limites)", f"{resultado['hqla']:,.0f}")
+            col3.metric("LCR", f"{resultado['lcr']:.1f}%")
+            col4.metric("NSFR", f"{resultado['nsfr']:.1f}%")
             
             col1, col2 = st.columns(2)
             
             with col1:
-                st.plotly_chart(fig1, use_container_width=True)
+                df_hqla = pd.DataFrame({
+                    'Estoque': pd.Series(resultado['estoque_hqla']),
+                    'Após Haircut': pd.Series(resultado['hqla_ajustado'])
+                }).rename_axis('Nível').reset_index()
+                st.markdown("**Composição do HQLA**")
+                st.dataframe(df_hqla.round(0), hide_index=True)
             
             with col2:
-                st.plotly_chart(fig2, use_container_width=True)
-            
-            st.markdown("""
-            #### Interpretação:
-            - **Gap positivo**: Indica excesso de liquidez no período
-            - **Gap negativo**: Indica déficit potencial de liquidez que precisará ser gerenciado
+                st.markdown(f"""
+                - Saídas em 30 dias: {resultado['saidas']:,.0f}
+                - Entradas em 30 dias: {resultado['entradas']:,.0f}
+                - Entradas consideradas (limite de 75% das saídas): {resultado['entradas_consideradas']:,.0f}
+                - **Saídas líquidas: {resultado['saidas_liquidas']:,.0f}**
+                - Funding estável disponível (ASF): {resultado['asf']:,.0f}
+                - Funding estável requerido (RSF): {resultado['rsf']:,.0f}
+                """)
             
-            #### Northern Rock - O que deu errado:
-            O Northern Rock apresentava grandes gaps negativos nos prazos mais curtos, devido ao seu forte descasamento de prazos. O banco não mantinha ativos líquidos suficientes para cobrir a potencial não renovação de seus financiamentos de curto prazo.
-            """)
+            st.markdown("**Detalhamento por Tipo e Contraparte**")
+            st.dataframe(resultado['detalhe'].round(0), hide_index=True)
+
+def tab_diversification():
+    """Aba da diversificação das fontes de funding"""
+    st.markdown("### 🔄 Diversificação de Fontes de Financiamento")
+    
+    st.markdown("""
+    A diversificação das fontes de financiamento visa reduzir a dependência de uma única fonte de funding, 
+    minimizando o risco de uma interrupção severa no caso de problemas em um segmento específico do mercado.
+    
+    #### Objetivo:
+    Criar um mix equilibrado de fontes de funding com diferentes características de estabilidade, custo e maturidade.
+    """)
+    
+    # Gráfico de diversificação
+    st.markdown("#### Ilustração de Diversificação de Funding")
+    
+    # Dados para o gráfico
+    funding_tipos = [
+        "Depósitos de Varejo", 
+        "Depósitos Corporativos", 
+        "Empréstimos Interbancários",
+        "Emissões de Dívida", 
+        "Securitização", 
+        "Covered Bonds"
+    ]
+    
+    # Banco diversificado vs Northern Rock
+    diversificado = [35, 20, 15, 15, 10, 5]
+    northern_rock = [23, 5, 15, 2, 45, 10]
+    
+    # Criar dataframe
+    df_div = pd.DataFrame({
+        'Fonte de Funding': funding_tipos,
+        'Banco Diversificado (%)': diversificado,
+        'Northern Rock (%)': northern_rock
+    })
+    
+    # Gráfico de radar
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatterpolar(
+        r=diversificado,
+        theta=funding_tipos,
+        fill='toself',
+        name='Banco Diversificado',
+        line_color='rgba(16, 185, 129, 0.8)'
+    ))
+    
+    fig.add_trace(go.Scatterpolar(
+        r=northern_rock,
+        theta=funding_tipos,
+        fill='toself',
+        name='Northern Rock',
+        line_color='rgba(220, 38, 38, 0.8)'
+    ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 50]
+            )
+        ),
+        title="Comparação da Diversificação de Funding",
+        height=500
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        #### Estratégias de Diversificação:
         
-        with tab2:
-            st.markdown("### 💧 Colchão de Liquidez (Liquidity Buffer)")
-            
-            st.markdown("""
-            Um colchão de liquidez consiste na manutenção de ativos líquidos de alta qualidade (HQLA) que podem ser 
-            convertidos rapidamente em caixa com perda mínima de valor.
-            
-            #### Objetivo:
-            Garantir que a instituição tenha recursos líquidos suficientes para resistir a um período de estresse de liquidez.
-            """)
-            
-            st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-            st.markdown("""
-            #### Componentes típicos do colchão de liquidez:
-            1. **Caixa e reservas no banco central**
-            2. **Títulos soberanos de alta qualidade**
-            3. **Títulos corporativos de grau de investimento**
-            4. **Linhas de crédito comprometidas**
-            """)
-            st.markdown("</div>", unsafe_allow_html=True)
-            
-            # Simulador de colchão de liquidez
-            st.markdown("#### Simulador de Colchão de Liquidez")
+        1. **Diversificar tipos de instrumentos**
+           - Depósitos (varejo, corporativos)
+           - Dívida de curto e longo prazo
+           - Securitização (com limites prudentes)
+           - Covered bonds
+        
+        2. **Diversificar prazos de vencimento**
+           - Escalonar vencimentos
+           - Evitar concentração de vencimentos
+        
+        3. **Diversificar base de investidores**
+           - Diferentes segmentos de mercado
+           - Diferentes regiões geográficas
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("<div class='warning-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        #### Northern Rock - O que deu errado:
+        
+        Northern Rock apresentava diversas falhas na diversificação:
+        
+        1. **Concentração excessiva em securitização**
+           - 45% do funding vinha de notas securitizadas
+           - Apenas 23% de depósitos de varejo
+        
+        2. **Dependência do mercado atacadista**
+           - Mais de 75% do funding vinha de fontes não-varejo
+           - Vulnerabilidade a choques de liquidez no mercado
+        
+        3. **Modelo de crescimento insustentável**
+           - Crescimento de ativos muito mais rápido que a base de depósitos
+           - Aumento da dependência de mercados de capitais
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    st.markdown("#### Análise de Concentração do Book de Funding")
+    
+    st.markdown("""
+    A partir das linhas de funding do banco (contraparte, instrumento, data de vencimento e valor), são calculados
+    o índice Herfindahl-Hirschman (HHI) por contraparte e por instrumento, a participação dos maiores financiadores e a
+    escada diária de rolagem. O book também alimenta o simulador de estresse: seu balanço é testado contra a
+    biblioteca de cenários e contra um cenário em que os maiores financiadores retiram todo o funding que vence em 30 dias.
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        arquivo_funding = st.file_uploader(f"Linhas de funding (CSV com {', '.join(COLUNAS_FUNDING)})", type="csv", key="arquivo_funding")
+        data_base = st.date_input("Data-base", value=pd.Timestamp('2007-06-30'), key="data_base_funding")
+    
+    with col2:
+        n_linhas = st.select_slider("Linhas do book sintético", options=[100_000, 1_000_000, 3_000_000],
+                                    value=100_000, disabled=arquivo_funding is not None, key="linhas_funding")
+        n_maiores = st.slider("Maiores financiadores no cenário de concentração", 1, 50, 10, key="maiores_funding")
+        hqla_pct = st.slider("HQLA (% do funding total)", 0, 50, 15, key="hqla_funding")
+    
+    if st.button("Analisar Book de Funding", key="analisar_funding"):
+        try:
+            if arquivo_funding is not None:
+                resultado = compute_funding_concentration_from_csv(arquivo_funding, data_base)
+            else:
+                resultado = compute_funding_concentration(generate_sample_funding(n_linhas, n_linhas // 6, data_base), data_base)
+        except (ValueError, KeyError) as e:
+            st.error(f"Não foi possível ler o book de funding: {e}")
+        else:
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("HHI por Contraparte", f"{resultado['hhi_contraparte']:,.0f}")
+            col2.metric("HHI por Instrumento", f"{resultado['hhi_instrumento']:,.0f}")
+            col3.metric(f"Participação dos {n_maiores} Maiores",
+                        f"{resultado['por_contraparte']['participacao'].head(n_maiores).sum():.1f}%")
+            col4.metric("Contrapartes Significativas (>1%)", f"{resultado['contrapartes_significativas']}")
+            
+            st.caption(f"{resultado['n_linhas']:,} linhas, {len(resultado['por_contraparte']):,} contrapartes. "
+                       f"Vencimentos além de 1 ano: {resultado['acima_horizonte'] / max(resultado['total'], 1e-12) * 100:.1f}% do funding.")
+            
+            st.plotly_chart(plot_rollover_ladder(resultado['escada']), use_container_width=True)
             
             col1, col2 = st.columns(2)
             
             with col1:
-                hqla = st.number_input("Ativos líquidos de alta qualidade (HQLA) (milhões)", min_value=0, max_value=1000, value=500)
-                st.markdown("""
-                Exemplos de HQLA:
-                - Caixa
-                - Reservas no banco central
-                - Títulos soberanos AAA-AA
-                - Outros ativos líquidos de alta qualidade
-                """)
+                st.markdown("##### Maiores Contrapartes")
+                maiores = resultado['por_contraparte'].head(20)
+                st.dataframe(pd.DataFrame({
+                    'Contraparte': maiores.index,
+                    'Valor': maiores['valor'].round(0),
+                    'Participação (%)': maiores['participacao'].round(2),
+                    'Vence em 30 dias': maiores['atacado_30d'].round(0),
+                }), hide_index=True)
             
             with col2:
-                saidas_esperadas = st.number_input("Saídas de caixa esperadas em 30 dias (milhões)", min_value=1, max_value=1000, value=400)
-                st.markdown("""
-                Componentes das saídas:
-                - Saques de depósitos
-                - Vencimento de dívidas
-                - Chamadas de margem
-                - Saques de linhas de crédito
-                """)
-            
-            # Calcular LCR
-            lcr = calculate_lcr(hqla, saidas_esperadas)
-            
-            # Calcular dias de cobertura
-            dias_cobertura = hqla / (saidas_esperadas / 30)
-            
-            col1, col2 = st.columns(2)
+                st.markdown("##### Composição por Instrumento")
+                st.dataframe(pd.DataFrame({
+                    'Instrumento': ROTULOS_INSTRUMENTOS,
+                    'Valor': resultado['por_instrumento']['valor'].round(0),
+                    'Participação (%)': resultado['por_instrumento']['participacao'].round(1),
+                }), hide_index=True)
+            
+            # Balanço do book testado contra a biblioteca de cenários e o cenário de concentração
+            st.markdown("##### Estresse do Book de Funding")
+            
+            balanco = resultado['balanco']
+            cenarios = balance_sheet_scenarios()
+            matriz = np.vstack([scenario_matrix(cenarios, PARAMETROS_CENARIO), concentration_scenario(resultado, n_maiores)])
+            projecao = project_stress_liquidity(
+                resultado['total'] * hqla_pct / 100, balanco['depositos_varejo'], balanco['depositos_corporate'],
+                balanco['funding_curto'], matriz
+            )
+            st.dataframe(pd.DataFrame({
+                'Cenário': list(cenarios['nome']) + [NOME_CENARIO_CONCENTRACAO],
+                'Saída de Varejo (%)': matriz[:, PARAMETROS_CENARIO.index('saida_varejo')].round(1),
+                'Saída Corporativa (%)': matriz[:, PARAMETROS_CENARIO.index('saida_corporate')].round(1),
+                'Não Renovação (%)': matriz[:, PARAMETROS_CENARIO.index('renovacao_curto')].round(1),
+                'Total de Saídas': projecao['total_saidas'].round(0),
+                'Sobrevive': projecao['sobrevive'],
+                'Dias até Falha': np.where(projecao['sobrevive'], np.nan, projecao['dias_sobrevivencia']).round(1)
+            }), hide_index=True)
+
+def tab_stress_tests():
+    """Aba dos testes de estresse"""
+    st.markdown("### 🧪 Stress Testing de Liquidez")
+    
+    st.markdown("""
+    Os testes de estresse de liquidez simulam cenários adversos para avaliar a capacidade do banco de 
+    resistir a choques de liquidez e identificar vulnerabilidades em sua estrutura de funding.
+    
+    #### Objetivo:
+    Avaliar a resiliência do banco sob diferentes cenários de estresse e garantir que tenha planos 
+    de contingência adequados para cada situação.
+    """)
+    
+    st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+    st.markdown("""
+    #### Tipos de Cenários de Estresse:
+    
+    1. **Específicos da instituição**
+       - Downgrade de rating
+       - Rumores sobre solvência
+       - Perda de acesso a mercados específicos
+    
+    2. **Relacionados ao mercado**
+       - Crise de liquidez sistêmica
+       - Fechamento de mercados de capitais
+       - Aumento de volatilidade e custos de funding
+    
+    3. **Combinados**
+       - Cenários que combinam choque individual e de mercado
+       - Geralmente os mais severos e realistas
+    """)
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Simulador de stress test
+    st.markdown("#### Simulador de Stress Test")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("##### Parâmetros do Banco")
+        ativos_liquidos_stress = st.slider("Ativos Líquidos de Alta Qualidade (%)", 0, 100, 25, key="ativos_liquidos_testes")
+        wholesale_funding_stress = st.slider("Proporção de Funding Wholesale (%)", 0, 100, 60, key="wholesale_testes")
+    
+    with col2:
+        lcr_stress = calculate_lcr(ativos_liquidos_stress, wholesale_funding_stress * 0.3)
+        nsfr_stress = calculate_nsfr((100 - wholesale_funding_stress) + (wholesale_funding_stress * 0.5), (100 - ativos_liquidos_stress))
+        
+        st.metric("Liquidity Coverage Ratio (LCR)", f"{lcr_stress:.1f}%")
+        st.metric("Net Stable Funding Ratio (NSFR)", f"{nsfr_stress:.1f}%")
+    
+    if st.button("Executar Testes de Estresse", key="executar_testes"):
+        stress_results = apply_stress_test(lcr_stress, nsfr_stress, ativos_liquidos_stress, wholesale_funding_stress)
+        
+        # Exibir resultados
+        st.markdown("##### Resultados dos Testes de Estresse")
+        
+        for scenario, results in stress_results.items():
+            col1, col2, col3 = st.columns([3, 1, 1])
             
             with col1:
-                if lcr >= 100:
-                    st.success(f"Liquidity Coverage Ratio (LCR): {lcr:.1f}%")
-                else:
-                    st.error(f"Liquidity Coverage Ratio (LCR): {lcr:.1f}%")
-                
-                st.markdown("Requerimento Basileia III: LCR >= 100%")
+                st.markdown(f"**{scenario}**")
             
             with col2:
-                if dias_cobertura >= 30:
-                    st.success(f"Dias de cobertura de liquidez: {dias_cobertura:.1f} dias")
+                if results["survived"]:
+                    st.markdown("✅ **APROVADO**")
                 else:
-                    st.error(f"Dias de cobertura de liquidez: {dias_cobertura:.1f} dias")
-                
-                st.markdown("Melhor prática: Mínimo de 30 dias de cobertura")
+                    st.markdown("❌ **REPROVADO**")
             
-            st.markdown("""
-            #### Importância do LCR:
-            O Liquidity Coverage Ratio (LCR) foi introduzido pelo Comitê de Basileia após a crise financeira de 2008, 
-            em parte como resposta a falhas como as do Northern Rock. Ele exige que os bancos mantenham um estoque 
-            adequado de ativos líquidos de alta qualidade para sobreviver a um cenário de estresse de 30 dias.
+            with col3:
+                st.markdown(f"LCR: {results['new_lcr']:.1f}%")
             
-            #### Northern Rock - O que deu errado:
-            O Northern Rock mantinha um colchão de liquidez claramente insuficiente para seu modelo de negócios. 
-            O banco não possuía HQLA suficientes para cobrir a potencial não renovação de seu funding de curto prazo.
+            # Detalhes do cenário
+            st.markdown(f"""
+            - Ativos líquidos restantes: {results['liquid_assets_remaining']:.1f}%
+            - NSFR após estresse: {results['new_nsfr']:.1f}%
             """)
+            st.markdown("---")
+        
+        # Recomendações baseadas nos resultados
+        failed_scenarios = sum(1 for r in stress_results.values() if not r["survived"])
+        
+        if failed_scenarios == 0:
+            st.success("O banco apresenta boa resiliência em todos os cenários de estresse.")
+        elif failed_scenarios == 1:
+            st.warning("O banco apresenta vulnerabilidade em um cenário de estresse. Considere reforçar seu colchão de liquidez.")
+        else:
+            st.error(f"O banco apresenta vulnerabilidades em {failed_scenarios} cenários de estresse. É necessário reformular sua estrutura de funding e aumentar significativamente seu colchão de liquidez.")
+    
+    st.markdown("""
+    #### Implementação e Regulação:
+    
+    Os testes de estresse de liquidez tornaram-se obrigatórios sob Basileia III, como resposta direta à crise financeira de 2007-2008. 
+    Os reguladores agora exigem que os bancos realizem testes de estresse regulares e mantenham planos de contingência para diferentes cenários.
+    
+    #### Northern Rock - O que deu errado:
+    
+    O Northern Rock não realizava testes de estresse abrangentes que cobrissem cenários extremos, como o fechamento completo 
+    do mercado de securitização. O banco não estava preparado para um evento que de fato ocorreu - a paralisia do mercado 
+    interbancário e de securitização que começou em agosto de 2007.
+    """)
+
+def tab_contingency_plans():
+    """Aba dos planos de contingência de liquidez"""
+    st.markdown("### 📝 Política de Contingência de Liquidez")
+    
+    st.markdown("""
+    Um plano de contingência de liquidez estabelece antecipadamente as ações que serão tomadas em caso de crise, 
+    permitindo uma resposta rápida e coordenada quando o tempo é essencial.
+    
+    #### Objetivo:
+    Estabelecer um roteiro claro de ações para responder a uma crise de liquidez, minimizando o impacto e 
+    evitando decisões precipitadas em momentos de estresse.
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        #### Componentes essenciais de um plano de contingência:
+        
+        1. **Indicadores de alerta precoce**
+           - Gatilhos para ativar o plano
+           - Indicadores de mercado
+           - Métricas internas
+        
+        2. **Estrutura clara de governança**
+           - Comitê de crise
+           - Papéis e responsabilidades
+           - Processos de escalação
+        
+        3. **Opções de funding de emergência**
+           - Linhas de crédito comprometidas
+           - Ativos para venda/colateral
+           - Acesso a facilidades do banco central
+        
+        4. **Estratégias de comunicação**
+           - Comunicação com reguladores
+           - Comunicação com investidores
+           - Comunicação com o público
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+        st.markdown("""
+        #### Níveis típicos de um plano de contingência:
+        
+        **Nível 1: Alerta Inicial**
+        - Sinais de tensão no mercado
+        - Monitoramento intensificado
+        - Preparação de opções de funding
+        
+        **Nível 2: Tensão Elevada**
+        - Deterioração significativa nas condições de funding
+        - Ativação do comitê de crise
+        - Implementação de medidas preventivas
+        
+        **Nível 3: Crise Severa**
+        - Acesso ao mercado seriamente comprometido
+        - Implementação completa do plano de emergência
+        - Consideração de medidas extraordinárias
+        
+        **Nível 4: Sobrevivência**
+        - Ações drásticas para preservar liquidez
+        - Ativação de suporte do banco central
+        - Foco em operações essenciais
+        """)
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Fluxograma simples de contingência
+    st.markdown("#### Fluxograma Simplificado de Contingência de Liquidez")
+    
+    # Dados para o fluxograma (usando um gráfico simples)
+    nodes = [
+        dict(name="Monitoramento", x=0, y=0.5),
+        dict(name="Detecção\nde Alerta", x=1, y=0.5),
+        dict(name="Avaliação\nda Situação", x=2, y=0.5),
+        dict(name="Ativação do\nComitê de Crise", x=3, y=0.5),
+        dict(name="Implementação\nde Medidas", x=4, y=0.5),
+        dict(name="Resolução\nou Crise", x=5, y=0.5)
+    ]
+    
+    edges = [
+        dict(source=0, target=1),
+        dict(source=1, target=2),
+        dict(source=2, target=3),
+        dict(source=3, target=4),
+        dict(source=4, target=5),
+        dict(source=5, target=0, line=dict(dash="dash"))
+    ]
+    
+    # Criar o gráfico
+    fig = go.Figure()
+    
+    # Adicionar nós
+    for node in nodes:
+        fig.add_trace(go.Scatter(
+            x=[node["x"]], 
+            y=[node["y"]],
+            mode="markers+text",
+            marker=dict(size=30, color="rgba(37, 99, 235, 0.8)"),
+            text=node["name"],
+            textposition="top center",
+            hoverinfo="text",
+            name=""
+        ))
+    
+    # Adicionar arestas
+    for edge in edges:
+        source = nodes[edge["source"]]
+        target = nodes[edge["target"]]
+        
+        line_props = edge.get("line", dict())
+        default_line = dict(width=2, color="rgba(0, 0, 0, 0.5)")
+        line = {**default_line, **line_props}
+        
+        fig.add_trace(go.Scatter(
+            x=[source["x"], target["x"]],
+            y=[source["y"], target["y"]],
+            mode="lines",
+            line=line,
+            hoverinfo="none",
+            showlegend=False
+        ))
+    
+    fig.update_layout(
+        title="Processo de Contingência de Liquidez",
+        showlegend=False,
+        xaxis=dict(
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False
+        ),
+        yaxis=dict(
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False
+        ),
+        height=250,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Motor de alerta precoce: a etapa de Monitoramento e Detecção de Alerta do fluxograma
+    st.markdown("#### Motor de Alerta Precoce")
+    
+    st.markdown("""
+    Os indicadores de alerta precoce (saída de depósitos, spread de CDS e taxa de rolagem do funding de atacado) são
+    acompanhados em janelas móveis. Um alerta dispara quando o indicador rompe seu limite absoluto ou quando se afasta
+    da própria média recente por mais do que o limite de z-score, na direção adversa. O número de indicadores em alerta
+    define o nível do plano de contingência.
+    """)
+    
+    rotulos_indicadores = ["Saída de Depósitos (% por período)", "Spread de CDS (pb)", "Taxa de Rolagem do Atacado (%)"]
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        arquivo_indicadores = st.file_uploader(f"Série de indicadores (CSV com data, {', '.join(INDICADORES_PADRAO)})",
+                                               type="csv", key="arquivo_indicadores")
+        anos = st.slider("Anos de dados diários sintéticos", 1, 30, 10, disabled=arquivo_indicadores is not None,
+                         key="anos_indicadores")
+    
+    with col2:
+        janela = st.slider("Janela móvel (observações)", 10, 250, 60, key="janela_indicadores")
+        z_limite = st.slider("Limite de z-score", 1.5, 5.0, 3.0, 0.5, key="z_limite_indicadores")
+    
+    indicadores = {nome: {**config, 'z_limite': z_limite} for nome, config in INDICADORES_PADRAO.items()}
+    try:
+        if arquivo_indicadores is not None:
+            serie = load_indicators(arquivo_indicadores, indicadores)
+        else:
+            # Crise sintética alinhada a 9 de agosto de 2007, quando o mercado interbancário travou
+            n_dias = anos * 365
+            serie = generate_sample_indicators(n_dias, 'D', inicio=pd.Timestamp('2007-08-09') - pd.Timedelta(days=int(n_dias * 0.85)))
+    except (ValueError, KeyError) as e:
+        st.error(f"Não foi possível ler a série de indicadores: {e}")
+    else:
+        resultado = evaluate_history(serie, indicadores, janela)
+        alertas = alert_log(serie['data'], resultado, rotulos_indicadores)
         
-        with tab3:
-            st.markdown("### 🔄 Diversificação de Fontes de Financiamento")
-            
-            st.markdown("""
-            A diversificação das fontes de financiamento visa reduzir a dependência de uma única fonte de funding, 
-            minimizando o risco de uma interrupção severa no caso de problemas em um segmento específico do mercado.
-            
-            #### Objetivo:
-            Criar um mix equilibrado de fontes de funding com diferentes características de estabilidade, custo e maturidade.
-            """)
-            
-            # Gráfico de diversificação
-            st.markdown("#### Ilustração de Diversificação de Funding")
-            
-            # Dados para o gráfico
-            funding_tipos = [
-                "Depósitos de Varejo", 
-                "Depósitos Corporativos", 
-                "Empréstimos Interbancários",
-                "Emissões de Dívida", 
-                "Securitização", 
-                "Covered Bonds"
-            ]
-            
-            # Banco diversificado vs Northern Rock
-            diversificado = [35, 20, 15, 15, 10, 5]
-            northern_rock = [23, 5, 15, 2, 45, 10]
-            
-            # Criar dataframe
-            df_div = pd.DataFrame({
-                'Fonte de Funding': funding_tipos,
-                'Banco Diversificado (%)': diversificado,
-                'Northern Rock (%)': northern_rock
-            })
-            
-            # Gráfico de radar
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatterpolar(
-                r=diversificado,
-                theta=funding_tipos,
-                fill='toself',
-                name='Banco Diversificado',
-                line_color='rgba(16, 185, 129, 0.8)'
-            ))
-            
-            fig.add_trace(go.Scatterpolar(
-                r=northern_rock,
-                theta=funding_tipos,
-                fill='toself',
-                name='Northern Rock',
-                line_color='rgba(220, 38, 38, 0.8)'
-            ))
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 50]
-                    )
-                ),
-                title="Comparação da Diversificação de Funding",
-                height=500
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Nível Atual do Plano", NIVEIS_CONTINGENCIA[resultado['nivel'][-1]])
+        col2.metric("Disparos de Alerta", f"{len(alertas):,}")
+        tensao = np.flatnonzero(resultado['nivel'] >= 2)
+        col3.metric("Primeira Tensão Elevada", f"{serie['data'].iloc[tensao[0]]:%d/%m/%Y}" if len(tensao) else "-")
+        
+        st.plotly_chart(plot_early_warning(serie, resultado, indicadores, rotulos_indicadores), use_container_width=True)
+        
+        st.markdown("##### Últimos Disparos de Alerta")
+        st.dataframe(alertas.tail(20).iloc[::-1].round({'Z-score': 2}), hide_index=True)
+        
+        # Reprodução com o motor incremental: cada observação recebida custa O(1), como em produção.
+        # O motor fica na sessão e só processa as observações novas quando a data avança.
+        st.markdown("##### Reprodução em Tempo Real")
+        datas = serie['data']
+        data_reproducao = st.slider("Dados recebidos até", min_value=datas.iloc[0].date(), max_value=datas.iloc[-1].date(),
+                                    value=datas.iloc[-1].date(), format="DD/MM/YYYY", key="data_reproducao")
+        recebidas = int(datas.searchsorted(pd.Timestamp(data_reproducao) + pd.Timedelta(days=1), side='left'))
+        
+        chave = (arquivo_indicadores.file_id if arquivo_indicadores is not None else anos, janela, z_limite)
+        reproducao = st.session_state.get('reproducao_alerta')
+        if reproducao is None or reproducao['chave'] != chave or reproducao['recebidas'] > recebidas:
+            reproducao = {'chave': chave, 'motor': EarlyWarningEngine(indicadores, janela), 'recebidas': 0, 'ultimo': None}
+            st.session_state['reproducao_alerta'] = reproducao
+        matriz = serie[list(indicadores)].to_numpy(dtype=float)
+        for valores in matriz[reproducao['recebidas']:recebidas].tolist():
+            reproducao['ultimo'] = reproducao['motor'].update(valores)
+        reproducao['recebidas'] = recebidas
+        
+        if reproducao['ultimo'] is not None:
+            zs, estados, nivel = reproducao['ultimo']
+            col1, col2 = st.columns([1, 2])
+            col1.metric("Nível do Plano na Data", NIVEIS_CONTINGENCIA[nivel])
+            col1.caption(f"{recebidas:,} observações processadas pelo motor incremental")
+            col2.dataframe(pd.DataFrame({
+                'Indicador': rotulos_indicadores,
+                'Último Valor': matriz[recebidas - 1],
+                'Z-score': np.round(zs, 2),
+                'Estado': [ROTULOS_ESTADO[estado] for estado in estados],
+            }), hide_index=True)
+    
+    st.markdown("""
+    #### Testes e atualizações regulares:
+    
+    O plano de contingência de liquidez deve ser testado regularmente através de exercícios de simulação 
+    e atualizado para refletir mudanças no ambiente de mercado e na estrutura do banco.
+    
+    #### Northern Rock - O que deu errado:
+    
+    O Northern Rock não possuía um plano de contingência adequado para lidar com o fechamento do mercado 
+    de securitização. Quando a crise eclodiu, o banco não tinha opções viáveis além de buscar o apoio 
+    emergencial do Banco da Inglaterra, o que acabou precipitando a corrida bancária.
+    """)
+
+ABAS_TECNICAS = {
+    "Gap de Liquidez": tab_liquidity_gap,
+    "Colchão de Liquidez": tab_liquidity_buffer,
+    "Diversificação": tab_diversification,
+    "Testes de Estresse": tab_stress_tests,
+    "Planos de Contingência": tab_contingency_plans,
+}
+
+def page_risk_techniques():
+    """Página das técnicas de gestão do risco de liquidez"""
+    st.markdown("## 🛡️ Técnicas de Gestão do Risco de Liquidez")
+    
+    st.markdown("""
+    A gestão eficaz do risco de liquidez envolve várias estratégias e ferramentas complementares. 
+    As técnicas a seguir são essenciais para mitigar vulnerabilidades como as observadas no caso Northern Rock.
+    """)
+    
+    render_tabs(ABAS_TECNICAS, key="abas_tecnicas")
+
+CENARIOS_ESTRESSE_PADRAO = ("Crise de Liquidez Moderada", "Cenário Northern Rock (2007)")
+
+def page_stress_testing():
+    """Página do simulador de stress testing de liquidez"""
+    st.markdown("## 🧪 Simulador de Stress Testing de Liquidez")
+    
+    st.markdown("""
+    Este módulo permite simular diferentes cenários de estresse e avaliar o impacto no perfil de liquidez de um banco. 
+    Configure os parâmetros do banco e escolha os cenários de estresse para avaliar sua resiliência.
+    """)
+    
+    # Configuração do banco
+    st.markdown("### Configuração do Banco")
+
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        ativos_liquidos_pct = st.slider("Ativos Líquidos (%)", 0, 100, 20)
+        hqla = st.slider("Dos quais são HQLA (£ milhões)", 0, 20000, 3000)
+    
+    with col2:
+        depositos_varejo = st.slider("Depósitos de Varejo (£ milhões)", 0, 50000, 15000)
+        depositos_corporate = st.slider("Depósitos Corporativos (£ milhões)", 0, 30000, 5000)
+    
+    with col3:
+        funding_curto = st.slider("Funding de Curto Prazo (£ milhões)", 0, 50000, 25000)
+        funding_longo = st.slider("Funding de Longo Prazo (£ milhões)", 0, 50000, 15000)
+    
+    # Totais do balanço e métricas-chave (mesmo cálculo usado na visão de grupo)
+    indicadores = balance_sheet_ratios(ativos_liquidos_pct, hqla, depositos_varejo, depositos_corporate, funding_curto, funding_longo)
+    total_passivos = indicadores['total_passivos']
+    total_ativos = indicadores['total_ativos']
+    ativos_liquidos = indicadores['ativos_liquidos']
+    lcr_pre = indicadores['lcr_pre']
+    nsfr_pre = indicadores['nsfr_pre']
+    
+    # Exibir resumo do banco
+    st.markdown("### Resumo do Perfil de Liquidez")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Total de Ativos", f"£{total_ativos/1000:.1f} bilhões")
+        st.metric("Ativos Líquidos", f"£{ativos_liquidos/1000:.1f} bilhões")
+        st.metric("% de Ativos Líquidos", f"{ativos_liquidos_pct:.1f}%")
+    
+    with col2:
+        st.metric("Depósitos Totais", f"£{(depositos_varejo + depositos_corporate)/1000:.1f} bilhões")
+        st.metric("% de Funding de Varejo", f"{depositos_varejo/total_passivos*100:.1f}%")
+        st.metric("% de Funding de Curto Prazo", f"{funding_curto/total_passivos*100:.1f}%")
+    
+    with col3:
+        st.metric("Liquidity Coverage Ratio", f"{lcr_pre:.1f}%")
+        st.metric("Net Stable Funding Ratio", f"{nsfr_pre:.1f}%")
+        
+        # Avaliar vulnerabilidade
+        if funding_curto/total_passivos > 0.4 and ativos_liquidos_pct < 25:
+            st.markdown("<span class='risk-high'>ALTA VULNERABILIDADE</span>", unsafe_allow_html=True)
+        elif funding_curto/total_passivos > 0.3 or ativos_liquidos_pct < 20:
+            st.markdown("<span class='risk-medium'>MÉDIA VULNERABILIDADE</span>", unsafe_allow_html=True)
+        else:
+            st.markdown("<span class='risk-low'>BAIXA VULNERABILIDADE</span>", unsafe_allow_html=True)
+    
+    # Definição de cenários de estresse
+    st.markdown("### Escolha de Cenários de Estresse")
+    
+    # Cenários lidos da biblioteca em arquivo (cenarios_balanco.csv)
+    cenarios = balance_sheet_scenarios()
+    
+    # Avaliação de toda a biblioteca de uma só vez
+    with st.expander(f"Biblioteca de cenários (versão {cenarios['versao']}, {len(cenarios['nome'])} cenários)"):
+        projecao_biblioteca = project_stress_liquidity(
+            hqla, depositos_varejo, depositos_corporate, funding_curto,
+            scenario_matrix(cenarios, PARAMETROS_CENARIO)
+        )
+        st.dataframe(pd.DataFrame({
+            'Cenário': cenarios['nome'],
+            'Total de Saídas (£ milhões)': projecao_biblioteca['total_saidas'].round(0),
+            'HQLA Ajustado (£ milhões)': projecao_biblioteca['hqla_ajustado'].round(0),
+            'Sobrevive': projecao_biblioteca['sobrevive'],
+            'Dias até Falha': np.where(projecao_biblioteca['sobrevive'], np.nan,
+                                       projecao_biblioteca['dias_sobrevivencia']).round(1)
+        }), hide_index=True)
+    
+    # Cenários pré-selecionados, apenas os que existem na biblioteca (o arquivo é editável)
+    padrao = [nome for nome in CENARIOS_ESTRESSE_PADRAO if nome in cenarios['indice']] or list(cenarios['nome'][:1])
+    selected_cenarios = st.multiselect(
+        "Selecione os cenários de estresse a simular:",
+        list(cenarios['nome']),
+        default=padrao
+    )
+    
+    # Dimensionamento do colchão: recalculado a cada ajuste dos parâmetros
+    st.markdown("### Dimensionamento do Colchão de HQLA")
+    st.markdown("""
+    Em vez de ajustar o HQLA manualmente, o otimizador calcula o menor colchão que sobrevive a todos os cenários
+    selecionados (ou a toda a biblioteca, se nenhum estiver selecionado) pelo horizonte escolhido, e a maior
+    participação de funding de curto prazo que o HQLA atual suporta, em troca de depósitos de varejo.
+    """)
+    
+    horizonte = st.slider("Horizonte de sobrevivência (dias)", 1, 90, HORIZONTE_PADRAO)
+    nomes_otimizacao = selected_cenarios or list(cenarios['nome'])
+    matriz_otimizacao = scenario_matrix(cenarios, PARAMETROS_CENARIO, nomes_otimizacao)
+    balanco = {
+        'hqla': hqla, 'depositos_varejo': depositos_varejo, 'depositos_corporate': depositos_corporate,
+        'funding_curto': funding_curto, 'funding_longo': funding_longo,
+    }
+    colchao = minimum_hqla(balanco, matriz_otimizacao, horizonte)
+    participacao = maximum_wholesale_share(balanco, matriz_otimizacao, horizonte)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if np.isfinite(colchao['hqla_minimo']):
+            st.metric("HQLA Mínimo", f"£{colchao['hqla_minimo']:,.0f} milhões",
+                      delta=f"{colchao['folga']:,.0f} de folga", delta_color="normal")
+            st.caption(f"Equivale a {colchao['hqla_minimo'] / total_ativos * 100:.1f}% do total de ativos")
+        else:
+            st.metric("HQLA Mínimo", "Inviável")
+    
+    with col2:
+        limitante = colchao['cenario_limitante']
+        st.metric("Cenário Limitante", nomes_otimizacao[limitante] if limitante is not None else "nenhum")
+    
+    with col3:
+        if np.isfinite(participacao['participacao_maxima']):
+            st.metric("Funding de Curto Prazo Máximo", f"{participacao['participacao_maxima']:.1f}% do passivo",
+                      delta=f"{participacao['participacao_maxima'] - participacao['participacao_atual']:.1f} p.p. vs. atual")
+        else:
+            st.metric("Funding de Curto Prazo Máximo", "Inviável")
+            st.caption("Nenhuma composição do passivo sobrevive com o HQLA atual")
+    
+    st.dataframe(pd.DataFrame({
+        'Cenário': nomes_otimizacao,
+        'HQLA Mínimo (£ milhões)': colchao['por_cenario'].round(0),
+        'Funding de Curto Prazo Mínimo (%)': participacao['inferior'].round(1),
+        'Funding de Curto Prazo Máximo (%)': participacao['superior'].round(1),
+    }), hide_index=True)
+    
+    if st.button("Executar Simulação de Estresse"):
+        if not selected_cenarios:
+            st.warning("Por favor, selecione pelo menos um cenário de estresse.")
+        else:
+            # Resultados da simulação
+            st.markdown("### Resultados da Simulação")
+            
+            # Projeção diária de todos os cenários selecionados em uma única matriz (cenários x dias)
+            projecao = project_stress_liquidity(
+                hqla, depositos_varejo, depositos_corporate, funding_curto,
+                scenario_matrix(cenarios, PARAMETROS_CENARIO, selected_cenarios)
             )
             
-            st.plotly_chart(fig, use_container_width=True)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-                st.markdown("""
-                #### Estratégias de Diversificação:
-                
-                1. **Diversificar tipos de instrumentos**
-                   - Depósitos (varejo, corporativos)
-                   - Dívida de curto e longo prazo
-                   - Securitização (com limites prudentes)
-                   - Covered bonds
-                
-                2. **Diversificar prazos de vencimento**
-                   - Escalonar vencimentos
-                   - Evitar concentração de vencimentos
-                
-                3. **Diversificar base de investidores**
-                   - Diferentes segmentos de mercado
-                   - Diferentes regiões geográficas
-                """)
-                st.markdown("</div>", unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown("<div class='warning-box'>", unsafe_allow_html=True)
-                st.markdown("""
-                #### Northern Rock - O que deu errado:
-                
-                Northern Rock apresentava diversas falhas na diversificação:
-                
-                1. **Concentração excessiva em securitização**
-                   - 45% do funding vinha de notas securitizadas
-                   - Apenas 23% de depósitos de varejo
-                
-                2. **Dependência do mercado atacadista**
-                   - Mais de 75% do funding vinha de fontes não-varejo
-                   - Vulnerabilidade a choques de liquidez no mercado
-                
-                3. **Modelo de crescimento insustentável**
-                   - Crescimento de ativos muito mais rápido que a base de depósitos
-                   - Aumento da dependência de mercados de capitais
-                """)
-                st.markdown("</div>", unsafe_allow_html=True)
-        
-        with tab4:
-            st.markdown("### 🧪 Stress Testing de Liquidez")
-            
-            st.markdown("""
-            Os testes de estresse de liquidez simulam cenários adversos para avaliar a capacidade do banco de 
-            resistir a choques de liquidez e identificar vulnerabilidades em sua estrutura de funding.
-            
-            #### Objetivo:
-            Avaliar a resiliência do banco sob diferentes cenários de estresse e garantir que tenha planos 
-            de contingência adequados para cada situação.
-            """)
+            st.plotly_chart(plot_stress_liquidity_projection(projecao, selected_cenarios), use_container_width=True)
             
-            st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-            st.markdown("""
-            #### Tipos de Cenários de Estresse:
-            
-            1. **Específicos da instituição**
-               - Downgrade de rating
-               - Rumores sobre solvência
-               - Perda de acesso a mercados específicos
-            
-            2. **Relacionados ao mercado**
-               - Crise de liquidez sistêmica
-               - Fechamento de mercados de capitais
-               - Aumento de volatilidade e custos de funding
-            
-            3. **Combinados**
-               - Cenários que combinam choque individual e de mercado
-               - Geralmente os mais severos e realistas
-            """)
-            st.markdown("</div>", unsafe_allow_html=True)
-            
-            # Simulador de stress test
-            st.markdown("#### Simulador de Stress Test")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("##### Parâmetros do Banco")
-                ativos_liquidos_stress = st.slider("Ativos Líquidos de Alta Qualidade (%)", 0, 100, 25)
-                wholesale_funding_stress = st.slider("Proporção de Funding Wholesale (%)", 0, 100, 60)
-            
-            with col2:
-                lcr_stress = calculate_lcr(ativos_liquidos_stress, wholesale_funding_stress * 0.3)
-                nsfr_stress = calculate_nsfr((100 - wholesale_funding_stress) + (wholesale_funding_stress * 0.5), (100 - ativos_liquidos_stress))
+            for i, cenario_nome in enumerate(selected_cenarios):
+                j = cenarios['indice'][cenario_nome]
                 
-                st.metric("Liquidity Coverage Ratio (LCR)", f"{lcr_stress:.1f}%")
-                st.metric("Net Stable Funding Ratio (NSFR)", f"{nsfr_stress:.1f}%")
-            
-            if st.button("Executar Testes de Estresse"):
-                stress_results = apply_stress_test(lcr_stress, nsfr_stress, ativos_liquidos_stress, wholesale_funding_stress)
+                st.markdown(f"#### {cenario_nome}")
+                st.markdown(f"*{cenarios['descricao'][j]}*")
                 
-                # Exibir resultados
-                st.markdown("##### Resultados dos Testes de Estresse")
+                col1, col2 = st.columns([2, 1])
                 
-                for scenario, results in stress_results.items():
-                    col1, col2, col3 = st.columns([3, 1, 1])
-                    
-                    with col1:
-                        st.markdown(f"**{scenario}**")
-                    
-                    with col2:
-                        if results["survived"]:
-                            st.markdown("✅ **APROVADO**")
-                        else:
-                            st.markdown("❌ **REPROVADO**")
-                    
-                    with col3:
-                        st.markdown(f"LCR: {results['new_lcr']:.1f}%")
-                    
-                    # Detalhes do cenário
+                with col1:
                     st.markdown(f"""
-                    - Ativos líquidos restantes: {results['liquid_assets_remaining']:.1f}%
-                    - NSFR após estresse: {results['new_nsfr']:.1f}%
+                    - Saída de depósitos de varejo: £{projecao['saida_dep_varejo'][i]/1000:.2f} bilhões ({cenarios["saida_varejo"][j]:g}%)
+                    - Saída de depósitos corporativos: £{projecao['saida_dep_corp'][i]/1000:.2f} bilhões ({cenarios["saida_corporate"][j]:g}%)
+                    - Não renovação de funding de curto prazo: £{projecao['nao_renovacao_curto'][i]/1000:.2f} bilhões ({cenarios["renovacao_curto"][j]:g}%)
+                    - **Total de saídas de caixa: £{projecao['total_saidas'][i]/1000:.2f} bilhões**
+                    - HQLA disponível (após haircuts): £{projecao['hqla_ajustado'][i]/1000:.2f} bilhões
                     """)
-                    st.markdown("---")
                 
-                # Recomendações baseadas nos resultados
-                failed_scenarios = sum(1 for r in stress_results.values() if not r["survived"])
+                with col2:
+                    if projecao['sobrevive'][i]:
+                        st.markdown(f"### ✅ SOBREVIVE")
+                    else:
+                        st.markdown(f"### ❌ FALHA")
+                        st.markdown(f"**Dias até falha: {projecao['dias_sobrevivencia'][i]:.1f}**")
                 
-                if failed_scenarios == 0:
-                    st.success("O banco apresenta boa resiliência em todos os cenários de estresse.")
-                elif failed_scenarios == 1:
-                    st.warning("O banco apresenta vulnerabilidade em um cenário de estresse. Considere reforçar seu colchão de liquidez.")
-                else:
-                    st.error(f"O banco apresenta vulnerabilidades em {failed_scenarios} cenários de estresse. É necessário reformular sua estrutura de funding e aumentar significativamente seu colchão de liquidez.")
-            
-            st.markdown("""
-            #### Implementação e Regulação:
-            
-            Os testes de estresse de liquidez tornaram-se obrigatórios sob Basileia III, como resposta direta à crise financeira de 2007-2008. 
-            Os reguladores agora exigem que os bancos realizem testes de estresse regulares e mantenham planos de contingência para diferentes cenários.
-            
-            #### Northern Rock - O que deu errado:
+                st.markdown("---")
             
-            O Northern Rock não realizava testes de estresse abrangentes que cobrissem cenários extremos, como o fechamento completo 
-            do mercado de securitização. O banco não estava preparado para um evento que de fato ocorreu - a paralisia do mercado 
-            interbancário e de securitização que começou em agosto de 2007.
-            """)
-        
-        with tab5:
-            st.markdown("### 📝 Política de Contingência de Liquidez")
-            
-            st.markdown("""
-            Um plano de contingência de liquidez estabelece antecipadamente as ações que serão tomadas em caso de crise, 
-            permitindo uma resposta rápida e coordenada quando o tempo é essencial.
-            
-            #### Objetivo:
-            Estabelecer um roteiro claro de ações para responder a uma crise de liquidez, minimizando o impacto e 
-            evitando decisões precipitadas em momentos de estresse.
-            """)
+            # Recomendações baseadas nos resultados
+            st.markdown("### Recomendações")
             
-            col1, col2 = st.columns(2)
+            failed_scenarios = int((~projecao['sobrevive']).sum())
             
-            with col1:
-                st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-                st.markdown("""
-                #### Componentes essenciais de um plano de contingência:
-                
-                1. **Indicadores de alerta precoce**
-                   - Gatilhos para ativar o plano
-                   - Indicadores de mercado
-                   - Métricas internas
+            if failed_scenarios == 0:
+                st.success("""
+                ✅ O banco demonstra boa resiliência em todos os cenários testados. Recomendações:
                 
-                2. **Estrutura clara de governança**
-                   - Comitê de crise
-                   - Papéis e responsabilidades
-                   - Processos de escalação
-                
-                3. **Opções de funding de emergência**
-                   - Linhas de crédito comprometidas
-                   - Ativos para venda/colateral
-                   - Acesso a facilidades do banco central
+                1. Manter o atual colchão de liquidez e mix de funding
+                2. Continuar monitorando os mercados para sinais de alerta precoce
+                3. Realizar testes de estresse com cenários ainda mais severos para identificar limites
+                """)
+            elif failed_scenarios < len(selected_cenarios):
+                st.warning(f"""
+                ⚠️ O banco falha em {failed_scenarios} dos {len(selected_cenarios)} cenários testados. Recomendações:
                 
-                4. **Estratégias de comunicação**
-                   - Comunicação com reguladores
-                   - Comunicação com investidores
-                   - Comunicação com o público
+                1. Aumentar o colchão de HQLA em pelo menos 20%
+                2. Reduzir gradualmente a dependência de funding de curto prazo
+                3. Diversificar as fontes de funding para reduzir concentrações
+                4. Revisar e fortalecer o plano de contingência de liquidez
                 """)
-                st.markdown("</div>", unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-                st.markdown("""
-                #### Níveis típicos de um plano de contingência:
+            else:
+                st.error(f"""
+                ❌ O banco falha em todos os {len(selected_cenarios)} cenários testados. Recomendações urgentes:
                 
-                **Nível 1: Alerta Inicial**
-                - Sinais de tensão no mercado
-                - Monitoramento intensificado
-                - Preparação de opções de funding
+                1. Reestruturar imediatamente o perfil de liquidez:
+                   - Aumentar HQLA em pelo menos 50%
+                   - Reduzir significativamente a dependência de funding de curto prazo
+                   - Aumentar a captação de depósitos estáveis de varejo
                 
-                **Nível 2: Tensão Elevada**
-                - Deterioração significativa nas condições de funding
-                - Ativação do comitê de crise
-                - Implementação de medidas preventivas
+                2. Desenvolver plano de contingência robusto com acesso a linhas de crédito comprometidas
                 
-                **Nível 3: Crise Severa**
-                - Acesso ao mercado seriamente comprometido
-                - Implementação completa do plano de emergência
-                - Consideração de medidas extraordinárias
+                3. Considerar redução do ritmo de crescimento para alinhar com fontes de funding sustentáveis
                 
-                **Nível 4: Sobrevivência**
-                - Ações drásticas para preservar liquidez
-                - Ativação de suporte do banco central
-                - Foco em operações essenciais
+                4. Implementar monitoramento diário de indicadores de liquidez com alertas precoces
                 """)
-                st.markdown("</div>", unsafe_allow_html=True)
-            
-            # Fluxograma simples de contingência
-            st.markdown("#### Fluxograma Simplificado de Contingência de Liquidez")
-            
-            # Dados para o fluxograma (usando um gráfico simples)
-            nodes = [
-                dict(name="Monitoramento", x=0, y=0.5),
-                dict(name="Detecção\nde Alerta", x=1, y=0.5),
-                dict(name="Avaliação\nda Situação", x=2, y=0.5),
-                dict(name="Ativação do\nComitê de Crise", x=3, y=0.5),
-                dict(name="Implementação\nde Medidas", x=4, y=0.5),
-                dict(name="Resolução\nou Crise", x=5, y=0.5)
-            ]
-            
-            edges = [
-                dict(source=0, target=1),
-                dict(source=1, target=2),
-                dict(source=2, target=3),
-                dict(source=3, target=4),
-                dict(source=4, target=5),
-                dict(source=5, target=0, line=dict(dash="dash"))
-            ]
-            
-            # Criar o gráfico
-            fig = go.Figure()
-            
-            # Adicionar nós
-            for node in nodes:
-                fig.add_trace(go.Scatter(
-                    x=[node["x"]], 
-                    y=[node["y"]],
-                    mode="markers+text",
-                    marker=dict(size=30, color="rgba(37, 99, 235, 0.8)"),
-                    text=node["name"],
-                    textposition="top center",
-                    hoverinfo="text",
-                    name=""
-                ))
-            
-            # Adicionar arestas
-            for edge in edges:
-                source = nodes[edge["source"]]
-                target = nodes[edge["target"]]
-                
-                line_props = edge.get("line", dict())
-                default_line = dict(width=2, color="rgba(0, 0, 0, 0.5)")
-                line = {**default_line, **line_props}
-                
-                fig.add_trace(go.Scatter(
-                    x=[source["x"], target["x"]],
-                    y=[source["y"], target["y"]],
-                    mode="lines",
-                    line=line,
-                    hoverinfo="none",
-                    showlegend=False
-                ))
-            
-            fig.update_layout(
-                title="Processo de Contingência de Liquidez",
-                showlegend=False,
-                xaxis=dict(
-                    showgrid=False,
-                    zeroline=False,
-                    showticklabels=False
-                ),
-                yaxis=dict(
-                    showgrid=False,
-                    zeroline=False,
-                    showticklabels=False
-                ),
-                height=250,
-                margin=dict(l=20, r=20, t=50, b=20)
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+    
+    # Teste de estresse reverso: quais choques quebram o banco?
+    st.markdown("### Teste de Estresse Reverso")
+    
+    st.markdown("""
+    Em vez de partir de cenários pré-definidos, o teste de estresse reverso parte do resultado: quais
+    combinações de saída de depósitos de varejo, saída wholesale (depósitos corporativos e não renovação
+    do funding de curto prazo) e haircut sobre o HQLA levam o banco a quebrar? O banco quebra quando o HQLA
+    após o haircut não cobre as saídas ou quando o LCR remanescente fica abaixo do limite escolhido.
+    """)
+    
+    limite_lcr = st.slider("LCR mínimo após o estresse (%)", 0, 100, LIMITE_LCR_POS)
+    
+    if st.button("Calcular Fronteira de Quebra"):
+        balanco = {
+            'hqla': hqla,
+            'depositos_varejo': depositos_varejo,
+            'depositos_corporate': depositos_corporate,
+            'funding_curto': funding_curto,
+        }
+        resultado = reverse_stress_test(balanco, limite_lcr)
+        
+        if resultado['quebra_sem_estresse']:
+            st.error(f"""
+            ❌ O banco já não atende ao critério sem nenhum choque: o LCR atual ({lcr_pre:.1f}%) está abaixo
+            do mínimo de {limite_lcr}%. Reduza o limite ou reforce o HQLA para analisar a fronteira.
+            """)
+        elif resultado['indice_minimo'] is None:
+            st.success("✅ Nenhuma combinação de choques (até 100% em cada dimensão) quebra o banco.")
+        else:
+            minimo = resultado['fronteira'][resultado['indice_minimo']]
             
+            st.markdown("#### Combinação Mínima de Quebra")
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Saída de Varejo", f"{minimo[0]:.1f}%")
+            col2.metric("Saída Wholesale", f"{minimo[1]:.1f}%")
+            col3.metric("Haircut de HQLA", f"{minimo[2]:.1f}%")
+            col4.metric("Soma dos Choques", f"{resultado['severidade'][resultado['indice_minimo']]:.1f}%")
             
-            st.markdown("""
-            #### Testes e atualizações regulares:
+            st.plotly_chart(plot_reverse_stress_frontier(resultado), use_container_width=True)
             
-            O plano de contingência de liquidez deve ser testado regularmente através de exercícios de simulação 
-            e atualizado para refletir mudanças no ambiente de mercado e na estrutura do banco.
+            df_fronteira = pd.DataFrame(resultado['fronteira'], columns=list(DIMENSOES_ESTRESSE))
+            df_fronteira['Soma dos Choques (%)'] = resultado['severidade']
+            df_fronteira = df_fronteira.dropna().sort_values('Soma dos Choques (%)')
             
-            #### Northern Rock - O que deu errado:
+            st.markdown("#### Combinações de Quebra Mais Próximas")
+            st.dataframe(df_fronteira.head(10).round(1), hide_index=True)
             
-            O Northern Rock não possuía um plano de contingência adequado para lidar com o fechamento do mercado 
-            de securitização. Quando a crise eclodiu, o banco não tinha opções viáveis além de buscar o apoio 
-            emergencial do Banco da Inglaterra, o que acabou precipitando a corrida bancária.
+            st.markdown(f"""
+            Pontos da fronteira com soma de choques pequena indicam as vulnerabilidades mais plausíveis.
+            Das {len(resultado['direcoes'])} direções analisadas, {int((~resultado['quebra_encontrada']).sum())}
+            não levam à quebra mesmo com choques de 100%.
             """)
     
-    elif menu == "Stress Testing de Liquidez":
-        st.markdown("## 🧪 Simulador de Stress Testing de Liquidez")
-        
-        st.markdown("""
-        Este módulo permite simular diferentes cenários de estresse e avaliar o impacto no perfil de liquidez de um banco. 
-        Configure os parâmetros do banco e escolha os cenários de estresse para avaliar sua resiliência.
-        """)
-        
-        # Configuração do banco
-        st.markdown("### Configuração do Banco")
-
+    # Visão de grupo: todas as entidades avaliadas em todos os cenários de uma só vez
+    st.markdown("### Visão de Grupo: Múltiplas Entidades")
+    
+    st.markdown("""
+    Para grupos com muitas entidades legais ou agências, a tesouraria precisa triar todas de uma vez. Envie um
+    arquivo CSV com as colunas `entidade`, `regiao` (opcional), `ativos_liquidos_pct`, `hqla`, `depositos_varejo`,
+    `depositos_corporate`, `funding_curto` e `funding_longo`, ou utilize um grupo sintético.
+    """)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        arquivo_entidades = st.file_uploader("Arquivo de entidades (CSV)", type="csv", key="arquivo_entidades")
+        n_entidades = st.slider("Número de entidades do grupo sintético", 10, 1000, 200,
+                                disabled=arquivo_entidades is not None)
+    
+    with col2:
+        cenarios_grupo = st.multiselect(
+            "Cenários da visão de grupo:",
+            list(cenarios['nome']),
+            default=list(cenarios['nome']),
+            key="cenarios_grupo"
+        )
+    
+    try:
+        entidades = load_entities(arquivo_entidades) if arquivo_entidades is not None else generate_sample_entities(n_entidades)
+        tabela_grupo = screen_entities(entidades, cenarios, cenarios_grupo)
+    except (ValueError, KeyError) as e:
+        st.error(f"Não foi possível processar o arquivo de entidades: {e}")
+        tabela_grupo = None
+    
+    if tabela_grupo is not None:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            ativos_liquidos_pct = st.slider("Ativos Líquidos (%)", 0, 100, 20)
-            hqla = st.slider("Dos quais são HQLA (£ milhões)", 0, 20000, 3000)
+            apenas_falhas = st.checkbox("Apenas entidades que falham em algum cenário")
+            lcr_maximo = st.slider("LCR pré-estresse máximo (%)", 0, 500, 500,
+                                   help="No valor máximo (500%) não há limite: entram também LCRs acima de 500% ou infinitos")
         
         with col2:
-            depositos_varejo = st.slider("Depósitos de Varejo (£ milhões)", 0, 50000, 15000)
-            depositos_corporate = st.slider("Depósitos Corporativos (£ milhões)", 0, 30000, 5000)
+            if 'Região' in tabela_grupo.columns:
+                regioes = st.multiselect("Regiões", sorted(tabela_grupo['Região'].unique()), key="regioes_grupo")
+            else:
+                regioes = []
         
         with col3:
-            funding_curto = st.slider("Funding de Curto Prazo (£ milhões)", 0, 50000, 25000)
-            funding_longo = st.slider("Funding de Longo Prazo (£ milhões)", 0, 50000, 15000)
-        
-        # Total de ativos e passivos
-        total_passivos = depositos_varejo + depositos_corporate + funding_curto + funding_longo
-        total_ativos = total_passivos  # Assumindo balanço equilibrado
-        ativos_liquidos = total_ativos * (ativos_liquidos_pct / 100)
-        ativos_iliquidos = total_ativos - ativos_liquidos
+            ordenar_por = st.selectbox("Ordenar por", list(tabela_grupo.columns),
+                                       index=list(tabela_grupo.columns).index('Menor Sobrevivência (dias)'))
+            crescente = st.checkbox("Ordem crescente", value=True)
         
-        # Cálculo de métricas-chave
-        lcr_pre = (hqla / (funding_curto * 0.5 + depositos_varejo * 0.1 + depositos_corporate * 0.2)) * 100
-        nsfr_pre = ((depositos_varejo * 0.9 + depositos_corporate * 0.5 + funding_longo * 0.8) / (ativos_iliquidos * 0.85 + ativos_liquidos * 0.15)) * 100
+        # O máximo do slider significa "sem limite" (inclui LCR infinito, sem saídas)
+        filtro = pd.Series(True, index=tabela_grupo.index)
+        if lcr_maximo < 500:
+            filtro &= tabela_grupo['LCR Pré-Estresse (%)'] <= lcr_maximo
+        if apenas_falhas:
+            filtro &= tabela_grupo['Cenários com Falha'] > 0
+        if regioes:
+            filtro &= tabela_grupo['Região'].isin(regioes)
         
-        # Exibir resumo do banco
-        st.markdown("### Resumo do Perfil de Liquidez")
+        tabela_filtrada = tabela_grupo[filtro].sort_values(ordenar_por, ascending=crescente)
         
         col1, col2, col3 = st.columns(3)
+        col1.metric("Entidades", f"{len(tabela_grupo)}")
+        col2.metric("Com falha em algum cenário", f"{(tabela_grupo['Cenários com Falha'] > 0).sum()}")
+        col3.metric("LCR pré-estresse abaixo de 100%", f"{(tabela_grupo['LCR Pré-Estresse (%)'] < 100).sum()}")
         
-        with col1:
-            st.metric("Total de Ativos", f"£{total_ativos/1000:.1f} bilhões")
-            st.metric("Ativos Líquidos", f"£{ativos_liquidos/1000:.1f} bilhões")
-            st.metric("% de Ativos Líquidos", f"{ativos_liquidos_pct:.1f}%")
-        
-        with col2:
-            st.metric("Depósitos Totais", f"£{(depositos_varejo + depositos_corporate)/1000:.1f} bilhões")
-            st.metric("% de Funding de Varejo", f"{depositos_varejo/total_passivos*100:.1f}%")
-            st.metric("% de Funding de Curto Prazo", f"{funding_curto/total_passivos*100:.1f}%")
-        
-        with col3:
-            st.metric("Liquidity Coverage Ratio", f"{lcr_pre:.1f}%")
-            st.metric("Net Stable Funding Ratio", f"{nsfr_pre:.1f}%")
-            
-            # Avaliar vulnerabilidade
-            if funding_curto/total_passivos > 0.4 and ativos_liquidos_pct < 25:
-                st.markdown("<span class='risk-high'>ALTA VULNERABILIDADE</span>", unsafe_allow_html=True)
-            elif funding_curto/total_passivos > 0.3 or ativos_liquidos_pct < 20:
-                st.markdown("<span class='risk-medium'>MÉDIA VULNERABILIDADE</span>", unsafe_allow_html=True)
+        st.dataframe(tabela_filtrada.round(1), hide_index=True)
+
+def page_interbank_contagion():
+    """Página do simulador de contágio interbancário"""
+    # Importação tardia: scipy.sparse só é carregado quando o módulo é aberto
+    from interbank_network import COLUNAS_BANCO, generate_sample_network, load_network, simulate_contagion
+    
+    st.markdown("## 🕸️ Simulador de Contágio Interbancário")
+    
+    st.markdown("""
+    A falha do Northern Rock foi uma história de contágio via funding wholesale: quando o mercado interbancário
+    secou, bancos que dependiam dele ficaram sem liquidez. Este módulo simula uma rede de bancos ligados por
+    empréstimos interbancários e propaga um choque inicial por dois canais:
+    
+    - **Solvência (Eisenberg-Noe)**: perdas nos ativos dos bancos atingidos reduzem o que eles conseguem pagar
+      aos credores na rede, o que pode levar outros bancos à inadimplência.
+    - **Liquidez**: bancos em estresse retiram o funding concedido aos seus devedores, pressionando o LCR
+      destes, que por sua vez podem entrar em estresse e retirar funding na rodada seguinte.
+    """)
+    
+    st.markdown("### Rede Interbancária")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        arquivo_bancos = st.file_uploader(f"Tabela de bancos (CSV com {', '.join(COLUNAS_BANCO)})", type="csv", key="arquivo_bancos")
+        arquivo_exposicoes = st.file_uploader("Exposições bilaterais (CSV com devedor, credor, valor ou matriz .npz)",
+                                              type=["csv", "npz"], key="arquivo_exposicoes")
+    
+    usar_arquivos = arquivo_bancos is not None and arquivo_exposicoes is not None
+    
+    with col2:
+        n_bancos = st.select_slider("Número de bancos da rede sintética", options=[100, 1000, 10000, 50000],
+                                    value=1000, disabled=usar_arquivos)
+        grau_medio = st.slider("Número médio de contrapartes por banco", 2, 20, 8, disabled=usar_arquivos)
+    
+    st.markdown("### Choque Inicial")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        n_choque = st.slider("Bancos atingidos (os maiores da rede)", 1, 20, 5)
+    
+    with col2:
+        choque_ativos = st.slider("Perda nos ativos ilíquidos dos bancos atingidos (%)", 0, 100, 30)
+    
+    with col3:
+        taxa_retirada = st.slider("Retirada de funding pelos bancos em estresse (%)", 0, 100, 50)
+    
+    limite_lcr = st.slider("LCR abaixo do qual o banco entra em estresse (%)", 50, 200, 100)
+    
+    if st.button("Simular Contágio"):
+        try:
+            if usar_arquivos:
+                bancos, exposicoes = load_network(arquivo_bancos, arquivo_exposicoes)
             else:
-                st.markdown("<span class='risk-low'>BAIXA VULNERABILIDADE</span>", unsafe_allow_html=True)
-        
-        # Definição de cenários de estresse
-        st.markdown("### Escolha de Cenários de Estresse")
-        
-        cenarios = {
-            "Crise de Liquidez Moderada": {
-                "descricao": "Tensão nos mercados de funding de curto prazo com algum impacto nos depósitos",
-                "saida_varejo": 10,  # % de saída
-                "saida_corporate": 20,
-                "renovacao_curto": 50,  # % de não renovação
-                "impacto_hqla": 5,  # % de haircut
-                "duracao": 30  # dias
-            },
-            "Corrida Bancária": {
-                "descricao": "Saída intensa de depósitos de varejo e corporativos com perda de confiança na instituição",
-                "saida_varejo": 30,
-                "saida_corporate": 40,
-                "renovacao_curto": 80,
-                "impacto_hqla": 10,
-                "duracao": 14
-            },
-            "Crise Sistêmica": {
-                "descricao": "Fechamento dos mercados de funding, corrida bancária e desvalorização de ativos",
-                "saida_varejo": 20,
-                "saida_corporate": 50,
-                "renovacao_curto": 90,
-                "impacto_hqla": 15,
-                "duracao": 60
-            },
-            "Cenário Northern Rock (2007)": {
-                "descricao": "Fechamento do mercado de securitização, seguido de corrida bancária",
-                "saida_varejo": 25,
-                "saida_corporate": 35,
-                "renovacao_curto": 95,
-                "impacto_hqla": 5,
-                "duracao": 30
-            }
-        }
-        
-        selected_cenarios = st.multiselect(
-            "Selecione os cenários de estresse a simular:",
-            list(cenarios.keys()),
-            default=["Crise de Liquidez Moderada", "Cenário Northern Rock (2007)"]
-        )
-        
-        if st.button("Executar Simulação de Estresse"):
-            if not selected_cenarios:
-                st.warning("Por favor, selecione pelo menos um cenário de estresse.")
+                bancos, exposicoes = generate_sample_network(n_bancos, grau_medio)
+        except (ValueError, KeyError) as e:
+            st.error(f"Não foi possível carregar a rede: {e}")
+        else:
+            porte = (bancos['hqla'] + bancos['ativos_iliquidos']).to_numpy()
+            bancos_choque = np.argsort(-porte)[:n_choque]
+            resultado = simulate_contagion(bancos, exposicoes, bancos_choque, choque_ativos, taxa_retirada, limite_lcr)
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Bancos na Rede", f"{len(bancos):,}")
+            col2.metric("Inadimplentes (Eisenberg-Noe)", f"{resultado['inadimplente'].sum():,}")
+            col3.metric("Em Estresse de Liquidez", f"{resultado['estresse_liquidez'].sum():,}")
+            col4.metric("Sem HQLA para as Saídas", f"{resultado['falha_liquidez'].sum():,}")
+            
+            st.markdown(f"""
+            O contágio de liquidez se propagou por **{resultado['n_rodadas']} rodadas** de retirada de funding.
+            As perdas dos credores interbancários somam **{resultado['perda_credores'].sum():,.1f}**
+            ({resultado['perda_credores'].sum() / max(resultado['passivo_interbancario'].sum(), 1e-12) * 100:.1f}%
+            das exposições da rede), e o vetor de compensação convergiu em {resultado['iteracoes_compensacao']} iterações.
+            """)
+            
+            fig_rodadas, fig_lcr = plot_contagion_results(resultado)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.plotly_chart(fig_rodadas, use_container_width=True)
+            with col2:
+                st.plotly_chart(fig_lcr, use_container_width=True)
+            
+            df_bancos = pd.DataFrame({
+                'Banco': bancos['banco'] if 'banco' in bancos.columns else bancos.index,
+                'Funding Retirado': resultado['retiradas'],
+                'LCR Antes (%)': resultado['lcr_pre'],
+                'LCR Depois (%)': resultado['lcr_pos'],
+                'NSFR Antes (%)': resultado['nsfr_pre'],
+                'NSFR Depois (%)': resultado['nsfr_pos'],
+                'Inadimplente': resultado['inadimplente'],
+                'Rodada do Estresse': np.where(resultado['rodada_estresse'] >= 0, resultado['rodada_estresse'], np.nan)
+            })
+            
+            st.markdown("#### Bancos Mais Afetados pela Retirada de Funding")
+            st.dataframe(df_bancos.nlargest(20, 'Funding Retirado').round(1), hide_index=True)
+
+def page_intraday_liquidity():
+    """Página do simulador de liquidez intradiária"""
+    st.markdown("## ⏱️ Simulador de Liquidez Intradiária")
+    
+    st.markdown("""
+    As métricas de liquidez dos demais módulos são diárias, mas os pagamentos são liquidados ao longo do dia.
+    Um banco pode ter liquidez suficiente no fechamento e, ainda assim, não conseguir honrar pagamentos no meio
+    do dia, se as saídas vierem antes das entradas. Este módulo reproduz um sistema de liquidação bruta em tempo
+    real (LBTR):
+    
+    - Cada pagamento é liquidado na chegada se o pagador tem **saldo mais crédito intradiário** suficientes;
+      caso contrário, entra na **fila** do pagador, ordenada por prioridade e horário de chegada.
+    - Cada crédito recebido tenta liberar a fila do recebedor, o que pode liberar outras filas em cadeia.
+    - Periodicamente, um algoritmo de **compensação multilateral** resolve os gridlocks, liquidando de uma só vez
+      conjuntos de pagamentos que se cobrem mutuamente.
+    """)
+    
+    st.markdown("### Pagamentos do Dia")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        arquivo_pagamentos = st.file_uploader(f"Pagamentos (CSV com {', '.join(COLUNAS_PAGAMENTOS)} e, opcionalmente, prioridade)",
+                                              type="csv", key="arquivo_pagamentos",
+                                              help="horario em segundos desde a meia-noite ou no formato HH:MM ou HH:MM:SS")
+        arquivo_participantes = st.file_uploader(f"Participantes (CSV com {', '.join(COLUNAS_PARTICIPANTES)}; opcional)",
+                                                 type="csv", key="arquivo_participantes")
+    
+    with col2:
+        n_pagamentos = st.select_slider("Número de pagamentos do dia sintético",
+                                        options=[10_000, 100_000, 1_000_000], value=100_000,
+                                        disabled=arquivo_pagamentos is not None)
+        liquidez_inicial = st.slider("Saldo inicial de reservas (% do valor enviado no dia)", 1, 20, 5,
+                                     disabled=arquivo_pagamentos is not None)
+        intervalo_gridlock = st.slider("Intervalo entre resoluções de gridlock (minutos)", 1, 120, 15)
+    
+    if arquivo_pagamentos is None:
+        st.info("Sem arquivo de pagamentos, é usado um dia sintético com 100 participantes de portes variados.")
+    elif arquivo_participantes is None:
+        st.info("Sem arquivo de participantes, todos começam com saldo zero e crédito ilimitado: o pico de uso "
+                "de liquidez mostra a necessidade de liquidez de cada participante.")
+    
+    if st.button("Simular Dia de Liquidação"):
+        try:
+            if arquivo_pagamentos is not None:
+                pagamentos, participantes = load_payments(arquivo_pagamentos, arquivo_participantes)
             else:
-                # Resultados da simulação
-                st.markdown("### Resultados da Simulação")
-                
-                for cenario_nome in selected_cenarios:
-                    cenario = cenarios[cenario_nome]
-                    
-                    st.markdown(f"#### {cenario_nome}")
-                    st.markdown(f"*{cenario['descricao']}*")
-                    
-                    # Calcular impactos
-                    saida_dep_varejo = depositos_varejo * (cenario["saida_varejo"] / 100)
-                    saida_dep_corp = depositos_corporate * (cenario["saida_corporate"] / 100)
-                    nao_renovacao_curto = funding_curto * (cenario["renovacao_curto"] / 100)
-                    
-                    total_saidas = saida_dep_varejo + saida_dep_corp + nao_renovacao_curto
-                    hqla_ajustado = hqla * (1 - cenario["impacto_hqla"] / 100)
-                    
-                    # Verificar sobrevivência
-                    sobrevive = hqla_ajustado >= total_saidas
-                    dias_sobrevivencia = min(cenario["duracao"], (hqla_ajustado / total_saidas) * cenario["duracao"])
-                    
-                    # Métricas pós-estresse
-                    lcr_pos = ((hqla_ajustado - total_saidas) / ((funding_curto - nao_renovacao_curto) * 0.5 + 
-                                                              (depositos_varejo - saida_dep_varejo) * 0.1 + 
-                                                              (depositos_corporate - saida_dep_corp) * 0.2)) * 100 if not sobrevive else 0
-                    
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        st.markdown(f"""
-                        - Saída de depósitos de varejo: £{saida_dep_varejo/1000:.2f} bilhões ({cenario["saida_varejo"]}%)
-                        - Saída de depósitos corporativos: £{saida_dep_corp/1000:.2f} bilhões ({cenario["saida_corporate"]}%)
-                        - Não renovação de funding de curto prazo: £{nao_renovacao_curto/1000:.2f} bilhões ({cenario["renovacao_curto"]}%)
-                        - **Total de saídas de caixa: £{total_saidas/1000:.2f} bilhões**
-                        - HQLA disponível (após haircuts): £{hqla_ajustado/1000:.2f} bilhões
-                        """)
-                    
-                    with col2:
-                        if sobrevive:
-                            st.markdown(f"### ✅ SOBREVIVE")
-                        else:
-                            st.markdown(f"### ❌ FALHA")
-                            st.markdown(f"**Dias até falha: {dias_sobrevivencia:.1f}**")
-                    
-                    # Gráfico de evolução da liquidez durante o estresse
-                    dias = list(range(cenario["duracao"] + 1))
-                    liquidez_diaria = []
-                    
-                    liquidez_atual = hqla_ajustado
-                    saida_diaria = total_saidas / cenario["duracao"]
-                    
-                    for _ in dias:
-                        liquidez_diaria.append(max(0, liquidez_atual))
-                        liquidez_atual -= saida_diaria
-                    
-                    # Criar dataframe
-                    df_evolucao = pd.DataFrame({
-                        'Dia': dias,
-                        'Liquidez Disponível': liquidez_diaria
-                    })
-                    
-                    # Gráfico
-                    fig = px.line(
-                        df_evolucao,
-                        x='Dia',
-                        y='Liquidez Disponível',
-                        title=f'Evolução da Liquidez - {cenario_nome}',
-                        labels={'Liquidez Disponível': 'Milhões £'}
-                    )
-                    
-                    # Adicionar linha de falha se aplicável
-                    if not sobrevive:
-                        fig.add_shape(
-                            type="line",
-                            x0=dias_sobrevivencia,
-                            y0=0,
-                            x1=dias_sobrevivencia,
-                            y1=hqla_ajustado,
-                            line=dict(
-                                color="Red",
-                                width=3,
-                                dash="dash",
-                            )
-                        )
-                        
-                        fig.add_annotation(
-                            x=dias_sobrevivencia,
-                            y=hqla_ajustado / 2,
-                            text=f"Falha no dia {dias_sobrevivencia:.1f}",
-                            showarrow=True,
-                            arrowhead=1,
-                        )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    st.markdown("---")
-                
-                # Recomendações baseadas nos resultados
-                st.markdown("### Recomendações")
-                
-                failed_scenarios = sum(1 for sc in selected_cenarios if not cenarios[sc]["saida_varejo"] * depositos_varejo / 100 + 
-                                       cenarios[sc]["saida_corporate"] * depositos_corporate / 100 + 
-                                       cenarios[sc]["renovacao_curto"] * funding_curto / 100 <= 
-                                       hqla * (1 - cenarios[sc]["impacto_hqla"] / 100))
-                
-                if failed_scenarios == 0:
-                    st.success("""
-                    ✅ O banco demonstra boa resiliência em todos os cenários testados. Recomendações:
-                    
-                    1. Manter o atual colchão de liquidez e mix de funding
-                    2. Continuar monitorando os mercados para sinais de alerta precoce
-                    3. Realizar testes de estresse com cenários ainda mais severos para identificar limites
-                    """)
-                elif failed_scenarios < len(selected_cenarios):
-                    st.warning(f"""
-                    ⚠️ O banco falha em {failed_scenarios} dos {len(selected_cenarios)} cenários testados. Recomendações:
-                    
-                    1. Aumentar o colchão de HQLA em pelo menos 20%
-                    2. Reduzir gradualmente a dependência de funding de curto prazo
-                    3. Diversificar as fontes de funding para reduzir concentrações
-                    4. Revisar e fortalecer o plano de contingência de liquidez
-                    """)
-                else:
-                    st.error(f"""
-                    ❌ O banco falha em todos os {len(selected_cenarios)} cenários testados. Recomendações urgentes:
-                    
-                    1. Reestruturar imediatamente o perfil de liquidez:
-                       - Aumentar HQLA em pelo menos 50%
-                       - Reduzir significativamente a dependência de funding de curto prazo
-                       - Aumentar a captação de depósitos estáveis de varejo
-                    
-                    2. Desenvolver plano de contingência robusto com acesso a linhas de crédito comprometidas
-                    
-                    3. Considerar redução do ritmo de crescimento para alinhar com fontes de funding sustentáveis
-                    
-                    4. Implementar monitoramento diário de indicadores de liquidez com alertas precoces
-                    """)
+                pagamentos, participantes = generate_sample_payments(n_pagamentos, 100, liquidez_inicial / 100)
+            resultado = simulate_intraday(pagamentos, participantes, intervalo_gridlock * 60)
+        except (ValueError, KeyError) as e:
+            st.error(f"Não foi possível carregar os pagamentos: {e}")
+        else:
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Pagamentos", f"{resultado['n_pagamentos']:,}")
+            col2.metric("Liquidados", f"{resultado['n_liquidados'] / max(resultado['n_pagamentos'], 1) * 100:.1f}%")
+            col3.metric("Valor Liquidado", f"{resultado['valor_liquidado'] / max(resultado['valor_total'], 1e-12) * 100:.1f}%")
+            col4.metric("Gridlocks Resolvidos", f"{resultado['n_gridlocks']}")
+            
+            st.caption(f"Simulação em {resultado['tempo_processamento']:.2f} s "
+                       f"({resultado['eventos_por_minuto']:,.0f} pagamentos por minuto).")
+            
+            fig_pico, fig_atraso = plot_intraday_results(resultado)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.plotly_chart(fig_pico, use_container_width=True)
+            with col2:
+                st.plotly_chart(fig_atraso, use_container_width=True)
+            
+            st.markdown("#### Uso de Liquidez por Participante")
+            st.dataframe(resultado['por_participante'].sort_values('Pico de Uso de Liquidez', ascending=False).round(2),
+                         hide_index=True)
+
+def page_about():
+    """Página sobre o aplicativo, referências e limitações"""
+    st.markdown("## ℹ️ Sobre este Aplicativo")
     
-    elif menu == "Sobre o Aplicativo":
-        st.markdown("## ℹ️ Sobre este Aplicativo")
-        
-        st.markdown("""
-        ### Objetivo Pedagógico
-        
-        Este aplicativo foi desenvolvido com finalidade educacional, para ilustrar os conceitos de risco de liquidez
-        bancária utilizando o caso histórico do Northern Rock como exemplo. O objetivo é proporcionar uma compreensão
-        prática dos mecanismos que levam a crises de liquidez e das estratégias para mitigá-las.
-        
-        ### Funcionalidades
-        
-        - **Contextualização histórica** do caso Northern Rock
-        - **Simulador de balanço e risco** que permite experimentar diferentes configurações
-        - **Simulador de stress testing** para avaliar a resistência a cenários adversos
-        - **Explicações detalhadas** sobre técnicas de gestão de risco de liquidez
-        
-        ### Referências
-        
-        Este aplicativo é baseado em fontes acadêmicas e regulatórias, incluindo:
-        
-        - Shin, H. S. (2009). Reflections on Northern Rock: The Bank Run that Heralded the Global Financial Crisis. Journal of Economic Perspectives, 23(1), 101-119.
-        - Basel Committee on Banking Supervision. (2013). Basel III: The Liquidity Coverage Ratio and liquidity risk monitoring tools.
-        - Basel Committee on Banking Supervision. (2014). Basel III: The Net Stable Funding Ratio.
-        - Bank of England. (2007-2008). Financial Stability Reports.
-        
-        ### Limitações
-        
-        Este simulador é uma simplificação da realidade bancária e não deve ser utilizado para decisões reais de gestão
-        de risco. Os modelos apresentados são ilustrativos e objetivam o entendimento conceitual, não a precisão absoluta.
-        """)
-        
-        st.markdown("<div class='reference-box'>", unsafe_allow_html=True)
-        st.markdown("""
-        ### Lições da Crise Financeira Global
-        
-        A quebra do Northern Rock foi apenas o primeiro episódio de uma crise financeira global muito mais ampla.
-        Entre as principais lições aprendidas estão:
-        
-        1. A importância de uma regulação bancária que considere o risco de liquidez, não apenas o risco de crédito
-        
-        2. A necessidade de limites para descasamentos excessivos de prazos entre ativos e passivos
-        
-        3. Os perigos de modelos de crescimento acelerado baseados em funding de mercado
-        
-        4. A facilidade com que crises de confiança podem se espalhar no sistema financeiro
-        
-        5. O papel crucial de colchões de liquidez adequados e planos de contingência robustos
-        """)
-        st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("""
+    ### Objetivo Pedagógico
+    
+    Este aplicativo foi desenvolvido com finalidade educacional, para ilustrar os conceitos de risco de liquidez
+    bancária utilizando o caso histórico do Northern Rock como exemplo. O objetivo é proporcionar uma compreensão
+    prática dos mecanismos que levam a crises de liquidez e das estratégias para mitigá-las.
+    
+    ### Funcionalidades
+    
+    - **Contextualização histórica** do caso Northern Rock
+    - **Simulador de balanço e risco** que permite experimentar diferentes configurações
+    - **Simulador de stress testing** para avaliar a resistência a cenários adversos, com dimensionamento do colchão de HQLA
+    - **Simulador de contágio interbancário** para avaliar a propagação de choques na rede de funding
+    - **Simulador de liquidez intradiária** que reproduz a liquidação de pagamentos ao longo do dia
+    - **Explicações detalhadas** sobre técnicas de gestão de risco de liquidez
+    
+    ### Referências
+    
+    Este aplicativo é baseado em fontes acadêmicas e regulatórias, incluindo:
+    
+    - Shin, H. S. (2009). Reflections on Northern Rock: The Bank Run that Heralded the Global Financial Crisis. Journal of Economic Perspectives, 23(1), 101-119.
+    - Basel Committee on Banking Supervision. (2013). Basel III: The Liquidity Coverage Ratio and liquidity risk monitoring tools.
+    - Basel Committee on Banking Supervision. (2014). Basel III: The Net Stable Funding Ratio.
+    - Bank of England. (2007-2008). Financial Stability Reports.
+    
+    ### Limitações
+    
+    Este simulador é uma simplificação da realidade bancária e não deve ser utilizado para decisões reais de gestão
+    de risco. Os modelos apresentados são ilustrativos e objetivam o entendimento conceitual, não a precisão absoluta.
+    """)
+    
+    st.markdown("<div class='reference-box'>", unsafe_allow_html=True)
+    st.markdown("""
+    ### Lições da Crise Financeira Global
+    
+    A quebra do Northern Rock foi apenas o primeiro episódio de uma crise financeira global muito mais ampla.
+    Entre as principais lições aprendidas estão:
+    
+    1. A importância de uma regulação bancária que considere o risco de liquidez, não apenas o risco de crédito
+    
+    2. A necessidade de limites para descasamentos excessivos de prazos entre ativos e passivos
+    
+    3. Os perigos de modelos de crescimento acelerado baseados em funding de mercado
+    
+    4. A facilidade com que crises de confiança podem se espalhar no sistema financeiro
+    
+    5. O papel crucial de colchões de liquidez adequados e planos de contingência robustos
+    """)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# Páginas do menu, na ordem de exibição
+PAGINAS = {
+    "Introdução ao Risco de Liquidez": page_introduction,
+    "O Caso Northern Rock": page_northern_rock,
+    "Simulador de Balanço e Risco": page_balance_simulator,
+    "Técnicas de Gestão de Risco": page_risk_techniques,
+    "Stress Testing de Liquidez": page_stress_testing,
+    "Contágio Interbancário": page_interbank_contagion,
+    "Liquidez Intradiária": page_intraday_liquidity,
+    "Sobre o Aplicativo": page_about,
+}
+
+# Aplicativo principal
+def main():
+    add_logo_and_styling()
+    
+    # Cabeçalho principal
+    st.markdown("<h1 class='main-header'>Risco de Liquidez Bancário</h1>", unsafe_allow_html=True)
+    st.markdown("<h2 class='sub-header'>O Caso Northern Rock e Lições para a Gestão de Risco de Liquidez</h2>", unsafe_allow_html=True)
+    
+    # Barra lateral com navegação
+    reset_payload()
+    show_image("nothern_rock_logo.png", 200, container=st.sidebar)
+    st.sidebar.markdown("## Navegação")
+    menu = st.sidebar.selectbox("Escolha um módulo:", list(PAGINAS))
+    
+    # Apenas a página selecionada é executada; o tempo de cada execução fica registrado na sessão
+    inicio = time.perf_counter()
+    PAGINAS[menu]()
+    duracao = time.perf_counter() - inicio
+    
+    tempos = st.session_state.setdefault('tempos_pagina', {}).setdefault(menu, [])
+    tempos.append(duracao)
+    del tempos[:-50]
+    st.sidebar.caption(f"Página executada em {duracao * 1000:.0f} ms (mediana da sessão: {np.median(tempos) * 1000:.0f} ms)")
+    st.sidebar.caption(f"Imagens desta página: {page_payload() / 1024:.0f} KB")
         
 # Executar o aplicativo
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from liquidity_engine import COLUNAS_CENARIO, PARAMETROS_CENARIO
+
+DIRETORIO_BASE = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_CENARIOS_SIMULADOR = os.path.join(DIRETORIO_BASE, 'cenarios_simulador.csv')
+ARQUIVO_CENARIOS_BALANCO = os.path.join(DIRETORIO_BASE, 'cenarios_balanco.csv')
+
+
+def _read_header(path):
+    # O cabeçalho do arquivo traz linhas de comentário, entre elas "# versao: N"
+    versao = None
+    n_comentarios = 0
+    with open(path, encoding='utf-8') as f:
+        for linha in f:
+            if not linha.startswith('#'):
+                break
+            n_comentarios += 1
+            chave, _, valor = linha[1:].partition(':')
+            if chave.strip() == 'versao':
+                versao = valor.strip()
+    return versao, n_comentarios
+
+
+@lru_cache(maxsize=None)
+def _load_cached(path, mtime, colunas_numericas, colunas_texto):
+    versao, n_comentarios = _read_header(path)
+    df = pd.read_csv(path, skiprows=n_comentarios, encoding='utf-8')
+
+    faltantes = [c for c in colunas_texto + colunas_numericas if c not in df.columns]
+    if faltantes:
+        raise ValueError(f"Colunas ausentes em {os.path.basename(path)}: {', '.join(faltantes)}")
+    if df['nome'].duplicated().any():
+        duplicados = df.loc[df['nome'].duplicated(), 'nome'].unique()
+        raise ValueError(f"Cenários duplicados em {os.path.basename(path)}: {', '.join(duplicados[:5])}")
+
+    # Estrutura de arrays: uma coluna contígua por parâmetro, somente leitura por ser compartilhada pelo cache
+    biblioteca = {coluna: df[coluna].to_numpy(dtype=object) for coluna in colunas_texto}
+    for coluna in colunas_numericas:
+        biblioteca[coluna] = pd.to_numeric(df[coluna]).to_numpy(dtype=float)
+    for array in biblioteca.values():
+        array.flags.writeable = False
+
+    biblioteca['versao'] = versao
+    biblioteca['indice'] = {nome: i for i, nome in enumerate(biblioteca['nome'])}
+    return biblioteca
+
+
+def load_scenario_library(path, colunas_numericas, colunas_texto=('nome',)):
+    """Carrega uma biblioteca de cenários em CSV como um dicionário de arrays.
+
+    O arquivo é lido uma única vez; uma nova leitura só ocorre quando ele é
+    modificado em disco.
+    """
+    path = os.path.abspath(path)
+    return _load_cached(path, os.path.getmtime(path), tuple(colunas_numericas), tuple(colunas_texto))
+
+
+def simulator_scenarios(path=ARQUIVO_CENARIOS_SIMULADOR):
+    """Cenários do simulador de estresse (colunas de COLUNAS_CENARIO)"""
+    return load_scenario_library(path, COLUNAS_CENARIO)
+
+
+def balance_sheet_scenarios(path=ARQUIVO_CENARIOS_BALANCO):
+    """Cenários de estresse do balanço (colunas de PARAMETROS_CENARIO, com descrição)"""
+    return load_scenario_library(path, PARAMETROS_CENARIO, ('nome', 'descricao'))
+
+
+def scenario_matrix(biblioteca, colunas, nomes=None):
+    """Monta a matriz (cenários x parâmetros), opcionalmente apenas para os cenários indicados"""
+    matriz = np.column_stack([biblioteca[coluna] for coluna in colunas])
+    if nomes is None:
+        return matriz
+    return matriz[[biblioteca['indice'][nome] for nome in nomes]]
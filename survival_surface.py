@@ -0,0 +1,70 @@
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from liquidity_engine import DIAS_SIMULACAO, crisis_failure_day
+
+# Incrementar quando a lógica da simulação mudar, para invalidar o cache em disco
+VERSAO_SUPERFICIE = 1
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+CHAVES_SUPERFICIE = ('ativos_liquidos_pct', 'wholesale_funding_pct', 'stress_level', 'dias_falha', 'dias_simulacao')
+
+
+def compute_survival_surface(passo=1, niveis_estresse=range(1, 11), dias_simulacao=DIAS_SIMULACAO):
+    """Calcula o dia de falha em toda a grade (estresse x wholesale x ativos líquidos).
+
+    Bancos que sobrevivem ao horizonte recebem dias_simulacao + 1.
+    """
+    ativos = np.arange(0, 101, passo)
+    wholesale = np.arange(0, 101, passo)
+    niveis_estresse = np.asarray(list(niveis_estresse))
+
+    # Grade completa avaliada de uma só vez pelo caminho analítico do dia de falha
+    falha = crisis_failure_day(
+        ativos[None, None, :], wholesale[None, :, None], niveis_estresse[:, None, None], dias_simulacao
+    ).reshape(len(niveis_estresse), len(wholesale), len(ativos))
+    dias_falha = np.where(falha > 0, falha, dias_simulacao + 1).astype(np.int16)
+
+    return {
+        'ativos_liquidos_pct': ativos,
+        'wholesale_funding_pct': wholesale,
+        'stress_level': niveis_estresse,
+        'dias_falha': dias_falha,
+        'dias_simulacao': dias_simulacao,
+    }
+
+
+def load_survival_surface(passo=1, cache_dir=CACHE_DIR):
+    """Carrega a superfície de sobrevivência do disco, calculando-a na primeira vez.
+
+    Um arquivo de cache incompleto ou corrompido é ignorado e regravado.
+    """
+    path = os.path.join(cache_dir, f'survival_surface_v{VERSAO_SUPERFICIE}_passo{passo}_d{DIAS_SIMULACAO}.npz')
+
+    if os.path.exists(path):
+        try:
+            with np.load(path) as data:
+                surface = {key: data[key] for key in CHAVES_SUPERFICIE}
+            surface['dias_simulacao'] = int(surface['dias_simulacao'])
+            return surface
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            pass
+
+    surface = compute_survival_surface(passo)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Grava em arquivo temporário e o move para o lugar: uma execução interrompida nunca deixa um cache parcial
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.npz.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **surface)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # Sistema de arquivos somente leitura: segue apenas com o resultado em memória
+        pass
+    return surface